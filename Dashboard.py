@@ -1,24 +1,27 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
-import time
-import warnings
-warnings.filterwarnings('ignore')
-
-# Configuration de la page
-st.set_page_config(
-    page_title="Dashboard Alcool France - Analyse Stratégique",
-    page_icon="🍷",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import product
+import argparse
+import json
+import os
+import sys
+from alcool.builtin_data import BUILTIN_DATASETS, DATA_VERSION
+from alcool.data_sources import DATA_DIR, HASH_CONTENTS, BuiltinSource, FileSource, sources_fingerprint
+from alcool.forecasting import SCENARIO_AXES
+from alcool.geo import TOLERANCES, layer_mtime, load_layer
+from alcool.instrumentation import Instrumentation
+from alcool.materialized import MaterializedViews
+from alcool.payload import compact_figure, payload_bytes
+from alcool.shared_tables import SHARED_TABLES_DIR, SharedTables
+from alcool.model import FOCUS_AREAS, INDICATOR_LABELS, DashboardModel, FigureCache, build_dashboard_data, chart_focus
+from alcool.regional import LEVEL_LABELS
+from alcool.survey import SURVEY_LABELS
 
 # CSS personnalisé
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.8rem;
@@ -65,131 +68,158 @@ st.markdown("""
     .policy-regulation { border-left-color: #6f42c1; background-color: rgba(111, 66, 193, 0.1); }
     .policy-ban { border-left-color: #dc3545; background-color: rgba(220, 53, 69, 0.1); }
 </style>
-""", unsafe_allow_html=True)
+"""
 
-class AlcoholDashboard:
-    def __init__(self):
-        self.historical_data = self.initialize_historical_data()
-        self.policy_timeline = self.initialize_policy_timeline()
-        self.regional_data = self.initialize_regional_data()
-        self.international_comparison = self.initialize_international_comparison()
-        self.health_impact_data = self.initialize_health_impact_data()
-        
-    def initialize_historical_data(self):
-        """Initialise les données historiques de la consommation d'alcool"""
-        years = list(range(2000, 2024))
-        
-        # Données simulées basées sur les tendances historiques réelles
-        alcohol_consumption = [
-            13.5, 13.2, 12.9, 12.6, 12.3, 12.0, 11.8, 11.5, 11.3, 11.1,  # 2000-2009 (litres/personne/an)
-            10.9, 10.7, 10.5, 10.3, 10.1, 9.9, 9.7, 9.5, 9.3, 9.1,  # 2010-2019
-            8.9, 8.7, 8.5, 8.3  # 2020-2023
-        ]
-        
-        daily_drinkers = [
-            15.2, 14.8, 14.4, 14.0, 13.6, 13.2, 12.8, 12.4, 12.0, 11.6,  # 2000-2009 (% population)
-            11.2, 10.8, 10.4, 10.0, 9.6, 9.2, 8.8, 8.4, 8.0, 7.6,  # 2010-2019
-            7.2, 6.8, 6.4, 6.0  # 2020-2023
-        ]
-        
-        binge_drinking = [
-            18.5, 18.8, 19.1, 19.4, 19.7, 20.0, 20.3, 20.6, 20.9, 21.2,  # 2000-2009 (% population)
-            21.5, 21.8, 22.1, 22.4, 22.7, 23.0, 23.3, 23.6, 23.9, 24.2,  # 2010-2019
-            24.5, 24.8, 25.1, 25.4  # 2020-2023
-        ]
-        
-        wine_consumption = [
-            58.2, 56.8, 55.5, 54.2, 52.9, 51.6, 50.3, 49.0, 47.7, 46.4,  # 2000-2009 (% consommation totale)
-            45.1, 43.8, 42.5, 41.2, 39.9, 38.6, 37.3, 36.0, 34.7, 33.4,  # 2010-2019
-            32.1, 30.8, 29.5, 28.2  # 2020-2023
-        ]
-        
-        tax_revenue = [
-            3.2, 3.3, 3.4, 3.5, 3.6, 3.7, 3.8, 3.9, 4.0, 4.1,  # 2000-2009 (milliards €)
-            4.2, 4.3, 4.4, 4.5, 4.6, 4.7, 4.8, 4.9, 5.0, 5.1,  # 2010-2019
-            5.2, 5.3, 5.4, 5.5  # 2020-2023
-        ]
-        
-        return pd.DataFrame({
-            'annee': years,
-            'consommation_alcool': alcohol_consumption,
-            'buveurs_quotidiens': daily_drinkers,
-            'binge_drinking': binge_drinking,
-            'part_vin': wine_consumption,
-            'recettes_fiscales': tax_revenue
-        })
+def configure_page():
+    """Configuration de la page et CSS (uniquement sous un serveur Streamlit)"""
+    st.set_page_config(
+        page_title="Dashboard Alcool France - Analyse Stratégique",
+        page_icon="🍷",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+# Intervalle du rafraîchissement automatique (secondes)
+REFRESH_INTERVAL_SECONDS = 300
+
+def get_data_sources(instrumentation=None):
+    """Sources de données par ordre de priorité : fichiers puis données intégrées"""
+    builders = BUILTIN_DATASETS
+    if instrumentation is not None:
+        builders = {name: instrumentation.wrap('loader_seconds', builder, dataset=name)
+                    for name, builder in builders.items()}
+    return [
+        FileSource(DATA_DIR, hash_contents=HASH_CONTENTS),
+        BuiltinSource(builders),
+    ]
+
+@st.cache_resource(show_spinner=False)
+def get_materialized_views():
+    """Vues matérialisées du processus, prolongées d'une version des données à la suivante"""
+    return MaterializedViews()
+
+# Tables partagées entre processus serveur (ALCOOL_SHARED_TABLES=1), dans ALCOOL_SHARED_DIR
+SHARED_TABLES = os.environ.get('ALCOOL_SHARED_TABLES') == '1'
+SHARED_DIR = os.environ.get('ALCOOL_SHARED_DIR', SHARED_TABLES_DIR)
+
+def get_shared_tables(version):
+    """Répertoire des tables partagées de la version, ou None si le mode est désactivé"""
+    return SharedTables(SHARED_DIR, namespace=version) if SHARED_TABLES else None
+
+@st.cache_resource(show_spinner=False, max_entries=3)
+def load_dashboard_data(version=DATA_VERSION, fingerprint=None, _instrumentation=None):
+    """Construit une seule fois par processus les données partagées par toutes les sessions
     
-    def initialize_policy_timeline(self):
-        """Initialise la timeline des politiques sur l'alcool"""
-        return [
-            {'date': '1991-01-01', 'type': 'regulation', 'titre': 'Loi Évin - Alcool', 
-             'description': 'Encadrement de la publicité pour les boissons alcoolisées'},
-            {'date': '2009-07-21', 'type': 'ban', 'titre': 'Loi Bachelot', 
-             'description': 'Interdiction de la vente d\'alcool aux mineurs et limitation de la publicité'},
-            {'date': '2015-01-01', 'type': 'regulation', 'titre': 'Alcootest obligatoire', 
-             'description': 'Obligation de posséder un éthylotest dans tous les véhicules'},
-            {'date': '2016-01-01', 'type': 'tax', 'titre': 'Augmentation des taxes', 
-             'description': 'Hausse des taxes sur les boissons alcoolisées'},
-            {'date': '2018-03-01', 'type': 'prevention', 'titre': 'Campagne "Avec modération"', 
-             'description': 'Lancement des campagnes nationales de prévention'},
-            {'date': '2019-07-22', 'type': 'regulation', 'titre': 'Loi Santé', 
-             'description': 'Renforcement de l\'encadrement de la publicité pour l\'alcool'},
-            {'date': '2020-01-01', 'type': 'prevention', 'titre': 'Programme "Alcool Info Service"', 
-             'description': 'Renforcement des services d\'aide et d\'information'},
-            {'date': '2021-11-01', 'type': 'regulation', 'titre': 'Interdiction publicité réseaux sociaux', 
-             'description': 'Interdiction de la publicité pour l\'alcool sur les réseaux sociaux'},
-            {'date': '2023-01-01', 'type': 'tax', 'titre': 'Nouvelle hausse des taxes', 
-             'description': 'Augmentation ciblée sur les boissons les plus consommées'},
-        ]
+    Seule l'empreinte des fichiers sources (fingerprint) déclenche un rechargement : tant
+    qu'aucun fichier n'est modifié, les actualisations automatiques retrouvent la même entrée.
+    Chaque session recalcule l'empreinte à chaque rendu et passe d'elle-même à la nouvelle
+    version : les entrées évincées ne sont plus demandées par aucune session.
+    En mode partagé, les tables sont chargées une fois pour tous les processus de l'hôte.
+    """
+    if _instrumentation is None:
+        return build_dashboard_data(get_data_sources(), get_materialized_views(), get_shared_tables(version))
+    with _instrumentation.timer('data_load_seconds'):
+        return build_dashboard_data(get_data_sources(_instrumentation), get_materialized_views(),
+                                    get_shared_tables(version))
+
+# Mesures activées pour tout le processus (ALCOOL_INSTRUMENTATION=1) ou par session (?perf=1)
+INSTRUMENTATION_ENABLED = os.environ.get('ALCOOL_INSTRUMENTATION') == '1'
+
+def instrumentation_enabled():
+    """Indique si les mesures sont actives pour la session courante"""
+    return INSTRUMENTATION_ENABLED or st.query_params.get('perf') == '1'
+
+@st.cache_resource(show_spinner=False)
+def get_instrumentation():
+    """Enregistreur de mesures unique pour le processus, partagé par toutes les sessions"""
+    return Instrumentation()
+
+# Figures allégées pour le navigateur (ALCOOL_COMPACT_FIGURES=0 : figures complètes)
+COMPACT_FIGURES = os.environ.get('ALCOOL_COMPACT_FIGURES', '1') == '1'
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Cache de figures unique pour le processus, partagé par toutes les sessions"""
+    return FigureCache()
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_geo_layer(level, mtime):
+    """Contours compilés d'un niveau, partagés par le processus (clé : date des fichiers)"""
+    return load_layer(level)
+
+# Répertoire des archives d'export
+EXPORT_DIR = os.environ.get('ALCOOL_EXPORT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports'))
+
+@st.cache_resource(show_spinner=False)
+def get_background_executor():
+    """Exécuteur partagé pour les calculs lancés en arrière-plan"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='alcool-bg')
+
+class AlcoholDashboard:
+    """Vue Streamlit : contrôles et mise en page, les données et figures venant de DashboardModel"""
     
-    def initialize_regional_data(self):
-        """Initialise les données régionales de consommation"""
-        regions = [
-            'Île-de-France', 'Auvergne-Rhône-Alpes', 'Nouvelle-Aquitaine', 
-            'Occitanie', 'Hauts-de-France', 'Provence-Alpes-Côte d\'Azur',
-            'Pays de la Loire', 'Bretagne', 'Normandie', 'Grand Est',
-            'Bourgogne-Franche-Comté', 'Centre-Val de Loire', 'Corse'
-        ]
-        
-        data = {
-            'region': regions,
-            'consommation_2023': [7.8, 9.2, 8.9, 9.5, 10.1, 8.4, 8.1, 9.8, 8.7, 9.4, 8.6, 8.3, 11.2],
-            'evolution_2010_2023': [-2.1, -1.8, -1.9, -2.2, -1.5, -2.0, -2.3, -1.7, -1.8, -1.6, -2.1, -2.0, -0.9],
-            'buveurs_quotidiens': [4.2, 6.8, 6.1, 7.2, 8.5, 5.3, 4.9, 7.9, 6.4, 7.1, 6.2, 5.8, 9.8],
-            'binge_drinking': [22.1, 25.6, 24.8, 26.3, 28.7, 23.4, 21.9, 27.2, 25.1, 26.8, 24.5, 23.2, 30.5]
-        }
+    def __init__(self, data_version=DATA_VERSION):
+        self.figure_cache = get_figure_cache()
+        self.instrumentation = get_instrumentation() if instrumentation_enabled() else None
+        self.lazy_navigation = True
+        self.load_data(data_version)
         
-        return pd.DataFrame(data)
+    def load_data(self, data_version=DATA_VERSION):
+        """Rattache le tableau de bord aux données partagées de la version et de l'état des fichiers sources"""
+        fingerprint = sources_fingerprint(get_data_sources())
+        data = load_dashboard_data(data_version, fingerprint, self.instrumentation)
+        self.data_version = data_version
+        self.model = DashboardModel(data, (data_version, fingerprint), self.figure_cache)
     
-    def initialize_international_comparison(self):
-        """Initialise les données comparatives internationales"""
-        countries = ['France', 'Allemagne', 'Royaume-Uni', 'Espagne', 'Italie', 'États-Unis', 'Russie', 'Japon']
-        
-        data = {
-            'pays': countries,
-            'consommation_alcool': [8.3, 10.6, 9.8, 7.5, 6.9, 8.9, 11.7, 7.2],
-            'prix_biere_eur': [2.5, 1.8, 3.2, 1.2, 1.5, 2.8, 1.1, 3.5],
-            'mortalite_liee_alcool': [41, 79, 52, 28, 35, 88, 152, 23],  # milliers
-            'depenses_prevention': [0.4, 0.3, 0.8, 0.2, 0.3, 1.2, 0.1, 0.5],  # € par habitant
-            'age_legal_consommation': [18, 16, 18, 18, 18, 21, 18, 20]
-        }
-        
-        return pd.DataFrame(data)
+    def timer(self, name, **labels):
+        """Chronomètre un bloc si les mesures sont actives"""
+        if self.instrumentation is None:
+            return nullcontext()
+        return self.instrumentation.timer(name, **labels)
     
-    def initialize_health_impact_data(self):
-        """Initialise les données d'impact sur la santé"""
-        years = list(range(2010, 2024))
-        
-        data = {
-            'annee': years,
-            'deces_alcool': [49, 48, 47, 46, 45, 44, 43, 42, 41, 40, 39, 38, 37, 36],  # milliers
-            'cancers_digesifs': [15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28],  # milliers
-            'maladies_foie': [12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0.9, 0.8],  # milliers
-            'couts_sante': [18.5, 18.8, 19.1, 19.4, 19.7, 20.0, 20.3, 20.6, 20.9, 21.2, 21.5, 21.8, 22.1, 22.4],  # milliards €
-            'accidents_routiers': [3.2, 3.0, 2.8, 2.6, 2.4, 2.2, 2.0, 1.8, 1.6, 1.4, 1.2, 1.0, 0.8, 0.6]  # milliers
-        }
+    def show_figure(self, chart_id, builder, *state):
+        """Affiche une figure du cache (construite si besoin) selon l'état des filtres utilisés"""
+        if self.instrumentation is not None:
+            builder = self.measured_builder(chart_id, builder)
+        if COMPACT_FIGURES:
+            # Version allégée mise en cache à part (l'export garde les figures complètes)
+            builder = self.compact_builder(chart_id, builder)
+            state += ('compacte',)
+        fig = self.model.cached_figure(chart_id, builder, *state)
+        with self.timer('chart_render_seconds', chart=chart_id):
+            st.plotly_chart(fig, use_container_width=True)
+    
+    def measured_builder(self, chart_id, builder):
+        """Constructeur de figure qui enregistre sa durée et la taille JSON du résultat"""
+        def build():
+            with self.instrumentation.timer('figure_build_seconds', chart=chart_id):
+                fig = builder()
+            self.instrumentation.observe('figure_json_bytes', len(fig.to_json().encode('utf-8')), chart=chart_id)
+            return fig
+        return build
+    
+    def compact_builder(self, chart_id, builder):
+        """Constructeur de la figure allégée, qui enregistre la taille envoyée au navigateur"""
+        def build():
+            fig = compact_figure(builder())
+            if self.instrumentation is not None:
+                self.instrumentation.observe('figure_payload_bytes', payload_bytes(fig), chart=chart_id)
+            return fig
+        return build
+    
+    def create_tabs(self, labels, key, excluded=()):
+        """Crée des onglets ; en navigation à la demande, les onglets non affichés valent None"""
+        shown = [label for label in labels if label not in excluded]
+        if not shown:
+            return [None] * len(labels)
         
-        return pd.DataFrame(data)
+        if not self.lazy_navigation:
+            containers = dict(zip(shown, st.tabs(shown)))
+            return [containers.get(label) for label in labels]
+        
+        active = st.radio(key, shown, horizontal=True, key=key, label_visibility="collapsed")
+        return [st.container() if label == active else None for label in labels]
     
     def display_header(self):
         """Affiche l'en-tête du dashboard"""
@@ -213,598 +243,556 @@ class AlcoholDashboard:
     
     def display_key_metrics(self):
         """Affiche les métriques clés de l'alcool en France"""
+        model = self.model
         st.markdown('<h3 class="section-header">📊 INDICATEURS CLÉS DE L\'ALCOOL EN FRANCE</h3>', 
                    unsafe_allow_html=True)
         
-        current_data = self.historical_data[self.historical_data['annee'] == 2023].iloc[0]
-        previous_data = self.historical_data[self.historical_data['annee'] == 2022].iloc[0]
+        # Dernière année disponible et variations précalculées à chaque version des données
+        metrics = model.key_metrics['historical_data']
+        
+        def delta(indicator, unit):
+            current = metrics[indicator]
+            if current['variation'] is None:
+                return None
+            return f"{current['variation']:+.1f}{unit} vs {current['annee_precedente']}"
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             st.metric(
-                "Consommation d'alcool",
-                f"{current_data['consommation_alcool']:.1f}L/pers/an",
-                f"{(current_data['consommation_alcool'] - previous_data['consommation_alcool']):+.1f}L vs 2022",
+                f"Consommation d'alcool ({metrics['consommation_alcool']['annee']})",
+                f"{metrics['consommation_alcool']['valeur']:.1f}L/pers/an",
+                delta('consommation_alcool', 'L'),
                 delta_color="inverse"
             )
         
         with col2:
             st.metric(
                 "Buveurs Quotidiens",
-                f"{current_data['buveurs_quotidiens']:.1f}%",
-                f"{(current_data['buveurs_quotidiens'] - previous_data['buveurs_quotidiens']):+.1f}% vs 2022",
+                f"{metrics['buveurs_quotidiens']['valeur']:.1f}%",
+                delta('buveurs_quotidiens', '%'),
                 delta_color="inverse"
             )
         
         with col3:
             st.metric(
                 "Binge Drinking",
-                f"{current_data['binge_drinking']:.1f}%",
-                f"{(current_data['binge_drinking'] - previous_data['binge_drinking']):+.1f}% vs 2022",
+                f"{metrics['binge_drinking']['valeur']:.1f}%",
+                delta('binge_drinking', '%'),
                 delta_color="inverse"
             )
         
         with col4:
             st.metric(
                 "Recettes Fiscales",
-                f"{current_data['recettes_fiscales']:.1f}Md€",
-                f"{(current_data['recettes_fiscales'] - previous_data['recettes_fiscales']):+.1f}Md€ vs 2022"
+                f"{metrics['recettes_fiscales']['valeur']:.1f}Md€",
+                delta('recettes_fiscales', 'Md€')
             )
     
     def create_historical_analysis(self):
         """Crée l'analyse historique de la consommation"""
+        model = self.model
         st.markdown('<h3 class="section-header">📈 ÉVOLUTION HISTORIQUE DE LA CONSOMMATION</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Consommation", "Types de Consommateurs", "Impact Santé"])
+        excluded = []
+        if 'Consommation' not in model.focus:
+            excluded += ["Consommation", "Types de Consommateurs"]
+        if 'Impact santé' not in model.focus:
+            excluded.append("Impact Santé")
         
-        with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Évolution de la consommation
-                fig = px.line(self.historical_data, 
-                             x='annee', 
-                             y='consommation_alcool',
-                             title='Évolution de la Consommation d\'Alcool (litres/personne/an) - 2000-2023',
-                             markers=True)
-                fig.update_layout(yaxis_title="Litres d'alcool pur/pers/an", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Part du vin dans la consommation
-                fig = px.area(self.historical_data, 
-                             x='annee', 
-                             y='part_vin',
-                             title='Part du Vin dans la Consommation Totale (%) - 2000-2023')
-                fig.update_layout(yaxis_title="Part du vin (%)", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Buveurs quotidiens vs occasionnels
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(x=self.historical_data['annee'], 
-                                       y=self.historical_data['buveurs_quotidiens'],
-                                       name='Buveurs quotidiens',
-                                       line=dict(color='brown')))
-                
-                fig.update_layout(title='Évolution des Buveurs Quotidiens',
-                                yaxis_title="Pourcentage (%)", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Binge drinking
-                fig = px.line(self.historical_data, 
-                             x='annee', 
-                             y='binge_drinking',
-                             title='Évolution du Binge Drinking (%) - 2000-2023',
-                             markers=True)
-                fig.update_layout(yaxis_title="Binge drinking (%)", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Impact sur la santé
-                fig = px.line(self.health_impact_data, 
-                             x='annee', 
-                             y=['deces_alcool', 'cancers_digesifs', 'maladies_foie'],
-                             title='Mortalité Liée à l\'Alcool (milliers) - 2010-2023',
-                             markers=True)
-                fig.update_layout(yaxis_title="Nombre de décès (milliers)", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Coûts sanitaires
-                fig = px.area(self.health_impact_data, 
-                             x='annee', 
-                             y='couts_sante',
-                             title='Coûts Sanitaires Liés à l\'Alcool (milliards €) - 2010-2023')
-                fig.update_layout(yaxis_title="Coûts (milliards €)", xaxis_title="Année")
-                st.plotly_chart(fig, use_container_width=True)
+        tab1, tab2, tab3 = self.create_tabs(["Consommation", "Types de Consommateurs", "Impact Santé"],
+                                            key='historique', excluded=excluded)
+        
+        if tab1 is not None:
+            with tab1:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Évolution de la consommation
+                    self.show_figure('historique.consommation', model.build_consumption_figure, *model.period)
+                
+                with col2:
+                    # Part du vin dans la consommation
+                    self.show_figure('historique.part_vin', model.build_wine_share_figure, *model.period)
+        
+        if tab2 is not None:
+            with tab2:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Buveurs quotidiens vs occasionnels
+                    self.show_figure('historique.buveurs_quotidiens', model.build_daily_drinkers_figure, *model.period)
+                
+                with col2:
+                    # Binge drinking
+                    self.show_figure('historique.binge_drinking', model.build_binge_drinking_figure, *model.period)
+        
+        if tab3 is not None:
+            with tab3:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Impact sur la santé
+                    self.show_figure('historique.mortalite', model.build_mortality_figure, *model.period)
+                
+                with col2:
+                    # Coûts sanitaires
+                    self.show_figure('historique.couts_sante', model.build_health_costs_figure, *model.period)
     
     def create_policy_analysis(self):
         """Analyse des politiques sur l'alcool"""
+        model = self.model
         st.markdown('<h3 class="section-header">🏛️ ANALYSE DES POLITIQUES SUR L\'ALCOOL</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Timeline des Politiques", "Impact des Mesures", "Efficacité Comparée"])
+        tab1, tab2, tab3 = self.create_tabs(["Timeline des Politiques", "Impact des Mesures", "Efficacité Comparée"], key='politiques')
         
-        with tab1:
-            # Timeline interactive des politiques
-            policy_df = pd.DataFrame(self.policy_timeline)
-            policy_df['date'] = pd.to_datetime(policy_df['date'])
-            policy_df['annee'] = policy_df['date'].dt.year
-            
-            # Fusion avec données historiques
-            merged_data = pd.merge(self.historical_data, policy_df, on='annee', how='left')
-            
-            fig = px.scatter(merged_data, 
-                           x='annee', 
-                           y='consommation_alcool',
-                           color='type',
-                           size_max=20,
-                           hover_name='titre',
-                           hover_data={'description': True, 'type': True},
-                           title='Impact des Politiques sur la Consommation d\'Alcool')
-            
-            # Ajouter la ligne de tendance
-            fig.add_trace(go.Scatter(x=self.historical_data['annee'], 
-                                   y=self.historical_data['consommation_alcool'],
-                                   mode='lines',
-                                   name='Consommation alcool',
-                                   line=dict(color='gray', width=2)))
-            
-            fig.update_layout(showlegend=True)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Légende des types de politiques
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.markdown('<div class="policy-card policy-prevention">Prévention</div>', unsafe_allow_html=True)
-            with col2:
-                st.markdown('<div class="policy-card policy-tax">Fiscalité</div>', unsafe_allow_html=True)
-            with col3:
-                st.markdown('<div class="policy-card policy-regulation">Réglementation</div>', unsafe_allow_html=True)
-            with col4:
-                st.markdown('<div class="policy-card policy-ban">Interdiction</div>', unsafe_allow_html=True)
-        
-        with tab2:
-            # Analyse d'impact des politiques majeures
-            st.subheader("Impact des Politiques Clés")
-            
-            impact_analysis = [
-                {'politique': 'Loi Évin (1991)', 'impact_consommation': -0.8, 'delai_impact': 3},
-                {'politique': 'Loi Bachelot (2009)', 'impact_consommation': -0.5, 'delai_impact': 2},
-                {'politique': 'Alcootest obligatoire (2015)', 'impact_consommation': -0.3, 'delai_impact': 1},
-                {'politique': 'Hausse taxes 2016', 'impact_consommation': -0.4, 'delai_impact': 2},
-                {'politique': 'Campagne modération (2018)', 'impact_consommation': -0.2, 'delai_impact': 1},
-            ]
-            
-            impact_df = pd.DataFrame(impact_analysis)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig = px.bar(impact_df, 
-                            x='politique', 
-                            y='impact_consommation',
-                            title='Impact sur la Consommation (litres/pers/an)',
-                            color='impact_consommation',
-                            color_continuous_scale='RdYlGn')
-                fig.update_layout(xaxis_tickangle=45)
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # CORRECTION : Utiliser la valeur absolue pour la taille
-                impact_df['impact_absolu'] = impact_df['impact_consommation'].abs()
-                
-                fig = px.scatter(impact_df, 
-                               x='delai_impact', 
-                               y='impact_consommation',
-                               size='impact_absolu',  # Utiliser les valeurs absolues
-                               color='politique',
-                               hover_name='politique',
-                               title='Délai vs Amplitude des Impacts',
-                               size_max=30)
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            # Efficacité comparée des politiques
-            st.subheader("Efficacité des Différentes Stratégies")
-            
-            strategies = [
-                {'strategie': 'Augmentation des prix', 'efficacite': 8.2, 'cout': 3, 'acceptabilite': 4},
-                {'strategie': 'Limitation publicité', 'efficacite': 6.8, 'cout': 2, 'acceptabilite': 7},
-                {'strategie': 'Contrôles routiers', 'efficacite': 7.5, 'cout': 4, 'acceptabilite': 6},
-                {'strategie': 'Interdiction vente mineurs', 'efficacite': 6.2, 'cout': 2, 'acceptabilite': 8},
-                {'strategie': 'Campagnes prévention', 'efficacite': 5.8, 'cout': 5, 'acceptabilite': 9},
-                {'strategie': 'Services d\'aide', 'efficacite': 6.5, 'cout': 6, 'acceptabilite': 8},
-            ]
-            
-            strategy_df = pd.DataFrame(strategies)
-            
-            fig = px.scatter(strategy_df, 
-                           x='cout', 
-                           y='efficacite',
-                           size='acceptabilite',
-                           color='strategie',
-                           hover_name='strategie',
-                           title='Efficacité vs Coût des Stratégies',
-                           size_max=30)
-            st.plotly_chart(fig, use_container_width=True)
+        if tab1 is not None:
+            with tab1:
+                # Timeline interactive des politiques
+                self.show_figure('politiques.timeline', model.build_policy_timeline_figure, *model.period)
+                
+                # Légende des types de politiques
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.markdown('<div class="policy-card policy-prevention">Prévention</div>', unsafe_allow_html=True)
+                with col2:
+                    st.markdown('<div class="policy-card policy-tax">Fiscalité</div>', unsafe_allow_html=True)
+                with col3:
+                    st.markdown('<div class="policy-card policy-regulation">Réglementation</div>', unsafe_allow_html=True)
+                with col4:
+                    st.markdown('<div class="policy-card policy-ban">Interdiction</div>', unsafe_allow_html=True)
+        
+        if tab2 is not None:
+            with tab2:
+                # Analyse d'impact des politiques majeures
+                st.subheader("Impact des Politiques Clés")
+                st.caption("Changement de niveau estimé par régression segmentée sur la série de consommation, "
+                           "au délai d'effet le mieux ajusté (0 à 4 ans)")
+                
+                impacts = model.policy_impacts()
+                not_estimated = impacts.loc[impacts['impact_consommation'].isna(), 'politique']
+                if not not_estimated.empty:
+                    st.caption("Non estimables (série trop courte autour de la mesure) : " + ", ".join(not_estimated))
+                
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    self.show_figure('politiques.impact', model.build_policy_impact_figure)
+                
+                with col2:
+                    self.show_figure('politiques.delai_impact', model.build_policy_delay_figure)
+        
+        if tab3 is not None:
+            with tab3:
+                # Efficacité comparée des politiques
+                st.subheader("Efficacité des Différentes Stratégies")
+                
+                self.show_figure('politiques.efficacite', model.build_strategy_efficiency_figure)
     
     def create_regional_analysis(self):
         """Analyse des disparités régionales"""
+        model = self.model
         st.markdown('<h3 class="section-header">🗺️ ANALYSE RÉGIONALE ET DÉMOGRAPHIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Cartographie", "Disparités Régionales", "Analyse Démographique"])
+        # Niveau géographique (régions seules sans données infra-régionales)
+        levels = model.regional_engine.levels[::-1]
+        level = 'region'
+        if len(levels) > 1:
+            level = st.selectbox("Niveau géographique", levels, format_func=LEVEL_LABELS.get,
+                                 key='niveau_regional')
         
-        with tab1:
-            # Carte de France avec plotly.graph_objects
-            st.subheader("Consommation d'Alcool par Région")
-            
-            # Données pour la carte de France
-            regional_coords = {
-                'Île-de-France': {'lat': 48.8566, 'lon': 2.3522, 'consommation': 7.8},
-                'Auvergne-Rhône-Alpes': {'lat': 45.75, 'lon': 4.85, 'consommation': 9.2},
-                'Nouvelle-Aquitaine': {'lat': 44.8378, 'lon': -0.5792, 'consommation': 8.9},
-                'Occitanie': {'lat': 43.6, 'lon': 1.4333, 'consommation': 9.5},
-                'Hauts-de-France': {'lat': 50.6292, 'lon': 3.0573, 'consommation': 10.1},
-                'Provence-Alpes-Côte d\'Azur': {'lat': 43.3, 'lon': 5.37, 'consommation': 8.4},
-                'Pays de la Loire': {'lat': 47.2181, 'lon': -1.5528, 'consommation': 8.1},
-                'Bretagne': {'lat': 48.1173, 'lon': -1.6778, 'consommation': 9.8},
-                'Normandie': {'lat': 49.18, 'lon': -0.37, 'consommation': 8.7},
-                'Grand Est': {'lat': 48.5734, 'lon': 7.7521, 'consommation': 9.4},
-                'Bourgogne-Franche-Comté': {'lat': 47.24, 'lon': 6.02, 'consommation': 8.6},
-                'Centre-Val de Loire': {'lat': 47.9, 'lon': 1.9, 'consommation': 8.3},
-                'Corse': {'lat': 42.15, 'lon': 9.08, 'consommation': 11.2}
-            }
-            
-            # Créer un DataFrame avec les coordonnées
-            coords_data = []
-            for region, info in regional_coords.items():
-                coords_data.append({
-                    'region': region,
-                    'lat': info['lat'],
-                    'lon': info['lon'],
-                    'consommation': info['consommation']
-                })
-            
-            coords_df = pd.DataFrame(coords_data)
-            
-            # Créer une carte scatter_geo avec un fond de carte visible
-            fig = px.scatter_geo(coords_df,
-                                lat='lat',
-                                lon='lon',
-                                color='consommation',
-                                size='consommation',
-                                hover_name='region',
-                                hover_data={'consommation': True},
-                                title='Consommation d\'Alcool par Région (litres/pers/an) - 2023',
-                                color_continuous_scale='RdYlGn_r',
-                                size_max=20,
-                                projection='natural earth')
-            
-            # Configuration pour rendre la carte visible
-            fig.update_geos(
-                visible=True,
-                resolution=50,
-                scope='europe',
-                showcountries=True,
-                countrycolor="black",
-                showsubunits=True,
-                subunitcolor="blue",
-                landcolor="lightgray",
-                oceancolor="lightblue",
-                lakecolor="blue",
-                bgcolor="white"
-            )
-            
-            # Ajuster la vue sur la France
-            fig.update_geos(
-                center=dict(lat=46.5, lon=2),
-                projection_scale=5
-            )
-            
-            fig.update_layout(
-                height=600,
-                geo=dict(
-                    bgcolor='rgba(255,255,255,0.1)',
-                    landcolor='lightgreen'
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Carte choroplèthe européenne
-            st.subheader("Comparaison Européenne")
-            
-            # Données pour l'Europe
-            europe_data = {
-                'pays': ['France', 'Allemagne', 'Italie', 'Espagne', 'Royaume-Uni', 'Belgique', 'Pays-Bas', 'Suisse'],
-                'consommation': [8.3, 10.6, 6.9, 7.5, 9.8, 10.2, 8.7, 9.1],
-                'code': ['FRA', 'DEU', 'ITA', 'ESP', 'GBR', 'BEL', 'NLD', 'CHE']
-            }
-            
-            europe_df = pd.DataFrame(europe_data)
-            
-            fig_europe = px.choropleth(europe_df,
-                                     locations='code',
-                                     color='consommation',
-                                     hover_name='pays',
-                                     title='Consommation d\'Alcool en Europe (litres/pers/an)',
-                                     color_continuous_scale='RdYlGn_r',
-                                     scope='europe')
-            
-            fig_europe.update_geos(
-                visible=True,
-                resolution=50,
-                showcountries=True,
-                countrycolor="black"
-            )
-            
-            st.plotly_chart(fig_europe, use_container_width=True)
+        tab1, tab2, tab3 = self.create_tabs(["Cartographie", "Disparités Régionales", "Analyse Démographique"], key='regional')
         
-        with tab2:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Classement des régions
-                fig = px.bar(self.regional_data.sort_values('consommation_2023'), 
-                            x='consommation_2023', 
-                            y='region',
-                            orientation='h',
-                            title='Consommation d\'Alcool par Région - 2023',
-                            color='consommation_2023',
-                            color_continuous_scale='RdYlGn_r')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Évolution régionale
-                fig = px.bar(self.regional_data.sort_values('evolution_2010_2023'), 
-                            x='evolution_2010_2023', 
-                            y='region',
-                            orientation='h',
-                            title='Évolution de la Consommation 2010-2023 (litres/pers/an)',
-                            color='evolution_2010_2023',
-                            color_continuous_scale='RdYlGn')
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab3:
-            # Analyse par catégories socio-démographiques
-            st.subheader("Profil des Consommateurs")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                ### 👥 Par Catégorie Socio-professionnelle
-                
-                **Consommation la plus élevée:**
-                • Agriculteurs: 12.5L  
-                • Ouvriers: 10.8L  
-                • Artisans: 9.9L  
-                
-                **Consommation la plus basse:**
-                • Cadres: 7.2L  
-                • Professions intermédiaires: 8.1L  
-                • Retraités: 8.5L  
-                """)
-            
-            with col2:
-                st.markdown("""
-                ### 🎂 Par Tranche d'Âge
-                
-                **15-24 ans:** 6.8L (fort binge drinking)  
-                **25-34 ans:** 9.2L  
-                **35-44 ans:** 8.9L  
-                **45-54 ans:** 9.5L  
-                **55-64 ans:** 10.1L  
-                **65+ ans:** 8.7L  
-                
-                **Âge moyen de 1ère ivresse:** 15.2 ans
-                """)
+        if tab1 is not None:
+            with tab1:
+                # Carte de France avec plotly.graph_objects
+                st.subheader(f"Consommation d'Alcool par {LEVEL_LABELS[level]}")
+                
+                # Choroplèthe hors ligne à partir des contours compilés à l'installation
+                geo_mtime = layer_mtime(level)
+                geo_layer = get_geo_layer(level, geo_mtime) if geo_mtime is not None else None
+                if geo_layer is not None:
+                    tier = st.select_slider("Précision des contours", list(TOLERANCES), value='moyenne',
+                                            key='precision_contours')
+                    self.show_figure('regional.choroplethe',
+                                     lambda: model.build_regional_choropleth_figure(level, geo_layer, tier),
+                                     level, tier, geo_mtime)
+                    if geo_layer.description:
+                        st.caption(f"🗺️ {geo_layer.description}")
+                else:
+                    # Niveau sans contours (départements non livrés) : carte à points, fond de carte chargé par le réseau
+                    st.caption("🗺️ Pas de contours pour ce niveau (`python -m alcool.geo --download`) : "
+                               "carte à points affichée")
+                    self.show_figure('regional.carte', lambda: model.build_regional_map_figure(level), level)
+                
+                # Carte animée sur les années du panel régional
+                st.subheader("Évolution Annuelle par Région")
+                indicator = st.selectbox("Indicateur", list(INDICATOR_LABELS), format_func=INDICATOR_LABELS.get,
+                                         key='indicateur_animation')
+                self.show_figure('regional.animation',
+                                 lambda: model.build_regional_animation_figure(indicator), indicator)
+                
+                # Carte choroplèthe européenne
+                st.subheader("Comparaison Européenne")
+                
+                self.show_figure('regional.europe', model.build_europe_map_figure)
+        
+        if tab2 is not None:
+            with tab2:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Classement des régions
+                    self.show_figure('regional.classement',
+                                     lambda: model.build_regional_ranking_figure(level), level)
+                
+                with col2:
+                    # Évolution régionale
+                    self.show_figure('regional.evolution',
+                                     lambda: model.build_regional_evolution_figure(level), level)
+                
+                # Séries annuelles : classement et variation pour une année du panel
+                st.subheader("Séries Annuelles par Région")
+                cube = model.regional_cube
+                col1, col2 = st.columns(2)
+                with col1:
+                    indicator = st.selectbox("Indicateur", list(INDICATOR_LABELS), format_func=INDICATOR_LABELS.get,
+                                             key='indicateur_regional')
+                with col2:
+                    year = st.select_slider("Année", [int(year) for year in cube.years],
+                                            value=cube.latest_year, key='annee_regionale')
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    self.show_figure('regional.classement_annuel',
+                                     lambda: model.build_regional_year_ranking_figure(indicator, year),
+                                     indicator, year)
+                with col2:
+                    if year > cube.years[0]:
+                        self.show_figure('regional.variation_annuelle',
+                                         lambda: model.build_regional_yoy_figure(indicator, year),
+                                         indicator, year)
+                    else:
+                        st.info(f"Pas de variation annuelle avant {cube.years[0] + 1}")
+                
+                self.show_figure('regional.series', lambda: model.build_regional_trends_figure(indicator), indicator)
+        
+        if tab3 is not None:
+            with tab3:
+                # Analyse par catégories socio-démographiques (estimations pondérées de l'enquête)
+                st.subheader("Profil des Consommateurs")
+                
+                if model.survey is None:
+                    st.info("Aucune micro-donnée d'enquête disponible (data/survey_microdata.csv)")
+                else:
+                    self.display_survey_profile(model)
+    
+    def survey_filters(self, model):
+        """Filtres du profil des consommateurs (année, régions, sexe), lus dans le cube de l'enquête"""
+        labels = model.survey.cube.labels
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            years = ["Toutes"] + [int(year) for year in labels['annee']]
+            year = st.selectbox("Année", years, key='profil_annee')
+        with col2:
+            regions = st.multiselect("Régions", list(labels['region']), placeholder="Toutes",
+                                     key='profil_regions')
+        with col3:
+            sex = st.selectbox("Sexe", ["Tous"] + list(labels['sexe']), key='profil_sexe')
+        
+        filters = {}
+        if year != "Toutes":
+            filters['annee'] = (year,)
+        if regions:
+            filters['region'] = tuple(regions)
+        if sex != "Tous":
+            filters['sexe'] = (sex,)
+        return filters
+    
+    def display_survey_profile(self, model):
+        """Consommation par CSP et par tranche d'âge estimée sur les micro-données d'enquête"""
+        if not model.survey.observed:
+            st.warning("🧪 Données simulées : échantillon fictif de répondants généré par l'application, "
+                       "à titre de démonstration. Déposer data/survey_microdata.csv pour analyser une enquête réelle.")
+        filters = self.survey_filters(model)
+        by_csp = model.survey_profile('csp', filters)
+        by_age = model.survey_profile('tranche_age', filters)
+        if by_csp.empty:
+            st.info("Aucun répondant pour cette sélection")
+            return
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            ranked = by_csp.sort_values('consommation_alcool', ascending=False)
+            lines = [f"• {row.csp}: {row.consommation_alcool:.1f}L  " for row in ranked.itertuples()]
+            st.markdown("### 👥 Par Catégorie Socio-professionnelle\n\n"
+                        "**Consommation la plus élevée:**\n" + "\n".join(lines[:3]) + "\n\n"
+                        "**Consommation la plus basse:**\n" + "\n".join(lines[:-4:-1]))
+        
+        with col2:
+            heaviest = by_age['binge_drinking'].idxmax()
+            lines = [f"**{row.tranche_age}:** {row.consommation_alcool:.1f}L"
+                     + (" (fort binge drinking)" if row.Index == heaviest else "") + "  "
+                     for row in by_age.itertuples()]
+            overall = model.survey_profile(filters=filters)
+            if 'age_premiere_ivresse' in overall.columns:
+                lines.append(f"\n**Âge moyen de 1ère ivresse:** {overall['age_premiere_ivresse'].iloc[0]:.1f} ans")
+            st.markdown("### 🎂 Par Tranche d'Âge\n\n" + "\n".join(lines))
+        
+        # Croisement de deux variables, sous les mêmes filtres
+        dimensions = {'tranche_age': "Tranche d'âge", 'csp': "CSP", 'sexe': "Sexe", 'region': "Région"}
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            measure = st.selectbox("Indicateur", [name for name in SURVEY_LABELS if name in by_csp.columns],
+                                   format_func=SURVEY_LABELS.get,
+                                   key='profil_indicateur')
+        with col2:
+            rows = st.selectbox("Lignes", list(dimensions), format_func=dimensions.get, key='profil_lignes')
+        with col3:
+            columns = st.selectbox("Colonnes", [name for name in dimensions if name != rows],
+                                   format_func=dimensions.get, key='profil_colonnes')
+        state = tuple(sorted(filters.items()))
+        self.show_figure('regional.profil_croise',
+                         lambda: model.build_survey_crosstab_figure(measure, rows, columns, state),
+                         measure, rows, columns, state)
+        
+        respondents = f"{int(by_csp['repondants'].sum()):,}".replace(',', ' ')
+        origin = "enquête" if model.survey.observed else "échantillon simulé"
+        st.caption(f"Estimations pondérées sur {respondents} répondants ({origin}) ; "
+                   "intervalles de confiance à 95 % dans l'export")
     
     def create_international_comparison(self):
         """Analyse comparative internationale"""
+        model = self.model
         st.markdown('<h3 class="section-header">🌍 COMPARAISON INTERNATIONALE</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Consommation", "Politiques", "Performances"])
+        tab1, tab2, tab3 = self.create_tabs(["Consommation", "Politiques", "Performances"], key='international')
         
-        with tab1:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Consommation comparée
-                fig = px.bar(self.international_comparison.sort_values('consommation_alcool'), 
-                            x='pays', 
-                            y='consommation_alcool',
-                            title='Consommation d\'Alcool - Comparaison Internationale',
-                            color='consommation_alcool',
-                            color_continuous_scale='RdYlGn_r')
-                st.plotly_chart(fig, use_container_width=True)
-            
-            with col2:
-                # Prix vs consommation
-                fig = px.scatter(self.international_comparison, 
-                               x='prix_biere_eur', 
-                               y='consommation_alcool',
-                               size='mortalite_liee_alcool',
-                               color='pays',
-                               hover_name='pays',
-                               title='Relation Prix vs Consommation',
-                               size_max=30)
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with tab2:
-            # Comparaison des politiques
-            st.subheader("Stratégies Nationales de Lutte contre l'Alcoolisme")
-            
-            policy_comparison = [
-                {'pays': 'France', 'publicite_limitee': 1, 'taxes_elevees': 1, 'controles_renforces': 1, 'prevention_jeunes': 1},
-                {'pays': 'Royaume-Uni', 'publicite_limitee': 1, 'taxes_elevees': 1, 'controles_renforces': 1, 'prevention_jeunes': 1},
-                {'pays': 'Pays-Bas', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 1, 'prevention_jeunes': 1},
-                {'pays': 'Allemagne', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 0, 'prevention_jeunes': 0},
-                {'pays': 'États-Unis', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 1, 'prevention_jeunes': 1},
-            ]
-            
-            policy_df = pd.DataFrame(policy_comparison)
-            
-            fig = px.imshow(policy_df.set_index('pays'),
-                          title='Comparaison des Politiques sur l\'Alcool',
-                          color_continuous_scale='RdYlGn')
-            st.plotly_chart(fig, use_container_width=True)
+        if tab1 is not None:
+            with tab1:
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    # Consommation comparée
+                    self.show_figure('international.consommation', model.build_international_consumption_figure)
+                
+                with col2:
+                    # Prix vs consommation
+                    self.show_figure('international.prix', model.build_price_consumption_figure)
         
-        with tab3:
-            # Performance des stratégies
-            st.subheader("Performance des Stratégies Nationales")
-            
-            performance_data = [
-                {'pays': 'Royaume-Uni', 'reduction_10ans': -2.8, 'investissement_prevention': 0.8, 'classement': 1},
-                {'pays': 'France', 'reduction_10ans': -2.1, 'investissement_prevention': 0.4, 'classement': 2},
-                {'pays': 'Italie', 'reduction_10ans': -1.9, 'investissement_prevention': 0.3, 'classement': 3},
-                {'pays': 'Canada', 'reduction_10ans': -1.7, 'investissement_prevention': 0.6, 'classement': 4},
-                {'pays': 'États-Unis', 'reduction_10ans': -1.2, 'investissement_prevention': 1.2, 'classement': 5},
-                {'pays': 'Allemagne', 'reduction_10ans': -0.8, 'investissement_prevention': 0.3, 'classement': 6},
-            ]
-            
-            perf_df = pd.DataFrame(performance_data)
-            
-            # CORRECTION : Utiliser une colonne positive pour la taille
-            perf_df['reduction_absolue'] = perf_df['reduction_10ans'].abs()
-            
-            fig = px.scatter(perf_df, 
-                           x='investissement_prevention', 
-                           y='reduction_10ans',
-                           size='reduction_absolue',  # Utiliser les valeurs absolues
-                           color='pays',
-                           hover_name='pays',
-                           title='Investissement vs Réduction de la Consommation',
-                           size_max=30)
-            st.plotly_chart(fig, use_container_width=True)
+        if tab2 is not None:
+            with tab2:
+                # Comparaison des politiques
+                st.subheader("Stratégies Nationales de Lutte contre l'Alcoolisme")
+                
+                self.show_figure('international.politiques', model.build_policy_comparison_figure)
+        
+        if tab3 is not None:
+            with tab3:
+                # Performance des stratégies
+                st.subheader("Performance des Stratégies Nationales")
+                
+                self.show_figure('international.performances', model.build_national_performance_figure)
     
     def create_strategic_recommendations(self):
         """Recommandations stratégiques"""
         st.markdown('<h3 class="section-header">🎯 RECOMMANDATIONS STRATÉGIQUES</h3>', 
                    unsafe_allow_html=True)
         
-        tab1, tab2, tab3 = st.tabs(["Objectifs 2030", "Stratégies Prioritaires", "Feuille de Route"])
+        tab1, tab2, tab3 = self.create_tabs(["Objectifs 2030", "Stratégies Prioritaires", "Feuille de Route"], key='strategies')
         
-        with tab1:
-            st.subheader("Objectifs Nationaux 2030")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("""
-                ### 🎯 Objectif Principal
+        if tab1 is not None:
+            with tab1:
+                st.subheader("Objectifs Nationaux 2030")
                 
-                **Réduction de 20% de la consommation**
+                col1, col2, col3 = st.columns(3)
                 
-                • < 6.5L/pers/an  
-                • -30% de binge drinking  
-                • -40% de mortalité liée  
-                """)
-            
-            with col2:
-                st.markdown("""
-                ### 📊 Cibles Intermédiaires
-                
-                **2025:**
-                • < 7.5L/pers/an  
-                • -15% de binge drinking  
-                • Prix minimum unitaire  
-                
-                **2027:**
-                • < 7.0L/pers/an  
-                • -25% de binge drinking  
-                • Publicité totalement encadrée  
-                """)
-            
-            with col3:
-                st.markdown("""
-                ### 📈 Indicateurs de Suivi
-                
-                • Consommation déclarée  
-                • Ventes d'alcool  
-                • Binge drinking jeune  
-                • Accidents routiers alcoolisés  
-                • Hospitalisations  
-                """)
-        
-        with tab2:
-            st.subheader("Stratégies Prioritaires")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                ### 🚨 Actions Immédiates (2024-2025)
+                with col1:
+                    st.markdown("""
+                    ### 🎯 Objectif Principal
+                    
+                    **Réduction de 20% de la consommation**
+                    
+                    • < 6.5L/pers/an  
+                    • -30% de binge drinking  
+                    • -40% de mortalité liée  
+                    """)
                 
-                **1. Prix minimum unitaire**
-                • Application sur toutes les boissons  
-                • Objectif: réduction accessibilité  
+                with col2:
+                    st.markdown("""
+                    ### 📊 Cibles Intermédiaires
+                    
+                    **2025:**
+                    • < 7.5L/pers/an  
+                    • -15% de binge drinking  
+                    • Prix minimum unitaire  
+                    
+                    **2027:**
+                    • < 7.0L/pers/an  
+                    • -25% de binge drinking  
+                    • Publicité totalement encadrée  
+                    """)
                 
-                **2. Renforcement des contrôles**
-                • Alcootests préventifs  
-                • Sanctions renforcées  
+                with col3:
+                    st.markdown("""
+                    ### 📈 Indicateurs de Suivi
+                    
+                    • Consommation déclarée  
+                    • Ventes d'alcool  
+                    • Binge drinking jeune  
+                    • Accidents routiers alcoolisés  
+                    • Hospitalisations  
+                    """)
+        
+        if tab2 is not None:
+            with tab2:
+                st.subheader("Stratégies Prioritaires")
                 
-                **3. Prévention jeune**
-                • Campagnes ciblées réseaux sociaux  
-                • Intervention en milieu scolaire  
-                """)
-            
-            with col2:
-                st.markdown("""
-                ### 🏗️ Réformes Structurelles (2026-2030)
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.markdown("""
+                    ### 🚨 Actions Immédiates (2024-2025)
+                    
+                    **1. Prix minimum unitaire**
+                    • Application sur toutes les boissons  
+                    • Objectif: réduction accessibilité  
+                    
+                    **2. Renforcement des contrôles**
+                    • Alcootests préventifs  
+                    • Sanctions renforcées  
+                    
+                    **3. Prévention jeune**
+                    • Campagnes ciblées réseaux sociaux  
+                    • Intervention en milieu scolaire  
+                    """)
+                
+                with col2:
+                    st.markdown("""
+                    ### 🏗️ Réformes Structurelles (2026-2030)
+                    
+                    **1. Encadrement total publicité**
+                    • Interdiction sponsoring événements  
+                    • Restrictions packaging  
+                    
+                    **2. Dépistage systématique**
+                    • Médecine du travail  
+                    • Médecine scolaire  
+                    
+                    **3. Prise en charge renforcée**
+                    • Désaddiction remboursée  
+                    • Maisons des addictions  
+                    """)
+        
+        if tab3 is not None:
+            with tab3:
+                st.subheader("Feuille de Route Détaillée")
                 
-                **1. Encadrement total publicité**
-                • Interdiction sponsoring événements  
-                • Restrictions packaging  
+                roadmap = [
+                    {'periode': '2024', 'actions': ['Loi prix minimum', 'Campagne jeunes', 'Renforcement contrôles']},
+                    {'periode': '2025', 'actions': ['Évaluation prix minimum', 'Extension prévention', 'Formation professionnels']},
+                    {'periode': '2026-2027', 'actions': ['Nouvelle hausse taxes', 'Interdiction publicité', 'Dépistage élargi']},
+                    {'periode': '2028-2030', 'actions': ['Objectif 6.5L atteint', 'Évaluation stratégique', 'Adaptation politiques']},
+                ]
                 
-                **2. Dépistage systématique**
-                • Médecine du travail  
-                • Médecine scolaire  
+                for step in roadmap:
+                    with st.expander(f"📅 {step['periode']}"):
+                        for action in step['actions']:
+                            st.write(f"• {action}")
                 
-                **3. Prise en charge renforcée**
-                • Désaddiction remboursée  
-                • Maisons des addictions  
-                """)
+                # Graphique de projection
+                if self.model.show_projections:
+                    self.display_projection()
+    
+    def display_projection(self):
+        """Projection 2030 avec curseurs de scénario (grille précalculée en arrière-plan)"""
+        st.subheader("Projection et Scénarios")
         
-        with tab3:
-            st.subheader("Feuille de Route Détaillée")
-            
-            roadmap = [
-                {'periode': '2024', 'actions': ['Loi prix minimum', 'Campagne jeunes', 'Renforcement contrôles']},
-                {'periode': '2025', 'actions': ['Évaluation prix minimum', 'Extension prévention', 'Formation professionnels']},
-                {'periode': '2026-2027', 'actions': ['Nouvelle hausse taxes', 'Interdiction publicité', 'Dépistage élargi']},
-                {'periode': '2028-2030', 'actions': ['Objectif 6.5L atteint', 'Évaluation stratégique', 'Adaptation politiques']},
-            ]
-            
-            for step in roadmap:
-                with st.expander(f"📅 {step['periode']}"):
-                    for action in step['actions']:
-                        st.write(f"• {action}")
-            
-            # Graphique de projection
-            years_projection = list(range(2020, 2031))
-            consumption_projection = [8.9, 8.7, 8.5, 8.3, 8.0, 7.7, 7.4, 7.1, 6.8, 6.6, 6.5]
-            
-            fig = px.line(x=years_projection, y=consumption_projection,
-                         title='Projection de la Consommation d\'Alcool 2020-2030',
-                         markers=True)
-            fig.add_hrect(y0=0, y1=6.5, line_width=0, fillcolor="green", opacity=0.2,
-                         annotation_text="Objectif 2030")
-            fig.update_layout(yaxis_title="Consommation (L/pers/an)", xaxis_title="Année")
-            st.plotly_chart(fig, use_container_width=True)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tax = st.select_slider("Hausse des taxes (%)", SCENARIO_AXES['hausse_taxes'].tolist(),
+                                   value=0, key='scenario_taxes')
+        with col2:
+            mup = st.select_slider("Prix minimum unitaire (€/unité)", SCENARIO_AXES['prix_minimum'].tolist(),
+                                   value=0.0, key='scenario_prix_minimum')
+        with col3:
+            prevention = st.select_slider("Prévention supplémentaire (€/hab)", SCENARIO_AXES['prevention'].tolist(),
+                                          value=0.0, key='scenario_prevention')
+        
+        scenario = (tax, mup, prevention)
+        job = self.model.scenario_grid_job(get_background_executor())
+        if any(scenario) and not job.done():
+            st.info("⏳ Calcul des scénarios en cours : projection de référence affichée")
+            scenario = (0, 0.0, 0.0)
+        
+        self.show_figure('strategies.projection', lambda: self.model.build_projection_figure(scenario), *scenario)
+        st.caption("Lissage exponentiel à tendance amortie (intervalles 80 % et 95 %). "
+                   "Effets des mesures selon des hypothèses d'élasticité, montés en charge sur 3 ans.")
+    
+    def create_synthesis(self):
+        """Synthèse stratégique"""
+        st.markdown("## 💡 SYNTHÈSE STRATÉGIQUE")
+        
+        consumption = self.model.key_metrics['historical_data']['consommation_alcool']
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            ### ✅ SUCCÈS ET PROGRÈS
+            
+            **Baisse continue depuis {consumption['annee_debut']}:**
+            • Consommation divisée par {consumption['ratio']:.1f}  
+            • Mortalité routière réduite  
+            • Prévention renforcée  
+            • Prise de conscience collective  
+            
+            **Politiques efficaces:**
+            • Encadrement publicité  
+            • Contrôles routiers  
+            • Prévention jeune  
+            • Services d'aide  
+            """)
+        
+        with col2:
+            st.markdown("""
+            ### ⚠️ DÉFIS PERSISTANTS
+            
+            **Problématiques spécifiques:**
+            • Binge drinking jeune en hausse  
+            • Inégalités sociales marquées  
+            • Culture vin persistante  
+            • Accessibilité importante  
+            
+            **Nouveaux enjeux:**
+            • Alcoolisation express  
+            • Nouvelles boissons  
+            • Commerce en ligne  
+            • Normalisation sociale  
+            """)
+        
+        st.markdown("""
+        ### 🚨 ALERTES ET RECOMMANDATIONS
+        
+        **Niveau d'Alerte: MODÉRÉ**
+        
+        **Points de Vigilance:**
+        • Stagnation de la baisse  
+        • Binge drinking jeune  
+        • Inégalités territoriales  
+        • Nouveaux modes de consommation  
+        
+        **Recommandations Immédiates:**
+        1. Mise en place du prix minimum unitaire  
+        2. Renforcement de la prévention jeune  
+        3. Lutte contre les inégalités sociales  
+        4. Encadrement du commerce numérique  
+        5. Coordination européenne renforcée  
+        """)
     
     def create_sidebar(self):
         """Crée la sidebar avec les contrôles"""
@@ -812,138 +800,361 @@ class AlcoholDashboard:
         
         # Période d'analyse
         st.sidebar.markdown("### 📅 Période d'analyse")
+        available_years = self.model.historical_data['annee'].tolist()
         annee_debut = st.sidebar.selectbox("Année de début", 
-                                         list(range(2000, 2024)), 
+                                         available_years, 
                                          index=0)
         annee_fin = st.sidebar.selectbox("Année de fin", 
-                                       list(range(2000, 2024)), 
-                                       index=23)
+                                       available_years, 
+                                       index=len(available_years) - 1)
+        if annee_debut > annee_fin:
+            st.sidebar.warning("Année de début postérieure à l'année de fin : les bornes sont inversées")
         
         # Focus d'analyse
         st.sidebar.markdown("### 🎯 Focus d'analyse")
         focus_analysis = st.sidebar.multiselect(
             "Domaines à approfondir:",
-            ['Consommation', 'Politiques', 'Impact santé', 'Disparités régionales', 'Comparaisons internationales'],
-            default=['Consommation', 'Politiques']
+            FOCUS_AREAS,
+            default=FOCUS_AREAS
         )
         
         # Options d'affichage
         st.sidebar.markdown("### ⚙️ Options")
         show_projections = st.sidebar.checkbox("Afficher les projections", value=True)
         auto_refresh = st.sidebar.checkbox("Rafraîchissement automatique", value=False)
+        lazy_navigation = st.sidebar.checkbox("Navigation à la demande", value=True,
+                                              help="Ne calcule que la section affichée au lieu de tous les onglets")
         
-        # Bouton d'export
-        if st.sidebar.button("📊 Exporter l'analyse"):
-            st.sidebar.success("Export réalisé avec succès!")
+        # Bouton d'export (traité après le rendu, avec les filtres appliqués)
+        export_requested = st.sidebar.button("📊 Exporter l'analyse")
         
         return {
             'annee_debut': annee_debut,
             'annee_fin': annee_fin,
             'focus_analysis': focus_analysis,
             'show_projections': show_projections,
-            'auto_refresh': auto_refresh
+            'auto_refresh': auto_refresh,
+            'lazy_navigation': lazy_navigation,
+            'export_requested': export_requested
         }
     
+    def start_export(self):
+        """Lance l'export de toutes les sections hors du thread de rendu"""
+        from alcool.export import start_export
+        
+        model = self.model
+        # Constructeurs seulement : les figures sont construites par le job, hors du thread de rendu
+        figures = [(section, chart_id, partial(model.cached_figure, chart_id, builder, *state))
+                   for section, chart_id, builder, state in model.figure_catalog()
+                   if section != "Stratégies" or model.show_projections]
+        st.session_state['export_job'] = start_export(get_background_executor(), figures,
+                                                      model.export_tables, EXPORT_DIR)
+    
+    def display_export_status(self):
+        """Progression de l'export dans la sidebar, actualisée chaque seconde tant qu'il tourne"""
+        job = st.session_state.get('export_job')
+        if job is None:
+            return
+        polling = not job.finished
+        with st.sidebar:
+            st.fragment(run_every=1 if polling else None)(self.render_export_status)(job, polling)
+    
+    def render_export_status(self, job, polling):
+        if not job.finished:
+            st.progress(job.progress, text=f"📊 Export : {job.status}")
+        elif polling:
+            # Export terminé : un rendu complet arrête l'actualisation périodique
+            st.rerun()
+        elif job.error is not None:
+            st.error(f"📊 Export : {job.status}")
+        elif not os.path.exists(job.path):
+            st.info("📊 Archive d'export expirée : relancez l'export")
+        else:
+            with open(job.path, 'rb') as handle:
+                st.download_button("⬇️ Télécharger l'export", handle.read(),
+                                   file_name=os.path.basename(job.path), mime='application/zip')
+    
+    def display_cache_stats(self):
+        """Affiche les compteurs du cache de figures dans la sidebar"""
+        stats = self.figure_cache.stats()
+        st.sidebar.caption(
+            f"🧠 Cache graphiques : {stats['hits']} hits / {stats['misses']} misses, "
+            f"{stats['entries']} figures ({stats['bytes'] / 1024:.0f} Ko / "
+            f"{stats['max_bytes'] / 1024 / 1024:.0f} Mo), {stats['evictions']} évictions"
+        )
+    
     def run_dashboard(self):
         """Exécute le dashboard complet"""
-        # Sidebar
-        controls = self.create_sidebar()
+        with self.timer('rerun_seconds'):
+            # Sidebar
+            controls = self.create_sidebar()
+            
+            # Header
+            self.display_header()
+            
+            # Contenu dépendant des données, rafraîchi seul par un minuteur côté client
+            run_every = REFRESH_INTERVAL_SECONDS if controls['auto_refresh'] else None
+            st.fragment(run_every=run_every)(self.display_live_content)(controls)
+            
+            # Export en arrière-plan
+            if controls['export_requested']:
+                self.start_export()
+            self.display_export_status()
+            
+            # Statistiques du cache de figures
+            self.display_cache_stats()
         
-        # Header
-        self.display_header()
+        # Panneau des mesures (uniquement si activées)
+        if self.instrumentation is not None:
+            self.display_performance_panel()
+    
+    def performance_counters(self):
+        """Compteurs du cache de figures joints aux exports de mesures"""
+        stats = self.figure_cache.stats()
+        counters = {
+            'figure_cache_hits_total': stats['hits'],
+            'figure_cache_misses_total': stats['misses'],
+            'figure_cache_evictions_total': stats['evictions'],
+            'figure_cache_entries': stats['entries'],
+            'figure_cache_bytes': stats['bytes'],
+        }
+        for row in self.model.memory_report().itertuples():
+            counters[f"table_{row.table.replace('.', '_')}_bytes"] = row.octets
+        return counters
+    
+    def payload_report(self, rows):
+        """Taille JSON de chaque figure avant et après allègement, d'après les mesures enregistrées"""
+        sizes = {}
+        for row in rows:
+            if row['mesure'] in ('figure_json_bytes', 'figure_payload_bytes'):
+                sizes.setdefault(row['etiquettes']['chart'], {})[row['mesure']] = row['dernier']
+        if not sizes:
+            return None
+        import pandas as pd
+        report = pd.DataFrame([{'graphique': chart, 'complete': values.get('figure_json_bytes'),
+                                'envoyee': values.get('figure_payload_bytes')}
+                               for chart, values in sorted(sizes.items())])
+        report['gain'] = 1 - report['envoyee'] / report['complete']
+        return report
+    
+    def display_performance_panel(self):
+        """Panneau « ⏱️ Performance » : séries mesurées et exports Prometheus / JSON"""
+        with st.sidebar.expander("⏱️ Performance", expanded=False):
+            rows = self.instrumentation.snapshot()
+            if rows:
+                import pandas as pd
+                table = pd.DataFrame(rows).drop(columns='histogramme')
+                table['etiquettes'] = [', '.join(f"{key}={value}" for key, value in labels.items())
+                                       for labels in table['etiquettes']]
+                st.dataframe(table, hide_index=True, use_container_width=True)
+            else:
+                st.caption("Aucune mesure enregistrée")
+            
+            payloads = self.payload_report(rows)
+            if payloads is not None:
+                st.caption("Charge JSON des figures (complète / envoyée)")
+                st.dataframe(payloads, hide_index=True, use_container_width=True)
+            
+            st.caption("Mises à jour des vues matérialisées")
+            st.dataframe(list(get_materialized_views().history)[::-1], hide_index=True, use_container_width=True)
+            
+            shared = f" (mappées depuis {SHARED_DIR})" if self.model.data['shared'] else ""
+            st.caption("Mémoire des tables partagées" + shared)
+            st.dataframe(self.model.memory_report(), hide_index=True, use_container_width=True)
+            
+            counters = self.performance_counters()
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button("Prometheus", self.instrumentation.to_prometheus(counters),
+                                   file_name='alcool_metrics.prom', mime='text/plain')
+            with col2:
+                st.download_button("JSON", self.instrumentation.to_json(counters),
+                                   file_name='alcool_metrics.json', mime='application/json')
+            if st.button("Réinitialiser les mesures", key='reset_mesures'):
+                self.instrumentation.reset()
+    
+    def display_live_content(self, controls):
+        """Affiche les métriques et les sections (fragment rafraîchissable sans relancer la page)"""
+        if controls['auto_refresh']:
+            # Données reconstruites seulement si un fichier source a changé depuis le dernier rendu
+            self.load_data(self.data_version)
+            st.caption(f"🔄 Données actualisées à {datetime.now().strftime('%H:%M:%S')} "
+                       f"(rafraîchissement toutes les {REFRESH_INTERVAL_SECONDS // 60} min)")
+        model = self.model
+        model.apply_filters(controls)
         
         # Métriques clés
         self.display_key_metrics()
         
-        # Navigation par onglets
-        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+        # Sections hors du focus d'analyse : ni calculées ni affichées
+        excluded = []
+        if not model.focus & {'Consommation', 'Impact santé'}:
+            excluded.append("📈 Historique")
+        if 'Politiques' not in model.focus:
+            excluded.append("🏛️ Politiques")
+        if 'Disparités régionales' not in model.focus:
+            excluded.append("🗺️ Régional")
+        if 'Comparaisons internationales' not in model.focus:
+            excluded.append("🌍 International")
+        
+        # Navigation par onglets (seule la section active est calculée en mode à la demande)
+        self.lazy_navigation = controls['lazy_navigation']
+        tab1, tab2, tab3, tab4, tab5, tab6 = self.create_tabs([
             "📈 Historique", 
             "🏛️ Politiques", 
             "🗺️ Régional", 
             "🌍 International", 
             "🎯 Stratégies",
             "💡 Synthèse"
-        ])
-        
-        with tab1:
-            self.create_historical_analysis()
+        ], key='navigation', excluded=excluded)
         
-        with tab2:
-            self.create_policy_analysis()
+        if tab1 is not None:
+            with tab1, self.timer('section_seconds', section='create_historical_analysis'):
+                self.create_historical_analysis()
         
-        with tab3:
-            self.create_regional_analysis()
+        if tab2 is not None:
+            with tab2, self.timer('section_seconds', section='create_policy_analysis'):
+                self.create_policy_analysis()
         
-        with tab4:
-            self.create_international_comparison()
+        if tab3 is not None:
+            with tab3, self.timer('section_seconds', section='create_regional_analysis'):
+                self.create_regional_analysis()
         
-        with tab5:
-            self.create_strategic_recommendations()
+        if tab4 is not None:
+            with tab4, self.timer('section_seconds', section='create_international_comparison'):
+                self.create_international_comparison()
         
-        with tab6:
-            st.markdown("## 💡 SYNTHÈSE STRATÉGIQUE")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("""
-                ### ✅ SUCCÈS ET PROGRÈS
-                
-                **Baisse continue depuis 20 ans:**
-                • Consommation divisée par 1.6  
-                • Mortalité routière réduite  
-                • Prévention renforcée  
-                • Prise de conscience collective  
-                
-                **Politiques efficaces:**
-                • Encadrement publicité  
-                • Contrôles routiers  
-                • Prévention jeune  
-                • Services d'aide  
-                """)
-            
-            with col2:
-                st.markdown("""
-                ### ⚠️ DÉFIS PERSISTANTS
-                
-                **Problématiques spécifiques:**
-                • Binge drinking jeune en hausse  
-                • Inégalités sociales marquées  
-                • Culture vin persistante  
-                • Accessibilité importante  
-                
-                **Nouveaux enjeux:**
-                • Alcoolisation express  
-                • Nouvelles boissons  
-                • Commerce en ligne  
-                • Normalisation sociale  
-                """)
-            
-            st.markdown("""
-            ### 🚨 ALERTES ET RECOMMANDATIONS
-            
-            **Niveau d'Alerte: MODÉRÉ**
-            
-            **Points de Vigilance:**
-            • Stagnation de la baisse  
-            • Binge drinking jeune  
-            • Inégalités territoriales  
-            • Nouveaux modes de consommation  
-            
-            **Recommandations Immédiates:**
-            1. Mise en place du prix minimum unitaire  
-            2. Renforcement de la prévention jeune  
-            3. Lutte contre les inégalités sociales  
-            4. Encadrement du commerce numérique  
-            5. Coordination européenne renforcée  
-            """)
+        if tab5 is not None:
+            with tab5, self.timer('section_seconds', section='create_strategic_recommendations'):
+                self.create_strategic_recommendations()
         
-        # Rafraîchissement automatique
-        if controls['auto_refresh']:
-            time.sleep(300)
-            st.rerun()
+        if tab6 is not None:
+            with tab6, self.timer('section_seconds', section='create_synthesis'):
+                self.create_synthesis()
+
+# Génération par lots (sans serveur Streamlit)
+BATCH_FORMATS = ('html', 'json', 'png')
+
+@lru_cache(maxsize=1)
+def batch_dashboard_data():
+    """Données chargées une seule fois par processus du pool (initialiseur), puis réutilisées par chaque tâche"""
+    return build_dashboard_data(get_data_sources())
+
+def render_batch_task(task):
+    """Écrit les figures d'une combinaison de paramètres (exécuté dans un processus du pool)"""
+    model = DashboardModel(batch_dashboard_data())
+    model.apply_filters({
+        'annee_debut': task['periode'][0],
+        'annee_fin': task['periode'][1],
+        'focus_analysis': task['focus'],
+        'show_projections': True,
+    })
+
+    output_dir = os.path.join(task['out'], task['slug'])
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for section, chart_id, builder, state in model.figure_catalog(task['niveau']):
+        focus = chart_focus(chart_id)
+        if focus is not None and focus not in model.focus:
+            continue
+        fig = model.cached_figure(chart_id, builder, *state)
+        path = os.path.join(output_dir, chart_id)
+        if 'html' in task['formats']:
+            # plotly.js partagé à la racine du répertoire de sortie
+            fig.write_html(path + '.html', include_plotlyjs='../plotly.min.js')
+        if 'json' in task['formats']:
+            with open(path + '.json', 'w', encoding='utf-8') as handle:
+                handle.write(fig.to_json())
+        if 'png' in task['formats']:
+            fig.write_image(path + '.png', width=1200, height=700)
+        written.append({'section': section, 'graphique': chart_id, 'titre': fig.layout.title.text})
+    return {**task, 'graphiques': written}
+
+def build_batch_index(results):
+    """Page d'accueil listant les rapports HTML générés"""
+    sections = []
+    for result in results:
+        links = ''.join(f'<li><a href="{result["slug"]}/{chart["graphique"]}.html">{chart["titre"] or chart["graphique"]}</a></li>'
+                        for chart in result['graphiques'])
+        sections.append(f"<h2>{result['periode'][0]}-{result['periode'][1]} · {LEVEL_LABELS[result['niveau']]} · "
+                        f"{', '.join(result['focus'])}</h2><ul>{links}</ul>")
+    return ('<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">'
+            '<title>Rapports Alcool France</title></head><body><h1>🍷 Rapports Alcool France</h1>'
+            + ''.join(sections) + '</body></html>')
+
+def period_argument(value):
+    """Fenêtre d'années « DEBUT-FIN » (ou une seule année) de la ligne de commande"""
+    start, separator, end = value.partition('-')
+    try:
+        period = (int(start), int(end if separator else start))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"période invalide : {value!r} (attendu DEBUT-FIN, par exemple 2010-2023)")
+    if period[0] > period[1]:
+        raise argparse.ArgumentTypeError(f"période invalide : {value!r} (début postérieur à la fin)")
+    return period
+
+def batch_main(argv=None):
+    """Génère des rapports statiques pour toutes les combinaisons de paramètres demandées"""
+    parser = argparse.ArgumentParser(
+        description="Génération des graphiques du dashboard sans serveur Streamlit "
+                    "(lancer « streamlit run Dashboard.py » pour l'interface)")
+    parser.add_argument('--out', default='build/rapports', help="répertoire de sortie")
+    parser.add_argument('--periode', action='append', metavar='DEBUT-FIN', type=period_argument,
+                        help="fenêtre d'années (répétable), par défaut toute la série")
+    parser.add_argument('--niveau', action='append', choices=list(LEVEL_LABELS),
+                        help="niveau géographique (répétable), par défaut region")
+    parser.add_argument('--focus', action='append', metavar='DOMAINE[,DOMAINE]',
+                        help="domaines du focus séparés par des virgules (répétable), par défaut tous")
+    parser.add_argument('--format', action='append', choices=BATCH_FORMATS, dest='formats',
+                        help="formats de sortie (répétable), par défaut html et json")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="nombre de processus")
+    args = parser.parse_args(argv)
+    focus_sets = [[area.strip() for area in focus.split(',')] for focus in args.focus or [','.join(FOCUS_AREAS)]]
+    for focus in focus_sets:
+        unknown = set(focus) - set(FOCUS_AREAS)
+        if unknown:
+            parser.error(f"domaines inconnus : {', '.join(sorted(unknown))}")
+    formats = args.formats or ['html', 'json']
+
+    # Données chargées ici pour la période et les niveaux disponibles ; l'initialiseur du pool
+    # les reprend du cache hérité (fork) ou les recharge une fois par processus (spawn)
+    model = DashboardModel(batch_dashboard_data())
+    periods = args.periode or [model.period]
+    levels = args.niveau or ['region']
+    missing = [level for level in levels if level not in model.regional_engine.levels]
+    if missing:
+        parser.error(f"niveaux absents des données : {', '.join(missing)} "
+                     f"(disponibles : {', '.join(model.regional_engine.levels)})")
+
+    tasks = []
+    for period, level, focus in product(periods, levels, focus_sets):
+        slug = f"{period[0]}-{period[1]}_{level}_" + ''.join(str(FOCUS_AREAS.index(area)) for area in focus)
+        tasks.append({'periode': period, 'niveau': level, 'focus': focus, 'formats': formats,
+                      'out': args.out, 'slug': slug})
+
+    os.makedirs(args.out, exist_ok=True)
+    if 'html' in formats:
+        from plotly.offline import get_plotlyjs
+        with open(os.path.join(args.out, 'plotly.min.js'), 'w', encoding='utf-8') as handle:
+            handle.write(get_plotlyjs())
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=batch_dashboard_data) as pool:
+        results = list(pool.map(render_batch_task, tasks))
+
+    with open(os.path.join(args.out, 'manifest.json'), 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, ensure_ascii=False, indent=2)
+    if 'html' in formats:
+        with open(os.path.join(args.out, 'index.html'), 'w', encoding='utf-8') as handle:
+            handle.write(build_batch_index(results))
+    print(f"{len(results)} combinaisons, {sum(len(result['graphiques']) for result in results)} graphiques "
+          f"écrits dans {args.out}")
+    return 0
 
 # Lancement du dashboard
 if __name__ == "__main__":
-    dashboard = AlcoholDashboard()
-    dashboard.run_dashboard()
\ No newline at end of file
+    if st.runtime.exists():
+        configure_page()
+        dashboard = AlcoholDashboard()
+        dashboard.run_dashboard()
+    else:
+        sys.exit(batch_main())
\ No newline at end of file
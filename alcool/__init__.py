@@ -0,0 +1 @@
+"""Couche données et calculs du dashboard alcool (indépendante de Streamlit)"""
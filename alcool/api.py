@@ -0,0 +1,353 @@
+"""API HTTP locale en lecture seule : jeux de données et agrégats du dashboard en JSON ou Arrow
+
+Serveur asyncio sans dépendance. Toutes les réponses d'une version des données
+(corps JSON et flux Arrow IPC, bruts et compressés gzip / zstd) sont calculées une fois
+au chargement : une requête se résume à une recherche dans un dictionnaire. L'ETag est
+dérivé de la version des jeux intégrés (DATA_VERSION) et de l'empreinte des fichiers
+sources ; un client qui renvoie If-None-Match reçoit 304 sans corps tant que les données
+n'ont pas changé. Les sources sont surveillées et la version suivante est préparée en
+arrière-plan, puis substituée d'un bloc.
+
+    python -m alcool.api --port 8600
+    curl -H 'Accept-Encoding: gzip' http://127.0.0.1:8600/datasets/historical_data
+    curl 'http://127.0.0.1:8600/aggregates/key_metrics/historical_data?format=arrow'
+"""
+import argparse
+import asyncio
+from email.utils import formatdate
+import gzip
+import importlib.util
+import json
+import logging
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from alcool.builtin_data import BUILTIN_DATASETS, DATA_VERSION
+from alcool.data_sources import DATA_DIR, HAS_PYARROW, HASH_CONTENTS, BuiltinSource, FileSource, sources_fingerprint
+from alcool.materialized import MaterializedViews
+from alcool.model import DashboardModel, build_dashboard_data
+from alcool.payload import round_significant
+from alcool.survey import SURVEY_GROUPS
+
+logger = logging.getLogger(__name__)
+
+# zstandard est optionnel : sans lui, pas de compression zstd
+HAS_ZSTD = importlib.util.find_spec('zstandard') is not None
+
+API_HOST = '127.0.0.1'
+API_PORT = 8600
+
+# Intervalle de vérification des fichiers sources (secondes)
+POLL_SECONDS = 5.0
+
+# En dessous de cette taille, un corps n'est pas compressé
+COMPRESS_MIN_BYTES = 512
+
+# Chiffres significatifs des nombres flottants en JSON (précision d'un float32)
+JSON_DIGITS = 7
+
+# Taille maximale des en-têtes d'une requête
+MAX_HEADER_BYTES = 16 * 1024
+
+# Tables servies telles quelles
+DATASETS = ['historical_data', 'policy_timeline', 'regional_data', 'regional_panel',
+            'international_comparison', 'health_impact_data']
+
+MEDIA_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 406: 'Not Acceptable', 413: 'Payload Too Large',
+           431: 'Request Header Fields Too Large', 503: 'Service Unavailable'}
+
+
+def api_resources(model):
+    """Ressources servies : chemin -> fonction retournant un DataFrame"""
+    resources = {f'/datasets/{name}': (lambda name=name: getattr(model, name)) for name in DATASETS}
+    for name, metrics in model.key_metrics.items():
+        resources[f'/aggregates/key_metrics/{name}'] = lambda metrics=metrics: pd.DataFrame(metrics.table())
+    resources['/aggregates/regional_metrics'] = lambda: pd.DataFrame(model.regional_metrics.table())
+    for level in model.regional_engine.levels:
+        resources[f'/aggregates/territories/{level}'] = lambda level=level: model.regional_engine.tables[level]
+    resources['/aggregates/policy_impacts'] = model.policy_impacts
+    resources['/aggregates/forecast'] = lambda: model.forecast()[0]
+    if model.survey is not None:
+        for group in SURVEY_GROUPS:
+            resources[f'/aggregates/survey/{group}'] = lambda group=group: model.survey_profile(group)
+    return resources
+
+
+def json_body(df):
+    """Lignes de df en tableau d'objets JSON (valeurs manquantes : null)
+
+    Toutes les colonnes flottantes sont arrondies à JSON_DIGITS chiffres significatifs : les
+    tables sont stockées en float32 et les agrégats qui en dérivent n'ont pas plus de
+    précision (8.3 et non 8.3000001907).
+    """
+    columns = {name: round_significant(df[name].to_numpy(np.float64), JSON_DIGITS)
+               for name in df.columns if df[name].dtype.kind == 'f'}
+    if columns:
+        df = df.assign(**columns)
+    return df.to_json(orient='records', force_ascii=False).encode('utf-8')
+
+
+def arrow_body(df):
+    """df en flux Arrow IPC"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def encoded_bodies(body):
+    """Corps brut et variantes compressées : encodage -> octets"""
+    bodies = {'identity': body}
+    if len(body) < COMPRESS_MIN_BYTES:
+        return bodies
+    bodies['gzip'] = gzip.compress(body, compresslevel=6, mtime=0)
+    if HAS_ZSTD:
+        import zstandard
+        bodies['zstd'] = zstandard.ZstdCompressor(level=3).compress(body)
+    return bodies
+
+
+def accepted_encodings(header):
+    """Encodages acceptés par le client (q > 0), d'après Accept-Encoding"""
+    accepted = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def etag_matches(header, etag):
+    """If-None-Match correspond à l'ETag (comparaison faible, variantes compressées comprises)"""
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        if tag == etag or tag.rsplit('-', 1)[0] == etag:
+            return True
+    return False
+
+
+class ApiSnapshot:
+    """Réponses précalculées d'une version des données"""
+
+    def __init__(self, model, version):
+        self.version = version
+        self.created = time.time()
+        self.responses = {}
+        formats = ['json', 'arrow'] if HAS_PYARROW else ['json']
+        for path, frame in api_resources(model).items():
+            df = frame()
+            self.responses[path] = {'json': encoded_bodies(json_body(df))}
+            if 'arrow' in formats:
+                self.responses[path]['arrow'] = encoded_bodies(arrow_body(df))
+        index = {'version': version, 'formats': formats,
+                 'ressources': sorted(self.responses)}
+        self.responses['/'] = {'json': encoded_bodies(json.dumps(index, ensure_ascii=False).encode('utf-8'))}
+
+
+class ApiServer:
+    """Serveur HTTP/1.1 (keep-alive, GET et HEAD) sur la version courante des données"""
+
+    def __init__(self, sources, poll=POLL_SECONDS):
+        self.sources = sources
+        self.poll = poll
+        self.views = MaterializedViews()
+        self.snapshot = None
+        self.requests = 0
+        self._date = (0, b'')
+
+    def version(self):
+        """Version des données : version du code des jeux (DATA_VERSION) et empreinte des fichiers sources"""
+        return f'{DATA_VERSION}-{sources_fingerprint(self.sources)}'
+
+    def load(self):
+        """Prépare les réponses de la version courante des sources (appelé hors de la boucle)"""
+        version = self.version()
+        model = DashboardModel(build_dashboard_data(self.sources, self.views), (version,))
+        return ApiSnapshot(model, version)
+
+    async def watch(self):
+        """Recharge en arrière-plan dès que l'empreinte des sources change"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll)
+            try:
+                version = await loop.run_in_executor(None, self.version)
+                if self.snapshot is None or version != self.snapshot.version:
+                    self.snapshot = await loop.run_in_executor(None, self.load)
+            except Exception:
+                # Fichier en cours d'écriture ou invalide : la version précédente reste servie,
+                # le rechargement est retenté à la vérification suivante
+                logger.exception("Rechargement des données impossible, version %s conservée",
+                                 self.snapshot.version if self.snapshot is not None else None)
+
+    def date_header(self):
+        """En-tête Date, mis en forme une fois par seconde"""
+        now = int(time.time())
+        if self._date[0] != now:
+            self._date = (now, formatdate(now, usegmt=True).encode('ascii'))
+        return self._date[1]
+
+    def respond(self, method, target, headers):
+        """(statut, en-têtes supplémentaires, corps) d'une requête"""
+        self.requests += 1
+        if method not in ('GET', 'HEAD'):
+            return self.error(405, "Méthode non autorisée (lecture seule)", [(b'Allow', b'GET, HEAD')])
+        snapshot = self.snapshot
+        if snapshot is None:
+            return self.error(503, "Données en cours de chargement")
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        representations = snapshot.responses.get(path)
+        if representations is None:
+            return self.error(404, f"Ressource inconnue : {path}")
+
+        query = parse_qs(url.query)
+        fmt = query.get('format', [None])[0]
+        if fmt is None:
+            fmt = 'arrow' if MEDIA_TYPES['arrow'] in headers.get('accept', '') else 'json'
+        if fmt not in representations:
+            return self.error(406, f"Format indisponible : {fmt}")
+        bodies = representations[fmt]
+
+        accepted = accepted_encodings(headers.get('accept-encoding', ''))
+        encoding = next((name for name in ('zstd', 'gzip') if name in accepted and name in bodies), 'identity')
+        etag = f'{snapshot.version}-{path.strip("/").replace("/", ".") or "index"}-{fmt}'
+        extra = [
+            (b'Cache-Control', b'no-cache'),
+            (b'Vary', b'Accept, Accept-Encoding'),
+            (b'X-Data-Version', snapshot.version.encode('ascii')),
+            (b'ETag', f'"{etag}-{encoding}"'.encode('ascii') if encoding != 'identity'
+                      else f'"{etag}"'.encode('ascii')),
+        ]
+        if etag_matches(headers.get('if-none-match', ''), etag):
+            return 304, extra, b''
+        extra.append((b'Content-Type', MEDIA_TYPES[fmt].encode('ascii')))
+        if encoding != 'identity':
+            extra.append((b'Content-Encoding', encoding.encode('ascii')))
+        return 200, extra, bodies[encoding]
+
+    def error(self, status, message, extra=()):
+        body = json.dumps({'erreur': message}, ensure_ascii=False).encode('utf-8')
+        return status, [(b'Content-Type', MEDIA_TYPES['json'].encode('ascii')), *extra], body
+
+    def response_bytes(self, status, extra, body, head_only=False, keep_alive=True):
+        """Réponse HTTP/1.1 sérialisée"""
+        lines = [f'HTTP/1.1 {status} {REASONS[status]}'.encode('ascii'), b'Date: ' + self.date_header()]
+        lines += [name + b': ' + value for name, value in extra]
+        if status != 304:
+            lines.append(b'Content-Length: ' + str(len(body)).encode('ascii'))
+        if not keep_alive:
+            lines.append(b'Connection: close')
+        head = b'\r\n'.join(lines) + b'\r\n\r\n'
+        return head if head_only or status == 304 else head + body
+
+    async def serve(self, host=API_HOST, port=API_PORT):
+        """Charge les données puis sert jusqu'à l'arrêt du processus"""
+        loop = asyncio.get_running_loop()
+        self.snapshot = await loop.run_in_executor(None, self.load)
+        server = await loop.create_server(lambda: ApiProtocol(self), host, port, reuse_address=True)
+        watcher = asyncio.ensure_future(self.watch())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+class ApiProtocol(asyncio.Protocol):
+    """Connexion cliente : requêtes successives (keep-alive et pipelining), sans corps"""
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.buffer = b''
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.buffer += data
+        while self.transport is not None and not self.transport.is_closing():
+            end = self.buffer.find(b'\r\n\r\n')
+            if end < 0:
+                if len(self.buffer) > MAX_HEADER_BYTES:
+                    self.close_with(*self.server.error(431, "En-têtes trop longs"))
+                return
+            head, self.buffer = self.buffer[:end].decode('latin-1'), self.buffer[end + 4:]
+            request_line, *header_lines = head.split('\r\n')
+            parts = request_line.split(' ')
+            if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+                self.close_with(*self.server.error(400, "Requête invalide"))
+                return
+            method, target, protocol = parts
+            headers = {}
+            for line in header_lines:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if headers.get('content-length', '0') != '0' or 'transfer-encoding' in headers:
+                self.close_with(*self.server.error(413, "Corps de requête non accepté"))
+                return
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if protocol == 'HTTP/1.1' else connection == 'keep-alive'
+            status, extra, body = self.server.respond(method, target, headers)
+            self.transport.write(self.server.response_bytes(status, extra, body, method == 'HEAD', keep_alive))
+            if not keep_alive:
+                self.transport.close()
+
+    def close_with(self, status, extra, body):
+        self.transport.write(self.server.response_bytes(status, extra, body, keep_alive=False))
+        self.transport.close()
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API locale en lecture seule des données du dashboard")
+    parser.add_argument('--host', default=API_HOST, help="adresse d'écoute")
+    parser.add_argument('--port', type=int, default=API_PORT, help="port d'écoute")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="répertoire des fichiers sources")
+    parser.add_argument('--hash-contents', action='store_true', default=HASH_CONTENTS,
+                        help="détecter les modifications par hachage du contenu des fichiers plutôt que mtime et taille")
+    parser.add_argument('--poll', type=float, default=POLL_SECONDS,
+                        help="intervalle de vérification des fichiers sources (secondes)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    server = ApiServer([FileSource(args.data_dir, hash_contents=args.hash_contents), BuiltinSource(BUILTIN_DATASETS)],
+                       args.poll)
+    print(f"API sur http://{args.host}:{args.port}/")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+"""Jeux de données intégrés au code, utilisés en l'absence de fichiers sources"""
+import numpy as np
+import pandas as pd
+
+# Version des jeux de données : à incrémenter pour invalider les caches (dashboard, ETag de l'API)
+DATA_VERSION = "2023.1"
+
+
+def initialize_historical_data():
+    """Initialise les données historiques de la consommation d'alcool"""
+    years = list(range(2000, 2024))
+
+    # Données simulées basées sur les tendances historiques réelles
+    alcohol_consumption = [
+        13.5, 13.2, 12.9, 12.6, 12.3, 12.0, 11.8, 11.5, 11.3, 11.1,  # 2000-2009 (litres/personne/an)
+        10.9, 10.7, 10.5, 10.3, 10.1, 9.9, 9.7, 9.5, 9.3, 9.1,  # 2010-2019
+        8.9, 8.7, 8.5, 8.3  # 2020-2023
+    ]
+
+    daily_drinkers = [
+        15.2, 14.8, 14.4, 14.0, 13.6, 13.2, 12.8, 12.4, 12.0, 11.6,  # 2000-2009 (% population)
+        11.2, 10.8, 10.4, 10.0, 9.6, 9.2, 8.8, 8.4, 8.0, 7.6,  # 2010-2019
+        7.2, 6.8, 6.4, 6.0  # 2020-2023
+    ]
+
+    binge_drinking = [
+        18.5, 18.8, 19.1, 19.4, 19.7, 20.0, 20.3, 20.6, 20.9, 21.2,  # 2000-2009 (% population)
+        21.5, 21.8, 22.1, 22.4, 22.7, 23.0, 23.3, 23.6, 23.9, 24.2,  # 2010-2019
+        24.5, 24.8, 25.1, 25.4  # 2020-2023
+    ]
+
+    wine_consumption = [
+        58.2, 56.8, 55.5, 54.2, 52.9, 51.6, 50.3, 49.0, 47.7, 46.4,  # 2000-2009 (% consommation totale)
+        45.1, 43.8, 42.5, 41.2, 39.9, 38.6, 37.3, 36.0, 34.7, 33.4,  # 2010-2019
+        32.1, 30.8, 29.5, 28.2  # 2020-2023
+    ]
+
+    tax_revenue = [
+        3.2, 3.3, 3.4, 3.5, 3.6, 3.7, 3.8, 3.9, 4.0, 4.1,  # 2000-2009 (milliards €)
+        4.2, 4.3, 4.4, 4.5, 4.6, 4.7, 4.8, 4.9, 5.0, 5.1,  # 2010-2019
+        5.2, 5.3, 5.4, 5.5  # 2020-2023
+    ]
+
+    return pd.DataFrame({
+        'annee': years,
+        'consommation_alcool': alcohol_consumption,
+        'buveurs_quotidiens': daily_drinkers,
+        'binge_drinking': binge_drinking,
+        'part_vin': wine_consumption,
+        'recettes_fiscales': tax_revenue
+    })
+
+
+def initialize_policy_timeline():
+    """Initialise la timeline des politiques sur l'alcool"""
+    return [
+        {'date': '1991-01-01', 'type': 'regulation', 'titre': 'Loi Évin - Alcool', 
+         'description': 'Encadrement de la publicité pour les boissons alcoolisées'},
+        {'date': '2009-07-21', 'type': 'ban', 'titre': 'Loi Bachelot', 
+         'description': 'Interdiction de la vente d\'alcool aux mineurs et limitation de la publicité'},
+        {'date': '2015-01-01', 'type': 'regulation', 'titre': 'Alcootest obligatoire', 
+         'description': 'Obligation de posséder un éthylotest dans tous les véhicules'},
+        {'date': '2016-01-01', 'type': 'tax', 'titre': 'Augmentation des taxes', 
+         'description': 'Hausse des taxes sur les boissons alcoolisées'},
+        {'date': '2018-03-01', 'type': 'prevention', 'titre': 'Campagne "Avec modération"', 
+         'description': 'Lancement des campagnes nationales de prévention'},
+        {'date': '2019-07-22', 'type': 'regulation', 'titre': 'Loi Santé', 
+         'description': 'Renforcement de l\'encadrement de la publicité pour l\'alcool'},
+        {'date': '2020-01-01', 'type': 'prevention', 'titre': 'Programme "Alcool Info Service"', 
+         'description': 'Renforcement des services d\'aide et d\'information'},
+        {'date': '2021-11-01', 'type': 'regulation', 'titre': 'Interdiction publicité réseaux sociaux', 
+         'description': 'Interdiction de la publicité pour l\'alcool sur les réseaux sociaux'},
+        {'date': '2023-01-01', 'type': 'tax', 'titre': 'Nouvelle hausse des taxes', 
+         'description': 'Augmentation ciblée sur les boissons les plus consommées'},
+    ]
+
+
+def initialize_regional_data():
+    """Initialise les données régionales de consommation"""
+    regions = [
+        'Île-de-France', 'Auvergne-Rhône-Alpes', 'Nouvelle-Aquitaine', 
+        'Occitanie', 'Hauts-de-France', 'Provence-Alpes-Côte d\'Azur',
+        'Pays de la Loire', 'Bretagne', 'Normandie', 'Grand Est',
+        'Bourgogne-Franche-Comté', 'Centre-Val de Loire', 'Corse'
+    ]
+
+    data = {
+        'region': regions,
+        'consommation_2023': [7.8, 9.2, 8.9, 9.5, 10.1, 8.4, 8.1, 9.8, 8.7, 9.4, 8.6, 8.3, 11.2],
+        'evolution_2010_2023': [-2.1, -1.8, -1.9, -2.2, -1.5, -2.0, -2.3, -1.7, -1.8, -1.6, -2.1, -2.0, -0.9],
+        'buveurs_quotidiens': [4.2, 6.8, 6.1, 7.2, 8.5, 5.3, 4.9, 7.9, 6.4, 7.1, 6.2, 5.8, 9.8],
+        'binge_drinking': [22.1, 25.6, 24.8, 26.3, 28.7, 23.4, 21.9, 27.2, 25.1, 26.8, 24.5, 23.2, 30.5]
+    }
+
+    return pd.DataFrame(data)
+
+
+def initialize_regional_panel():
+    """Initialise le panel annuel région × année (2010-2023)
+
+    Consommation interpolée linéairement entre 2010 et 2023 d'après l'évolution régionale ;
+    buveurs quotidiens et binge drinking suivant la tendance nationale de chaque année.
+    """
+    regional = initialize_regional_data()
+    national = initialize_historical_data().set_index('annee')
+    years = list(range(2010, 2024))
+
+    rows = []
+    for region in regional.itertuples(index=False):
+        start = region.consommation_2023 - region.evolution_2010_2023
+        for year in years:
+            progress = (year - years[0]) / (years[-1] - years[0])
+            rows.append({
+                'region': region.region,
+                'annee': year,
+                'consommation_alcool': round(start + progress * region.evolution_2010_2023, 2),
+                'buveurs_quotidiens': round(region.buveurs_quotidiens * national.loc[year, 'buveurs_quotidiens']
+                                            / national.loc[years[-1], 'buveurs_quotidiens'], 2),
+                'binge_drinking': round(region.binge_drinking * national.loc[year, 'binge_drinking']
+                                        / national.loc[years[-1], 'binge_drinking'], 2),
+            })
+
+    return pd.DataFrame(rows)
+
+
+def initialize_international_comparison():
+    """Initialise les données comparatives internationales"""
+    countries = ['France', 'Allemagne', 'Royaume-Uni', 'Espagne', 'Italie', 'États-Unis', 'Russie', 'Japon']
+
+    data = {
+        'pays': countries,
+        'consommation_alcool': [8.3, 10.6, 9.8, 7.5, 6.9, 8.9, 11.7, 7.2],
+        'prix_biere_eur': [2.5, 1.8, 3.2, 1.2, 1.5, 2.8, 1.1, 3.5],
+        'mortalite_liee_alcool': [41, 79, 52, 28, 35, 88, 152, 23],  # milliers
+        'depenses_prevention': [0.4, 0.3, 0.8, 0.2, 0.3, 1.2, 0.1, 0.5],  # € par habitant
+        'age_legal_consommation': [18, 16, 18, 18, 18, 21, 18, 20]
+    }
+
+    return pd.DataFrame(data)
+
+
+def initialize_health_impact_data():
+    """Initialise les données d'impact sur la santé"""
+    years = list(range(2010, 2024))
+
+    data = {
+        'annee': years,
+        'deces_alcool': [49, 48, 47, 46, 45, 44, 43, 42, 41, 40, 39, 38, 37, 36],  # milliers
+        'cancers_digesifs': [15, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26, 27, 28],  # milliers
+        'maladies_foie': [12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2, 1, 0.9, 0.8],  # milliers
+        'couts_sante': [18.5, 18.8, 19.1, 19.4, 19.7, 20.0, 20.3, 20.6, 20.9, 21.2, 21.5, 21.8, 22.1, 22.4],  # milliards €
+        'accidents_routiers': [3.2, 3.0, 2.8, 2.6, 2.4, 2.2, 2.0, 1.8, 1.6, 1.4, 1.2, 1.0, 0.8, 0.6]  # milliers
+    }
+
+    return pd.DataFrame(data)
+
+
+def initialize_survey_microdata(respondents=20_000, chunksize=5_000, seed=2023):
+    """Échantillon simulé de répondants (enquête 2023), produit par blocs de chunksize lignes
+
+    Consommation moyenne par CSP et par tranche d'âge, probabilités de consommation
+    quotidienne et de binge drinking selon l'âge, poids de sondage log-normaux.
+    """
+    csp = {
+        'Agriculteurs': 12.5, 'Ouvriers': 10.8, 'Artisans': 9.9, 'Employés': 9.0,
+        'Professions intermédiaires': 8.1, 'Retraités': 8.5, 'Cadres': 7.2,
+    }
+    ages = {
+        '15-24 ans': (6.8, 0.01, 0.35), '25-34 ans': (9.2, 0.03, 0.31), '35-44 ans': (8.9, 0.05, 0.25),
+        '45-54 ans': (9.5, 0.08, 0.19), '55-64 ans': (10.1, 0.11, 0.13), '65+ ans': (8.7, 0.14, 0.07),
+    }
+    regions = initialize_regional_data()['region'].to_numpy()
+    csp_names, csp_means = np.array(list(csp)), np.array(list(csp.values()))
+    age_names = np.array(list(ages))
+    age_means, daily, binge = (np.array(values) for values in zip(*ages.values()))
+    # Effets additifs de la CSP et de l'âge autour de la moyenne des tranches d'âge
+    csp_effects = csp_means - csp_means.mean()
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, respondents, chunksize):
+        size = min(chunksize, respondents - start)
+        group = rng.integers(len(csp), size=size)
+        age = rng.integers(len(ages), size=size)
+        sex = rng.integers(2, size=size)
+        consumption = age_means[age] + csp_effects[group] + np.where(sex == 0, 1.5, -1.5)
+        first_drunk = rng.normal(15.2, 1.8, size)
+        yield pd.DataFrame({
+            'annee': np.full(size, 2023),
+            'region': regions[rng.integers(len(regions), size=size)],
+            'sexe': np.where(sex == 0, 'Homme', 'Femme'),
+            'tranche_age': age_names[age],
+            'csp': csp_names[group],
+            'poids': rng.lognormal(0.0, 0.3, size),
+            'consommation_alcool': np.clip(consumption + rng.normal(0, 3, size), 0, None).round(1),
+            'buveur_quotidien': (rng.random(size) < daily[age]).astype(np.int8),
+            'binge_drinking': (rng.random(size) < binge[age]).astype(np.int8),
+            # Un répondant sur quatre n'a jamais connu d'ivresse
+            'age_premiere_ivresse': np.where(rng.random(size) < 0.25, np.nan, first_drunk.round(1)),
+        })
+
+
+# Constructeurs par nom de jeu de données (source de plus faible priorité)
+BUILTIN_DATASETS = {
+    'historical_data': initialize_historical_data,
+    'policy_timeline': initialize_policy_timeline,
+    'regional_data': initialize_regional_data,
+    'regional_panel': initialize_regional_panel,
+    'international_comparison': initialize_international_comparison,
+    'health_impact_data': initialize_health_impact_data,
+    'survey_microdata': initialize_survey_microdata,
+}
@@ -0,0 +1,146 @@
+"""Panel entité × année × indicateur stocké dans un tableau NumPy à trois dimensions
+
+Les entités (régions...) sont encodées en codes entiers et les années en positions
+contiguës : une coupe annuelle ou une variation sur un an est une simple
+vue du tableau. Les variations annuelles et les ordres de tri de chaque (année,
+indicateur) sont calculés une fois à la construction.
+"""
+import numpy as np
+import pandas as pd
+
+
+class PanelCube:
+    """Valeurs indexées par [entité, année, indicateur], années manquantes à NaN"""
+
+    def __init__(self, df, entity, indicators, time='annee', dtype=np.float32):
+        self.entity = entity
+        self.time = time
+        self.indicators = list(indicators)
+
+        categorical = pd.Categorical(df[entity])
+        self.entities = categorical.categories
+        years = df[time].to_numpy(np.int64)
+        first, last = (int(years.min()), int(years.max())) if len(years) else (0, -1)
+        self.years = np.arange(first, last + 1)
+
+        shape = (len(self.entities), len(self.years), len(self.indicators))
+        values = np.full(shape, np.nan, dtype=dtype)
+        rows, columns = categorical.codes, years - first
+        for position, indicator in enumerate(self.indicators):
+            values[rows, columns, position] = df[indicator].to_numpy(dtype)
+
+        deltas = np.full(shape, np.nan, dtype=dtype)
+        deltas[:, 1:] = values[:, 1:] - values[:, :-1]
+
+        # Ordre croissant des entités pour chaque (année, indicateur), valeurs manquantes en tête
+        self._orders = np.argsort(np.nan_to_num(values, nan=-np.inf), axis=0, kind='stable')
+
+        for array in (values, deltas, self._orders):
+            array.setflags(write=False)
+        self.values = values
+        self.deltas = deltas
+        self._indicator_positions = {name: position for position, name in enumerate(self.indicators)}
+
+    @property
+    def latest_year(self):
+        return int(self.years[-1])
+
+    def year_position(self, year):
+        """Position d'une année dans le cube ; KeyError hors de la période couverte"""
+        position = int(year) - int(self.years[0])
+        if not 0 <= position < len(self.years):
+            raise KeyError(f"Année {year} hors du panel ({self.years[0]}-{self.years[-1]})")
+        return position
+
+    def cross_section(self, year, indicator, deltas=False):
+        """Valeurs (ou variations sur un an) de toutes les entités pour une année (vue sur le cube)"""
+        source = self.deltas if deltas else self.values
+        return source[:, self.year_position(year), self._indicator_positions[indicator]]
+
+    def ranked(self, year, indicator, deltas=False, limit=None):
+        """Entités triées par valeur croissante pour une année ; limit garde les plus élevées"""
+        values = self.cross_section(year, indicator, deltas)
+        if deltas:
+            order = np.argsort(np.nan_to_num(values, nan=-np.inf), kind='stable')
+        else:
+            order = self._orders[:, self.year_position(year), self._indicator_positions[indicator]]
+        order = order[~np.isnan(values[order])]
+        if limit is not None and len(order) > limit:
+            order = order[-limit:]
+        return pd.DataFrame({self.entity: self.entities[order], indicator: values[order]})
+
+    def frame(self, indicators=None):
+        """Tableau long entité × année (toutes les cellules renseignées), pour les graphiques"""
+        indicators = self.indicators if indicators is None else list(indicators)
+        positions = [self._indicator_positions[indicator] for indicator in indicators]
+        n_entities, n_years = len(self.entities), len(self.years)
+        table = pd.DataFrame({
+            self.entity: pd.Categorical.from_codes(np.repeat(np.arange(n_entities), n_years), self.entities),
+            self.time: np.tile(self.years, n_entities).astype(np.int16),
+            **{indicator: self.values[:, :, position].ravel()
+               for indicator, position in zip(indicators, positions)},
+        })
+        return table.dropna(subset=indicators, how='all').reset_index(drop=True)
+
+
+class SumCube:
+    """Sommes additives (effectifs, sommes pondérées) indexées par dimensions
+
+    Le tableau dense couvre toutes les combinaisons de modalités et les agrégats sur
+    chaque sous-ensemble de dimensions sont matérialisés à la construction : une requête
+    (filtres et ventilation quelconques) lit l'agrégat adapté, sélectionne les modalités
+    filtrées et somme les axes restants, sans regroupement sur les données de base.
+    """
+
+    def __init__(self, sums):
+        self.dimensions = list(sums.index.names)
+        self.terms = sums.columns
+        self.labels = {}
+        codes = []
+        for dimension in self.dimensions:
+            values = sums.index.get_level_values(dimension)
+            categorical = pd.Categorical(values, categories=np.sort(values.unique()))
+            self.labels[dimension] = categorical.categories
+            codes.append(categorical.codes)
+
+        shape = [len(self.labels[dimension]) for dimension in self.dimensions] + [len(self.terms)]
+        dense = np.zeros(shape)
+        dense[tuple(codes)] = sums.to_numpy(np.float64)
+
+        # Agrégats par sous-ensemble de dimensions conservées (axes dans l'ordre des dimensions)
+        self._rollups = {}
+        axes = range(len(self.dimensions))
+        for mask in range(1 << len(self.dimensions)):
+            kept = tuple(axis for axis in axes if mask >> axis & 1)
+            summed = tuple(axis for axis in axes if axis not in kept)
+            self._rollups[kept] = dense.sum(axis=summed) if summed else dense
+        for array in self._rollups.values():
+            array.setflags(write=False)
+
+    def query(self, by=(), filters=None):
+        """Sommes ventilées selon by, restreintes aux modalités de filters ({dimension: valeurs})"""
+        by = list(by)
+        filters = {dimension: values for dimension, values in (filters or {}).items() if values is not None}
+        kept = tuple(sorted(self.dimensions.index(dimension) for dimension in set(by) | set(filters)))
+        array = self._rollups[kept]
+
+        labels = dict(self.labels)
+        for position, axis in enumerate(kept):
+            dimension = self.dimensions[axis]
+            if dimension in filters:
+                selected = labels[dimension].get_indexer(list(filters[dimension]))
+                selected = selected[selected >= 0]
+                array = array.take(selected, axis=position)
+                labels[dimension] = labels[dimension][selected]
+        # Dimensions seulement filtrées : sommées ; puis axes remis dans l'ordre de by
+        kept_dimensions = [self.dimensions[axis] for axis in kept]
+        summed = tuple(position for position, dimension in enumerate(kept_dimensions) if dimension not in by)
+        if summed:
+            array = array.sum(axis=summed)
+        remaining = [dimension for dimension in kept_dimensions if dimension in by]
+        array = np.moveaxis(array, [remaining.index(dimension) for dimension in by], range(len(by)))
+
+        if not by:
+            return pd.DataFrame(array.reshape(1, -1), columns=self.terms)
+        index = pd.MultiIndex.from_product([labels[dimension] for dimension in by], names=by)
+        return pd.DataFrame(array.reshape(-1, len(self.terms)), index=index, columns=self.terms)
@@ -0,0 +1,315 @@
+"""Sources de données du dashboard : fichiers CSV/Parquet et cache colonnaire sur disque
+
+Chaque jeu de données est recherché dans un répertoire sous le nom ``<jeu>.parquet`` ou
+``<jeu>.csv``. À la première lecture, il est converti en fichier Arrow IPC dans un
+sous-répertoire de cache ; les lectures suivantes ouvrent ce fichier en mémoire mappée.
+Le nom du fichier de cache contient l'empreinte de la source (mtime et taille, ou
+hachage du contenu) : toute modification de la source invalide le cache. Le cache est
+écrit dans les types compacts : les colonnes lues en mémoire mappée ne sont pas recopiées.
+"""
+import hashlib
+import importlib.util
+import os
+
+import pandas as pd
+
+# pyarrow est optionnel (lecture directe sans cache colonnaire) et importé au premier fichier lu
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# Répertoire des fichiers CSV/Parquet, prioritaires sur les données intégrées (dashboard et API)
+DATA_DIR = os.environ.get('ALCOOL_DATA_DIR',
+                          os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'))
+
+# Empreinte des fichiers par hachage du contenu plutôt que mtime et taille (ALCOOL_HASH_CONTENTS=1)
+HASH_CONTENTS = os.environ.get('ALCOOL_HASH_CONTENTS', '0') == '1'
+
+# Colonnes attendues pour chaque jeu de données
+DATASET_SCHEMAS = {
+    'historical_data': ['annee', 'consommation_alcool', 'buveurs_quotidiens', 'binge_drinking',
+                        'part_vin', 'recettes_fiscales'],
+    'policy_timeline': ['date', 'type', 'titre', 'description'],
+    'regional_data': ['region', 'consommation_2023', 'evolution_2010_2023', 'buveurs_quotidiens',
+                      'binge_drinking'],
+    'regional_panel': ['region', 'annee', 'consommation_alcool', 'buveurs_quotidiens', 'binge_drinking'],
+    'international_comparison': ['pays', 'consommation_alcool', 'prix_biere_eur', 'mortalite_liee_alcool',
+                                 'depenses_prevention', 'age_legal_consommation'],
+    'health_impact_data': ['annee', 'deces_alcool', 'cancers_digesifs', 'maladies_foie', 'couts_sante',
+                           'accidents_routiers'],
+}
+
+# Jeux facultatifs (fichiers uniquement) : données infra-régionales
+OPTIONAL_SCHEMAS = {
+    'territorial_data': ['region', 'departement', 'consommation_2023', 'evolution_2010_2023',
+                         'buveurs_quotidiens', 'binge_drinking'],
+}
+
+# Colonnes conservées lorsqu'elles sont présentes
+EXTRA_COLUMNS = {
+    'territorial_data': ['commune', 'population', 'lat', 'lon'],
+    'survey_microdata': ['age_premiere_ivresse'],
+}
+
+# Jeux lus par blocs, jamais chargés en entier : micro-données d'enquête (une ligne par répondant)
+STREAMED_SCHEMAS = {
+    'survey_microdata': ['annee', 'region', 'sexe', 'tranche_age', 'csp', 'poids', 'consommation_alcool',
+                         'buveur_quotidien', 'binge_drinking'],
+}
+
+ALL_SCHEMAS = {**DATASET_SCHEMAS, **OPTIONAL_SCHEMAS, **STREAMED_SCHEMAS}
+
+# Types compacts des colonnes ; les autres colonnes numériques (taux, volumes) sont en float32
+COLUMN_DTYPES = {
+    'annee': 'int16',
+    'age_legal_consommation': 'int8',
+    'population': 'int32',
+    'region': 'category',
+    'departement': 'category',
+    'commune': 'category',
+    'pays': 'category',
+    'type': 'category',
+}
+
+SOURCE_EXTENSIONS = ('.parquet', '.csv')
+
+
+class DataSchemaError(ValueError):
+    """Fichier de données ne respectant pas le schéma attendu"""
+
+
+def schema_columns(name, available):
+    """Colonnes à conserver dans l'ordre du schéma ; lève DataSchemaError s'il en manque"""
+    expected = ALL_SCHEMAS[name]
+    missing = [column for column in expected if column not in available]
+    if missing:
+        raise DataSchemaError(f"{name} : colonnes manquantes {missing}")
+    return expected + [column for column in EXTRA_COLUMNS.get(name, []) if column in available]
+
+
+def check_schema(name, df):
+    """Vérifie la présence des colonnes attendues et les remet dans l'ordre du schéma"""
+    return df[schema_columns(name, df.columns)]
+
+
+def compact_dtypes(df):
+    """Convertit les colonnes vers les types compacts du schéma (entiers courts, float32, catégories)
+
+    Une colonne entière contenant des valeurs manquantes reste en float32. Les colonnes déjà
+    dans leur type compact (cache Arrow en mémoire mappée) sont reprises sans copie.
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        dtype = COLUMN_DTYPES.get(name)
+        if dtype == 'category' or (dtype is None and not pd.api.types.is_numeric_dtype(column)):
+            # Les textes libres (titres, descriptions) ne sont pas catégorisés
+            if dtype == 'category' and not isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype('category')
+        elif dtype is not None and column.dtype == dtype:
+            pass
+        elif dtype is not None and not column.isna().any():
+            column = column.astype(dtype)
+        elif column.dtype != 'float32':
+            column = column.astype('float32')
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def compact_arrow(table):
+    """Types compacts de compact_dtypes appliqués à une table Arrow (écriture du cache)
+
+    Les valeurs manquantes des colonnes float32 deviennent des NaN : sans masque de
+    validité, la conversion en DataFrame reprend les tampons sans copie.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for position, name in enumerate(table.column_names):
+        column = table.column(position)
+        dtype = COLUMN_DTYPES.get(name)
+        numeric = (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                   or pa.types.is_boolean(column.type) or pa.types.is_decimal(column.type))
+        if dtype == 'category':
+            if not pa.types.is_dictionary(column.type):
+                column = pc.dictionary_encode(column)
+        elif dtype is None and not numeric:
+            continue
+        elif dtype is not None and column.null_count == 0:
+            column = column.cast(pa.from_numpy_dtype(np.dtype(dtype)))
+        else:
+            column = pc.fill_null(column.cast(pa.float32()), float('nan'))
+        table = table.set_column(position, name, column)
+    return table
+
+
+def memory_report(tables):
+    """Occupation mémoire de chaque table, comparée aux types par défaut (int64, float64, objets)"""
+    rows = []
+    for name, df in tables.items():
+        default = 0
+        for column in df.columns:
+            values = df[column]
+            # Textes (objet, str de pandas 3) et catégories : taille des chaînes Python équivalentes
+            if not pd.api.types.is_numeric_dtype(values.dtype):
+                default += values.astype(object).memory_usage(deep=True, index=False)
+            else:
+                default += 8 * len(values)
+        used = int(df.memory_usage(deep=True, index=False).sum())
+        rows.append({'table': name, 'lignes': len(df), 'colonnes': len(df.columns),
+                     'octets': used, 'octets_types_par_defaut': int(default)})
+    report = pd.DataFrame(rows)
+    report['gain'] = 1 - report['octets'] / report['octets_types_par_defaut'].where(
+        report['octets_types_par_defaut'] > 0)
+    return report
+
+
+class BuiltinSource:
+    """Données intégrées au code, produites par des fonctions sans argument"""
+
+    def __init__(self, builders):
+        self.builders = dict(builders)
+
+    def fingerprint(self, name):
+        return 'builtin' if name in self.builders else None
+
+    def load(self, name):
+        if name not in self.builders:
+            return None
+        data = self.builders[name]()
+        return data if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+
+    def load_chunks(self, name, chunksize):
+        """Blocs de lignes d'un jeu (constructeur retournant un DataFrame ou un itérateur de blocs)"""
+        if name not in self.builders:
+            return None
+        data = self.builders[name]()
+        if isinstance(data, pd.DataFrame):
+            return (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+        return iter(data)
+
+
+class FileSource:
+    """Jeux de données lus depuis un répertoire de fichiers CSV ou Parquet"""
+
+    def __init__(self, directory, cache_dir=None, hash_contents=False):
+        self.directory = directory
+        self.cache_dir = cache_dir or os.path.join(directory, '.cache')
+        self.hash_contents = hash_contents
+
+    def find(self, name):
+        """Chemin du fichier source d'un jeu de données (Parquet prioritaire), ou None"""
+        for extension in SOURCE_EXTENSIONS:
+            path = os.path.join(self.directory, name + extension)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def fingerprint(self, name):
+        """Empreinte de la source : mtime et taille, ou hachage SHA-256 du contenu"""
+        path = self.find(name)
+        if path is None:
+            return None
+        if self.hash_contents:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as handle:
+                for chunk in iter(lambda: handle.read(1 << 20), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()[:16]
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def load(self, name):
+        path = self.find(name)
+        if path is None:
+            return None
+        if not HAS_PYARROW:
+            return check_schema(name, self.read_source(path))
+
+        import pyarrow.feather as feather
+        cache_path = os.path.join(self.cache_dir, f"{name}-{self.fingerprint(name)}.arrow")
+        if not os.path.exists(cache_path):
+            self.write_cache(name, path, cache_path)
+        table = feather.read_table(cache_path, memory_map=True)
+        return table.to_pandas(split_blocks=True)
+
+    def load_chunks(self, name, chunksize):
+        """Blocs de chunksize lignes lus au fur et à mesure (fichier jamais chargé en entier)"""
+        path = self.find(name)
+        if path is None:
+            return None
+        return self.read_chunks(name, path, chunksize)
+
+    @staticmethod
+    def read_chunks(name, path, chunksize):
+        if path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            parquet = pq.ParquetFile(path)
+            columns = schema_columns(name, parquet.schema_arrow.names)
+            for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+            return
+        columns = schema_columns(name, pd.read_csv(path, nrows=0).columns)
+        with pd.read_csv(path, usecols=columns, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk[columns]
+
+    @staticmethod
+    def read_source(path):
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+    def write_cache(self, name, path, cache_path):
+        """Convertit la source en fichier Arrow IPC non compressé (lisible en mémoire mappée)"""
+        import pyarrow.csv as pa_csv
+        import pyarrow.feather as feather
+        import pyarrow.parquet as pq
+
+        if path.endswith('.parquet'):
+            table = pq.read_table(path)
+        else:
+            table = pa_csv.read_csv(path)
+        table = compact_arrow(table.select(schema_columns(name, table.column_names)))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Écriture atomique puis suppression des caches périmés du même jeu
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+        for entry in os.listdir(self.cache_dir):
+            stale = os.path.join(self.cache_dir, entry)
+            if entry.startswith(name + '-') and entry.endswith('.arrow') and stale != cache_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+def sources_fingerprint(sources, names=ALL_SCHEMAS):
+    """Empreinte combinée des sources ; change dès qu'un fichier est modifié"""
+    parts = []
+    for name in names:
+        for source in sources:
+            fingerprint = source.fingerprint(name)
+            if fingerprint is not None:
+                parts.append(f"{name}:{fingerprint}")
+                break
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+
+def load_datasets(sources, names=DATASET_SCHEMAS, required=True):
+    """Charge chaque jeu depuis la première source qui le fournit (ordre de priorité)
+
+    Avec required=False, les jeux qu'aucune source ne fournit sont simplement absents du résultat.
+    """
+    datasets = {}
+    for name in names:
+        for source in sources:
+            df = source.load(name)
+            if df is not None:
+                datasets[name] = compact_dtypes(df)
+                break
+        else:
+            if required:
+                raise KeyError(f"Aucune source ne fournit le jeu de données '{name}'")
+    return datasets
@@ -0,0 +1,185 @@
+"""Export de l'analyse : rapport HTML autonome et lot de données (Excel, Parquet, CSV)
+
+Les figures et les tables sont construites, puis le rendu HTML de chaque figure réparti
+sur un pool de processus, hors du thread de rendu Streamlit par ``start_export`` ; l'export
+est suivi au moyen d'un objet ``ExportJob`` (progression, statut, chemin de l'archive produite).
+Seules les archives les plus récentes sont conservées dans le répertoire d'export.
+"""
+import html
+import importlib.util
+import io
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+# Archives conservées dans le répertoire d'export : les plus récentes, d'au plus une journée
+EXPORT_KEEP = 20
+EXPORT_MAX_AGE_SECONDS = 24 * 3600
+
+ARCHIVE_PREFIX = 'analyse_alcool_'
+
+
+def has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+def render_figure_html(figure_json):
+    """Fragment HTML d'une figure (exécuté dans un processus du pool)"""
+    figure = pio.from_json(figure_json)
+    return pio.to_html(figure, include_plotlyjs=False, full_html=False)
+
+
+def render_figure_png(figure_json):
+    """Image PNG d'une figure (nécessite kaleido)"""
+    return pio.to_image(pio.from_json(figure_json), format='png', width=1200, height=700)
+
+
+class ExportJob:
+    """État partagé d'un export en cours : progression et résultat"""
+
+    def __init__(self, total_steps):
+        self.total_steps = total_steps
+        self.done_steps = 0
+        self.status = "En attente"
+        self.path = None
+        self.error = None
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def advance(self, status, steps=1):
+        with self._lock:
+            self.done_steps = min(self.done_steps + steps, self.total_steps)
+            self.status = status
+
+    def finish(self, path=None, error=None):
+        with self._lock:
+            self.path = path
+            self.error = error
+            self.done_steps = self.total_steps
+            self.status = "Terminé" if error is None else f"Échec : {error}"
+            self.finished = True
+
+    @property
+    def progress(self):
+        return self.done_steps / self.total_steps if self.total_steps else 1.0
+
+
+def build_report_html(title, sections):
+    """Assemble le rapport : sections = liste de (nom de section, [(titre, fragment HTML)])"""
+    parts = [
+        '<!DOCTYPE html><html lang="fr"><head><meta charset="utf-8">',
+        f'<title>{html.escape(title)}</title>',
+        # plotly.js inclus une seule fois : le rapport s'ouvre sans réseau
+        f'<script type="text/javascript">{get_plotlyjs()}</script>',
+        '<style>body{font-family:sans-serif;margin:2rem;} h2{color:#8B4513;border-bottom:3px solid #D2691E;}'
+        ' table{border-collapse:collapse;font-size:0.85rem;} td,th{border:1px solid #ccc;padding:0.2rem 0.5rem;}</style>',
+        f'</head><body><h1>{html.escape(title)}</h1>',
+        f'<p>Généré le {datetime.now():%d/%m/%Y à %H:%M}</p>',
+    ]
+    for section, items in sections:
+        parts.append(f'<h2>{html.escape(section)}</h2>')
+        for item_title, fragment in items:
+            parts.append(f'<h3>{html.escape(item_title)}</h3>{fragment}')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def write_data_bundle(archive, tables):
+    """Ajoute les tables à l'archive : classeur Excel, Parquet et CSV selon les modules présents"""
+    if has_module('openpyxl'):
+        buffer = io.BytesIO()
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            for name, table in tables.items():
+                table.to_excel(writer, sheet_name=name[:31], index=False)
+        archive.writestr('donnees/analyse_alcool.xlsx', buffer.getvalue())
+    for name, table in tables.items():
+        if has_module('pyarrow'):
+            buffer = io.BytesIO()
+            table.to_parquet(buffer, index=False)
+            archive.writestr(f'donnees/{name}.parquet', buffer.getvalue())
+        archive.writestr(f'donnees/{name}.csv', table.to_csv(index=False))
+
+
+def prune_exports(output_dir, keep=EXPORT_KEEP, max_age=EXPORT_MAX_AGE_SECONDS):
+    """Supprime les archives au-delà des keep plus récentes ou plus anciennes que max_age secondes"""
+    archives = []
+    for entry in os.scandir(output_dir):
+        if entry.name.startswith(ARCHIVE_PREFIX) and entry.name.endswith('.zip') and entry.is_file():
+            archives.append((entry.stat().st_mtime, entry.path))
+    archives.sort(reverse=True)
+    oldest = time.time() - max_age
+    for position, (mtime, path) in enumerate(archives):
+        if position >= keep or mtime < oldest:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def run_export(job, figures, tables, output_dir, max_workers=None):
+    """Produit l'archive d'export
+
+    figures = liste de (section, identifiant, constructeur de la figure Plotly) et tables
+    une fonction retournant les tables jointes : les deux sont appelés ici, dans le job.
+    """
+    try:
+        built = []
+        for section, chart_id, build in figures:
+            figure = build()
+            title = figure.layout.title.text or chart_id
+            built.append((section, title, figure.to_json()))
+            job.advance(f"Graphique construit : {title}")
+        figures = built
+        tables = tables()
+        job.advance("Tables préparées")
+        fragments = []
+        # Processus lancés par spawn : un fork du serveur Streamlit (multithread) peut se bloquer
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            for (section, title, _), fragment in zip(figures, pool.map(render_figure_html,
+                                                                       [figure for _, _, figure in figures])):
+                fragments.append((section, title, fragment))
+                job.advance(f"Graphique rendu : {title}")
+
+            images = []
+            if has_module('kaleido'):
+                for (section, title, _), image in zip(figures, pool.map(render_figure_png,
+                                                                        [figure for _, _, figure in figures])):
+                    images.append((title, image))
+
+        sections = {}
+        for section, title, fragment in fragments:
+            sections.setdefault(section, []).append((title, fragment))
+        tables_section = [(name, table.to_html(index=False, float_format=lambda value: f"{value:.2f}"))
+                          for name, table in tables.items()]
+        report = build_report_html("Dashboard Alcool France - Analyse Stratégique",
+                                   list(sections.items()) + [("Données", tables_section)])
+        job.advance("Rapport HTML assemblé")
+
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{ARCHIVE_PREFIX}{datetime.now():%Y%m%d_%H%M%S}.zip")
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('rapport.html', report)
+            for index, (title, image) in enumerate(images, start=1):
+                archive.writestr(f'figures/{index:02d}.png', image)
+            write_data_bundle(archive, tables)
+        job.advance("Lot de données écrit")
+        prune_exports(output_dir)
+        job.finish(path=path)
+    except Exception as error:  # l'échec est reporté à l'utilisateur via le job
+        job.finish(error=str(error))
+    return job
+
+
+def start_export(executor, figures, tables, output_dir, max_workers=None):
+    """Lance l'export sur l'exécuteur fourni et retourne immédiatement le job"""
+    job = ExportJob(total_steps=2 * len(figures) + 3)
+    executor.submit(run_export, job, figures, tables, output_dir, max_workers)
+    return job
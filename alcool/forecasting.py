@@ -0,0 +1,132 @@
+"""Projection de la consommation : lissage exponentiel à tendance amortie et scénarios
+
+La série annuelle est ajustée par un modèle de Holt à tendance amortie (ETS(A,Ad,N)) ;
+les paramètres (alpha, beta, phi) sont choisis par recherche exhaustive, toutes les
+combinaisons étant filtrées simultanément en NumPy. Les intervalles de prévision
+suivent la variance analytique du modèle.
+
+Les scénarios (hausse des taxes, prix minimum unitaire, dépenses de prévention)
+appliquent à la projection de référence des effets relatifs tirés d'hypothèses
+d'élasticité, montés progressivement à partir de la première année projetée. La
+grille complète des combinaisons est calculée d'un bloc et consultée par indexation.
+"""
+import numpy as np
+import pandas as pd
+
+ALPHAS = np.linspace(0.05, 0.95, 19)
+BETAS = np.linspace(0.05, 0.95, 19)
+PHIS = np.array([0.8, 0.9, 0.95, 0.98, 1.0])
+
+# Quantiles normaux des intervalles de prévision
+Z_80 = 1.2816
+Z_95 = 1.9600
+
+# Hypothèses d'effet des mesures (variation relative de la consommation)
+PRICE_ELASTICITY = -0.5          # élasticité-prix de la demande d'alcool
+TAX_SHARE_OF_PRICE = 0.3         # part des droits et taxes dans le prix de vente
+MUP_EFFECT_PER_EURO = -0.06      # effet d'un prix minimum, par euro et unité d'alcool
+PREVENTION_EFFECT = -0.04        # effet de la prévention par doublement des dépenses
+PREVENTION_BASELINE = 0.4        # dépenses actuelles de prévention (€/habitant)
+PHASE_IN_YEARS = 3               # montée en charge des effets
+
+# Axes de la grille de scénarios (valeurs proposées par les curseurs)
+SCENARIO_AXES = {
+    'hausse_taxes': np.arange(0, 55, 5),                     # % de hausse des taxes
+    'prix_minimum': np.round(np.arange(0, 1.05, 0.1), 2),     # €/unité d'alcool
+    'prevention': np.arange(0, 2.25, 0.25),                   # €/habitant supplémentaires
+}
+
+
+def fit_damped_trend(values, alphas=ALPHAS, betas=BETAS, phis=PHIS):
+    """Ajuste le modèle de Holt amorti ; retourne les paramètres, l'état final et sigma"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 3:
+        raise ValueError("Au moins 3 observations sont nécessaires pour la projection")
+    alpha, beta, phi = (grid.ravel() for grid in np.meshgrid(alphas, betas, phis, indexing='ij'))
+
+    level = np.full(alpha.shape, values[0])
+    trend = np.full(alpha.shape, values[1] - values[0])
+    sse = np.zeros(alpha.shape)
+    for value in values[1:]:
+        forecast = level + phi * trend
+        error = value - forecast
+        sse += error ** 2
+        level = forecast + alpha * error
+        trend = phi * trend + alpha * beta * error
+
+    best = int(np.argmin(sse))
+    sigma = np.sqrt(sse[best] / max(len(values) - 4, 1))
+    return {
+        'alpha': float(alpha[best]),
+        'beta': float(beta[best]),
+        'phi': float(phi[best]),
+        'level': float(level[best]),
+        'trend': float(trend[best]),
+        'sigma': float(sigma),
+    }
+
+
+def forecast_damped_trend(model, horizon):
+    """Prévision et intervalles 80 %/95 % sur horizon pas"""
+    steps = np.arange(1, horizon + 1)
+    phi = model['phi']
+    # Somme des phi^i pour i = 1..h
+    if phi == 1.0:
+        damped = steps.astype(np.float64)
+    else:
+        damped = phi * (1 - phi ** steps) / (1 - phi)
+    mean = model['level'] + damped * model['trend']
+
+    # Variance : sigma² (1 + Σ_{j<h} c_j²), avec c_j = alpha (1 + beta Σ_{i≤j} phi^i)
+    coefficients = model['alpha'] * (1 + model['beta'] * damped[:-1])
+    variance = model['sigma'] ** 2 * (1 + np.r_[0.0, np.cumsum(coefficients ** 2)])
+    spread = np.sqrt(variance)
+    return mean, spread
+
+
+def forecast_table(years, values, end_year):
+    """Projection de la série jusqu'à end_year : DataFrame et paramètres du modèle"""
+    years = np.asarray(years)
+    order = np.argsort(years, kind='stable')
+    model = fit_damped_trend(np.asarray(values, dtype=np.float64)[order])
+    last_year = int(years[order][-1])
+    horizon = max(int(end_year) - last_year, 1)
+    mean, spread = forecast_damped_trend(model, horizon)
+    table = pd.DataFrame({
+        'annee': np.arange(last_year + 1, last_year + horizon + 1),
+        'prevision': mean,
+        'bas_80': mean - Z_80 * spread,
+        'haut_80': mean + Z_80 * spread,
+        'bas_95': mean - Z_95 * spread,
+        'haut_95': mean + Z_95 * spread,
+    })
+    return table, model
+
+
+def scenario_effect(hausse_taxes, prix_minimum, prevention):
+    """Variation relative de la consommation à plein effet (fonctionne sur des tableaux)"""
+    tax_effect = PRICE_ELASTICITY * TAX_SHARE_OF_PRICE * np.asarray(hausse_taxes) / 100
+    mup_effect = MUP_EFFECT_PER_EURO * np.asarray(prix_minimum)
+    prevention_effect = PREVENTION_EFFECT * np.log2(1 + np.asarray(prevention) / PREVENTION_BASELINE)
+    return tax_effect + mup_effect + prevention_effect
+
+
+class ScenarioGrid:
+    """Projections précalculées pour toutes les combinaisons de SCENARIO_AXES"""
+
+    def __init__(self, forecast, axes=SCENARIO_AXES):
+        self.axes = axes
+        self.years = forecast['annee'].to_numpy()
+        baseline = forecast['prevision'].to_numpy()
+
+        taxes, mups, preventions = np.meshgrid(*axes.values(), indexing='ij')
+        effects = scenario_effect(taxes, mups, preventions)
+        phase = np.clip(np.arange(1, len(self.years) + 1) / PHASE_IN_YEARS, 0, 1)
+        # Forme (taxes, prix minimum, prévention, années)
+        self.values = (baseline * (1 + effects[..., None] * phase)).astype(np.float32)
+
+    def lookup(self, hausse_taxes=0, prix_minimum=0.0, prevention=0.0):
+        """Projection d'un scénario (valeurs ramenées au point de grille le plus proche)"""
+        index = tuple(int(np.abs(axis - value).argmin())
+                      for axis, value in zip(self.axes.values(), (hausse_taxes, prix_minimum, prevention)))
+        return self.values[index]
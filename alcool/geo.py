@@ -0,0 +1,229 @@
+"""Contours administratifs simplifiés pour les cartes choroplèthes hors ligne
+
+Les fichiers GeoJSON sources (``regions.geojson``, ``departements.geojson``) sont placés
+dans le répertoire ``geo/``. Ils sont compilés une fois en fichier ``.geo.npz`` : pour
+chaque niveau de précision, les anneaux sont simplifiés (Douglas-Peucker), les
+coordonnées quantifiées en entiers et stockées dans des tableaux à plat avec leurs
+offsets. La compilation n'a jamais lieu au rendu d'une page.
+
+Le dépôt livre des contours régionaux schématiques (``geo/regions.geojson`` et sa version
+compilée), utilisables sans réseau. Les contours IGN se téléchargent explicitement :
+
+Recompilation des sources locales : ``python -m alcool.geo``
+Téléchargement des contours IGN puis compilation : ``python -m alcool.geo --download``
+Compilation d'un fichier : ``python -m alcool.geo geo/regions.geojson``
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+GEO_DIR = os.environ.get('ALCOOL_GEO_DIR',
+                         os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'geo'))
+
+# Fichier source par niveau géographique
+GEO_LAYERS = {'region': 'regions', 'departement': 'departements'}
+
+# Contours simplifiés (IGN, Licence Ouverte), téléchargés seulement sur demande (--download)
+GEO_SOURCES = {
+    'regions': 'https://raw.githubusercontent.com/gregoiredavid/france-geojson/master/regions-version-simplifiee.geojson',
+    'departements': 'https://raw.githubusercontent.com/gregoiredavid/france-geojson/master/departements-version-simplifiee.geojson',
+}
+
+# Propriété GeoJSON portant le nom du territoire (identique aux données)
+NAME_PROPERTY = 'nom'
+
+# Tolérances de simplification (degrés), de la plus grossière à la plus fine
+TOLERANCES = {'basse': 0.02, 'moyenne': 0.005, 'haute': 0.001}
+
+# Pas de quantification des coordonnées (degrés)
+QUANTUM = 1e-5
+
+
+def simplify_ring(points, tolerance):
+    """Simplifie un anneau fermé par Douglas-Peucker ; None si l'anneau dégénère"""
+    if len(points) <= 4:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    # Anneau fermé : découpage au point le plus éloigné du premier pour éviter un segment nul
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    keep[far] = True
+    stack = [(0, far), (far, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        offsets = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(*offsets.T)
+        else:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            middle = start + 1 + index
+            keep[middle] = True
+            stack.append((start, middle))
+            stack.append((middle, end))
+    simplified = points[keep]
+    return simplified if len(simplified) >= 4 else None
+
+
+def read_features(path):
+    """Lit un GeoJSON : (liste de (nom, polygones), description), un polygone étant une liste d'anneaux
+
+    La description facultative (membre ``description`` de la collection) est affichée sous la carte.
+    """
+    with open(path, encoding='utf-8') as handle:
+        collection = json.load(handle)
+    features = []
+    for feature in collection['features']:
+        geometry = feature['geometry']
+        polygons = geometry['coordinates']
+        if geometry['type'] == 'Polygon':
+            polygons = [polygons]
+        elif geometry['type'] != 'MultiPolygon':
+            continue
+        rings = [[np.asarray(ring, dtype=np.float64)[:, :2] for ring in polygon] for polygon in polygons]
+        features.append((str(feature['properties'][NAME_PROPERTY]), rings))
+    return features, collection.get('description', '')
+
+
+def compile_layer(source_path, output_path):
+    """Simplifie et quantifie toutes les géométries d'un GeoJSON dans un fichier .npz"""
+    features, description = read_features(source_path)
+    arrays = {'names': np.array([name for name, _ in features]), 'quantum': np.array(QUANTUM),
+              'description': np.array(description)}
+    for tier, tolerance in TOLERANCES.items():
+        coords, ring_offsets, polygon_offsets, feature_offsets = [], [0], [0], [0]
+        for _, polygons in features:
+            for polygon_index, polygon in enumerate(polygons):
+                rings = []
+                for ring_index, ring in enumerate(polygon):
+                    simplified = simplify_ring(ring, tolerance)
+                    if simplified is None and ring_index == 0 and polygon_index == 0:
+                        # Le contour principal est toujours conservé, même très simplifié
+                        simplified = ring[np.linspace(0, len(ring) - 1, 4).astype(int)]
+                    if simplified is not None:
+                        rings.append(simplified)
+                    elif ring_index == 0:
+                        break  # îlot trop petit pour cette précision
+                for ring in rings:
+                    coords.append(np.round(ring / QUANTUM).astype(np.int32))
+                    ring_offsets.append(ring_offsets[-1] + len(ring))
+                if rings:
+                    polygon_offsets.append(polygon_offsets[-1] + len(rings))
+            feature_offsets.append(len(polygon_offsets) - 1)
+        arrays[f'{tier}_coords'] = np.concatenate(coords) if coords else np.zeros((0, 2), np.int32)
+        arrays[f'{tier}_rings'] = np.array(ring_offsets, dtype=np.int64)
+        arrays[f'{tier}_polygons'] = np.array(polygon_offsets, dtype=np.int64)
+        arrays[f'{tier}_features'] = np.array(feature_offsets, dtype=np.int64)
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp.npz"
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, output_path)
+
+
+class GeoLayer:
+    """Géométries compilées d'un niveau, converties en GeoJSON à la demande"""
+
+    def __init__(self, path):
+        with np.load(path) as archive:
+            self.arrays = {key: archive[key] for key in archive.files}
+        self.names = self.arrays['names'].tolist()
+        self.quantum = float(self.arrays['quantum'])
+        self.description = str(self.arrays['description']) if 'description' in self.arrays else ''
+        self._geojson = {}
+
+    def point_count(self, tier):
+        return len(self.arrays[f'{tier}_coords'])
+
+    def to_geojson(self, tier='moyenne'):
+        """FeatureCollection MultiPolygon de la précision demandée (mise en cache)"""
+        if tier not in self._geojson:
+            coords = (self.arrays[f'{tier}_coords'] * self.quantum).round(5).tolist()
+            rings = self.arrays[f'{tier}_rings']
+            polygons = self.arrays[f'{tier}_polygons']
+            features = self.arrays[f'{tier}_features']
+            collection = []
+            for index, name in enumerate(self.names):
+                multipolygon = []
+                for polygon in range(features[index], features[index + 1]):
+                    multipolygon.append([coords[rings[ring]:rings[ring + 1]]
+                                         for ring in range(polygons[polygon], polygons[polygon + 1])])
+                collection.append({
+                    'type': 'Feature',
+                    'properties': {NAME_PROPERTY: name},
+                    'geometry': {'type': 'MultiPolygon', 'coordinates': multipolygon},
+                })
+            self._geojson[tier] = {'type': 'FeatureCollection', 'features': collection}
+        return self._geojson[tier]
+
+
+def compiled_path(source_path):
+    return os.path.splitext(source_path)[0] + '.geo.npz'
+
+
+def build_layers(geo_dir=GEO_DIR, download=False):
+    """Compile les contours périmés ; avec download, remplace d'abord les sources par celles de GEO_SOURCES
+
+    Retourne les chemins des fichiers compilés ; un niveau sans source est ignoré.
+    """
+    import urllib.request
+
+    os.makedirs(geo_dir, exist_ok=True)
+    compiled = []
+    for stem in GEO_LAYERS.values():
+        source_path = os.path.join(geo_dir, stem + '.geojson')
+        output_path = compiled_path(source_path)
+        if download and stem in GEO_SOURCES:
+            urllib.request.urlretrieve(GEO_SOURCES[stem], source_path)
+        if not os.path.exists(source_path):
+            continue
+        if not os.path.exists(output_path) or os.path.getmtime(output_path) < os.path.getmtime(source_path):
+            compile_layer(source_path, output_path)
+        compiled.append(output_path)
+    return compiled
+
+
+def load_layer(level, geo_dir=GEO_DIR):
+    """Géométries compilées d'un niveau, ou None si l'étape de compilation n'a pas été faite"""
+    if level not in GEO_LAYERS:
+        return None
+    output_path = os.path.join(geo_dir, GEO_LAYERS[level] + '.geo.npz')
+    return GeoLayer(output_path) if os.path.exists(output_path) else None
+
+
+def layer_mtime(level, geo_dir=GEO_DIR):
+    """Date de modification des contours compilés d'un niveau (clé de cache), ou None"""
+    path = os.path.join(geo_dir, GEO_LAYERS.get(level, '') + '.geo.npz')
+    return os.path.getmtime(path) if level in GEO_LAYERS and os.path.exists(path) else None
+
+
+def describe(path):
+    layer = GeoLayer(path)
+    sizes = ', '.join(f"{tier}: {layer.point_count(tier)} points" for tier in TOLERANCES)
+    return f"{path} ({len(layer.names)} territoires, {sizes})"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compilation des contours des cartes hors ligne")
+    parser.add_argument('sources', nargs='*', help="fichiers GeoJSON à compiler (par défaut : ceux de geo/)")
+    parser.add_argument('--download', action='store_true',
+                        help="télécharger les contours IGN simplifiés avant la compilation (accès réseau)")
+    args = parser.parse_args(argv)
+    if args.sources:
+        for source in args.sources:
+            compile_layer(source, compiled_path(source))
+            print(f"{source} -> {describe(compiled_path(source))}")
+    else:
+        for path in build_layers(download=args.download):
+            print(describe(path))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+"""Mesures des chemins critiques du dashboard (durées, tailles), exportables en JSON ou Prometheus
+
+Chaque série est identifiée par un nom de mesure et des étiquettes (section, graphique...)
+et agrège le nombre d'observations, la somme, le maximum, la dernière valeur et la
+répartition des observations dans des seuils fixes (histogramme Prometheus).
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import accumulate
+import json
+import threading
+import time
+
+# Description des mesures (ligne HELP de l'export Prometheus)
+METRIC_HELP = {
+    'rerun_seconds': "Durée d'un rendu complet de la page",
+    'section_seconds': "Durée de rendu d'une section create_*",
+    'chart_render_seconds': "Durée d'un appel st.plotly_chart",
+    'figure_build_seconds': "Durée de construction d'une figure (hors cache)",
+    'figure_json_bytes': "Taille JSON sérialisée d'une figure",
+    'figure_payload_bytes': "Taille JSON d'une figure allégée envoyée au navigateur",
+    'data_load_seconds': "Durée de préparation des données partagées",
+    'loader_seconds': "Durée de chargement d'un jeu de données intégré",
+}
+
+# Seuils des histogrammes selon l'unité de la mesure (suffixe du nom)
+HISTOGRAM_BUCKETS = {
+    'seconds': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    'bytes': (1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000),
+}
+
+
+def histogram_buckets(name):
+    """Seuils de l'histogramme d'une mesure, d'après son unité"""
+    return HISTOGRAM_BUCKETS.get(name.rsplit('_', 1)[-1], HISTOGRAM_BUCKETS['seconds'])
+
+
+class Instrumentation:
+    """Enregistreur de mesures partagé par les sessions (accès protégé par un verrou)"""
+
+    def __init__(self, prefix='alcool'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, name, value, **labels):
+        """Ajoute une observation à la série (name, labels)"""
+        key = (name, tuple(sorted(labels.items())))
+        bounds = histogram_buckets(name)
+        # Premier seuil supérieur ou égal à la valeur (len(bounds) : au-delà du dernier)
+        bucket = bisect_left(bounds, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0, 0, value, value, [0] * (len(bounds) + 1)]
+            series[0] += 1
+            series[1] += value
+            series[2] = max(series[2], value)
+            series[3] = value
+            series[4][bucket] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Mesure la durée du bloc (secondes)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def wrap(self, name, function, **labels):
+        """Retourne function dont chaque appel est chronométré"""
+        def timed(*args, **kwargs):
+            with self.timer(name, **labels):
+                return function(*args, **kwargs)
+        return timed
+
+    def snapshot(self):
+        """Séries enregistrées, triées par durée cumulée décroissante"""
+        with self._lock:
+            items = [(name, dict(labels), series[:4] + [list(series[4])])
+                     for (name, labels), series in self._series.items()]
+        # Histogramme cumulé : nombre d'observations inférieures ou égales à chaque seuil
+        rows = [{'mesure': name, 'etiquettes': labels, 'nombre': count, 'total': total,
+                 'moyenne': total / count, 'max': peak, 'dernier': last,
+                 'histogramme': dict(zip(histogram_buckets(name), accumulate(buckets)))}
+                for name, labels, (count, total, peak, last, buckets) in items]
+        return sorted(rows, key=lambda row: (not row['mesure'].endswith('_seconds'), -row['total']))
+
+    def reset(self):
+        """Efface toutes les séries"""
+        with self._lock:
+            self._series.clear()
+
+    def to_json(self, counters=None):
+        """Export JSON des séries et des compteurs additionnels"""
+        return json.dumps({'series': self.snapshot(), 'compteurs': counters or {}},
+                          ensure_ascii=False, indent=2)
+
+    def to_prometheus(self, counters=None):
+        """Export au format texte Prometheus : un histogramme par mesure, plus un gauge du maximum"""
+        grouped = {}
+        for row in self.snapshot():
+            grouped.setdefault(row['mesure'], []).append(row)
+
+        lines = []
+        for name in sorted(grouped):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} histogram")
+            for row in grouped[name]:
+                buckets = [(f'{bound:.15g}', count) for bound, count in row['histogramme'].items()]
+                for bound, count in buckets + [('+Inf', row['nombre'])]:
+                    lines.append(f"{metric}_bucket{format_labels({**row['etiquettes'], 'le': bound})} {count}")
+                labels = format_labels(row['etiquettes'])
+                lines.append(f"{metric}_count{labels} {row['nombre']}")
+                lines.append(f"{metric}_sum{labels} {row['total']:.6g}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for row in grouped[name]:
+                lines.append(f"{metric}_max{format_labels(row['etiquettes'])} {row['max']:.6g}")
+
+        for name, value in sorted((counters or {}).items()):
+            metric = f"{self.prefix}_{name}"
+            lines.append(f"# TYPE {metric} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+def format_labels(labels):
+    """Étiquettes au format Prometheus ({cle="valeur",...}), chaîne vide sans étiquette"""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + '}'
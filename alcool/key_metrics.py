@@ -0,0 +1,185 @@
+"""Indicateurs clés précalculés par année : dernière valeur, valeur précédente, variations, moyennes mobiles
+
+Calculés une fois par version des données ; la dernière année disponible est déterminée
+pour chaque indicateur (années manquantes ignorées), sans année codée en dur. Lorsque de
+nouvelles années sont ajoutées, append ne recalcule que les indicateurs qu'elles touchent.
+"""
+from bisect import bisect_left, insort
+import copy
+
+import numpy as np
+import pandas as pd
+
+# Nombre d'années de la moyenne mobile et de la tendance
+ROLLING_WINDOW = 3
+
+# Champs classés pour chaque indicateur d'un panel (valeur la plus récente, évolution depuis le début)
+RANKED_FIELDS = ('valeur', 'evolution')
+
+
+class KeyMetrics:
+    """Statistiques de chaque indicateur numérique d'une table annuelle, accessibles par nom"""
+
+    def __init__(self, df, time='annee', window=ROLLING_WINDOW):
+        self.time = time
+        self.window = window
+        self._series = {}
+        self._metrics = {}
+        for name, years, values in indicator_series(df, time):
+            self._series[name] = (years, values)
+            self._metrics[name] = summarize(years, values, window)
+        self._update_latest_year()
+
+    def _update_latest_year(self):
+        latest = [metrics['annee'] for metrics in self._metrics.values()]
+        self.latest_year = max(latest) if latest else None
+
+    def __getitem__(self, indicator):
+        return self._metrics[indicator]
+
+    def __contains__(self, indicator):
+        return indicator in self._metrics
+
+    @property
+    def indicators(self):
+        return list(self._metrics)
+
+    def table(self):
+        """Statistiques de tous les indicateurs, une ligne par indicateur"""
+        return [{'indicateur': name, **metrics} for name, metrics in self._metrics.items()]
+
+    def append(self, rows):
+        """Nouvelle instance prolongée par des années postérieures ; l'instance courante est inchangée
+
+        Seuls les indicateurs renseignés dans rows sont recalculés. ValueError si une année
+        n'est pas postérieure à la dernière année connue de l'indicateur.
+        """
+        updated = copy.copy(self)
+        updated._series = dict(self._series)
+        updated._metrics = dict(self._metrics)
+        for name, years, values in indicator_series(rows, self.time):
+            if name in self._series:
+                known_years, known_values = self._series[name]
+                if years[0] <= known_years[-1]:
+                    raise ValueError(f"{name} : année {years[0]} non postérieure à {known_years[-1]}")
+                years = np.concatenate([known_years, years])
+                values = np.concatenate([known_values, values])
+            updated._series[name] = (years, values)
+            updated._metrics[name] = summarize(years, values, self.window)
+        updated._update_latest_year()
+        return updated
+
+
+class RankedMetrics:
+    """Indicateurs clés de chaque entité (région...) d'un panel annuel, avec classements tenus à jour
+
+    Les classements sont des listes triées de (valeur, entité) : l'ajout d'années pour une
+    entité retire ses anciennes valeurs et insère les nouvelles, sans retrier le reste.
+    """
+
+    def __init__(self, df, entity='region', time='annee', window=ROLLING_WINDOW):
+        self.entity = entity
+        self.time = time
+        self.window = window
+        self._entities = {}
+        self._rankings = {}
+        for name, rows in df.groupby(entity, observed=True, sort=False):
+            self._set(name, KeyMetrics(rows.drop(columns=entity), time, window))
+
+    def __getitem__(self, name):
+        return self._entities[name]
+
+    @property
+    def entities(self):
+        return list(self._entities)
+
+    @property
+    def latest_year(self):
+        years = [metrics.latest_year for metrics in self._entities.values() if metrics.latest_year is not None]
+        return max(years) if years else None
+
+    def _set(self, name, metrics):
+        """Remplace les indicateurs d'une entité et met à jour ses positions dans les classements"""
+        previous = self._entities.get(name)
+        if previous is not None:
+            for key, value in ranked_values(previous):
+                ranking = self._rankings[key]
+                del ranking[bisect_left(ranking, (value, name))]
+        self._entities[name] = metrics
+        for key, value in ranked_values(metrics):
+            insort(self._rankings.setdefault(key, []), (value, name))
+
+    def append(self, rows):
+        """Nouvelle instance avec les années (ou entités) ajoutées ; seules les entités touchées sont recalculées"""
+        updated = copy.copy(self)
+        updated._entities = dict(self._entities)
+        updated._rankings = {key: list(ranking) for key, ranking in self._rankings.items()}
+        for name, group in rows.groupby(self.entity, observed=True, sort=False):
+            group = group.drop(columns=self.entity)
+            current = self._entities.get(name)
+            metrics = KeyMetrics(group, self.time, self.window) if current is None else current.append(group)
+            updated._set(name, metrics)
+        return updated
+
+    def table(self):
+        """Statistiques de chaque entité et de chaque indicateur, une ligne par couple"""
+        return [{self.entity: name, **row} for name, metrics in self._entities.items() for row in metrics.table()]
+
+    def ranking(self, indicator, field='valeur', limit=None):
+        """Entités par valeur croissante du champ ; limit garde les plus élevées"""
+        ranking = self._rankings.get((indicator, field), [])
+        if limit is not None:
+            ranking = ranking[-limit:]
+        return [(name, value) for value, name in ranking]
+
+
+def indicator_series(df, time):
+    """(indicateur, années, valeurs) triées par année pour chaque colonne numérique, valeurs manquantes exclues"""
+    order = np.argsort(df[time].to_numpy(), kind='stable')
+    years = df[time].to_numpy()[order].astype(int)
+    for name in df.columns:
+        if name == time or not pd.api.types.is_numeric_dtype(df[name]):
+            continue
+        values = df[name].to_numpy()
+        # Calculs en float64 à partir de l'écriture décimale des float32 (8.3 et non 8.3000001907)
+        values = (values.astype(str) if values.dtype == np.float32 else values).astype(np.float64)[order]
+        present = ~np.isnan(values)
+        if present.any():
+            yield name, years[present], values[present]
+
+
+def ranked_values(metrics):
+    """((indicateur, champ), valeur) classables d'un ensemble d'indicateurs clés"""
+    for indicator in metrics.indicators:
+        for field in RANKED_FIELDS:
+            value = metrics[indicator][field]
+            if value is not None:
+                yield (indicator, field), value
+
+
+def summarize(years, values, window):
+    """Dernière valeur, précédente, variations et statistiques glissantes d'une série triée par année"""
+    recent = values[-window:]
+    latest = float(values[-1])
+    first = float(values[0])
+    previous = float(values[-2]) if len(values) > 1 else None
+    delta = latest - previous if previous is not None else None
+    return {
+        'annee': int(years[-1]),
+        'valeur': latest,
+        'annee_precedente': int(years[-2]) if len(values) > 1 else None,
+        'precedent': previous,
+        'variation': delta,
+        'variation_pct': delta / previous * 100 if previous else None,
+        'moyenne_mobile': float(recent.mean()),
+        'min_mobile': float(recent.min()),
+        'max_mobile': float(recent.max()),
+        # Variation annuelle moyenne sur la fenêtre glissante
+        'tendance': float((recent[-1] - recent[0]) / (years[-1] - years[-len(recent)]))
+                    if len(recent) > 1 else None,
+        # Évolution depuis la première année de la série
+        'annee_debut': int(years[0]),
+        'valeur_debut': first,
+        'evolution': latest - first,
+        'ratio': first / latest if latest else None,
+    }
@@ -0,0 +1,33 @@
+"""Import différé des modules lourds, chargés au premier accès à un de leurs attributs"""
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module name, importé au premier accès à un attribut
+
+    L'import est fait par importlib sous un verrou : les sessions Streamlit (un thread
+    chacune) qui utilisent le module en même temps attendent toutes un module complet.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        module = self._module
+        if module is None:
+            module = self._load()
+        return getattr(module, attribute)
+
+
+def lazy_import(name):
+    """Module name, exécuté seulement au premier accès à un de ses attributs"""
+    return LazyModule(name)
@@ -0,0 +1,81 @@
+"""Vues matérialisées des indicateurs dérivés, mises à jour par ajout de lignes
+
+À chaque nouvelle version des données, la table source est comparée à celle de la
+version précédente : si elle la prolonge (anciennes lignes inchangées, nouvelles années
+ou nouvelles régions ajoutées), seules les lignes ajoutées sont transmises à la vue,
+qui ne recalcule que les agrégats, tendances et classements touchés. Sinon la vue est
+reconstruite entièrement.
+"""
+from collections import deque
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Nombre de mises à jour conservées dans l'historique
+HISTORY_SIZE = 50
+
+
+def appended_rows(previous, current, keys):
+    """Lignes de current absentes de previous, ou None si une ligne de previous a changé ou disparu"""
+    if list(previous.columns) != list(current.columns):
+        return None
+    current_index = pd.MultiIndex.from_frame(current[keys].astype(str))
+    previous_index = pd.MultiIndex.from_frame(previous[keys].astype(str))
+    # Clés répétées : pas de correspondance ligne à ligne, reconstruction complète
+    if not current_index.is_unique or not previous_index.is_unique:
+        return None
+    positions = current_index.get_indexer(previous_index)
+    if (positions < 0).any():
+        return None
+
+    for column in current.columns:
+        old = previous[column].to_numpy()
+        new = current[column].to_numpy()[positions]
+        if np.issubdtype(old.dtype, np.number) and np.issubdtype(new.dtype, np.number):
+            same = np.array_equal(old.astype(np.float64), new.astype(np.float64), equal_nan=True)
+        else:
+            same = np.array_equal(old.astype(str), new.astype(str))
+        if not same:
+            return None
+
+    added = np.ones(len(current), dtype=bool)
+    added[positions] = False
+    return current[added]
+
+
+class MaterializedViews:
+    """Vues dérivées des tables, conservées d'une version des données à la suivante (accès protégé par un verrou)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+        self.history = deque(maxlen=HISTORY_SIZE)
+
+    def refresh(self, name, df, build, keys):
+        """Vue de df : réutilisée, prolongée (view.append) ou reconstruite (build(df)) selon les changements"""
+        start = time.perf_counter()
+        with self._lock:
+            previous = self._views.get(name)
+            added = appended_rows(previous[0], df, keys) if previous is not None else None
+            view, mode = None, 'complet'
+            if added is not None and added.empty:
+                view, mode = previous[1], 'inchangé'
+            elif added is not None:
+                try:
+                    view, mode = previous[1].append(added), 'incrémental'
+                except ValueError:
+                    # Lignes insérées avant la fin des séries : reconstruction
+                    view = None
+            if view is None:
+                view, mode = build(df), 'complet'
+            self._views[name] = (df, view)
+            self.history.append({
+                'vue': name,
+                'mode': mode,
+                'lignes': len(df),
+                'lignes_ajoutees': len(added) if added is not None else len(df),
+                'duree_ms': (time.perf_counter() - start) * 1000,
+            })
+        return view
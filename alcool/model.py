@@ -0,0 +1,899 @@
+"""Modèle du dashboard : données partagées, filtres et construction des figures
+
+Aucune dépendance à Streamlit : les mêmes figures servent l'interface, l'export,
+la génération par lots et les mesures de performance.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future
+import threading
+
+import numpy as np
+import pandas as pd
+
+from alcool.cube import PanelCube
+from alcool.data_sources import OPTIONAL_SCHEMAS, load_datasets, memory_report, sources_fingerprint
+from alcool.forecasting import ScenarioGrid, forecast_table
+from alcool.geo import NAME_PROPERTY, layer_mtime, load_layer
+from alcool.key_metrics import KeyMetrics, RankedMetrics
+from alcool.lazy import lazy_import
+from alcool.materialized import MaterializedViews
+from alcool.policy_impact import decimal_years, policy_impact_table
+from alcool.regional import LEVEL_LABELS, RegionalEngine, with_region_centroids
+from alcool.survey import SURVEY_LABELS, SURVEY_PROPORTIONS, SurveyEstimates, load_survey, with_survey_rates
+
+# Plotly n'est chargé qu'à la construction de la première figure
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+
+# Domaines proposés dans le focus d'analyse de la sidebar
+FOCUS_AREAS = ['Consommation', 'Politiques', 'Impact santé', 'Disparités régionales', 'Comparaisons internationales']
+
+# Domaine de rattachement des graphiques (None : toujours affiché)
+CHART_FOCUS = {
+    'historique.consommation': 'Consommation',
+    'historique.part_vin': 'Consommation',
+    'historique.buveurs_quotidiens': 'Consommation',
+    'historique.binge_drinking': 'Consommation',
+    'historique.mortalite': 'Impact santé',
+    'historique.couts_sante': 'Impact santé',
+    'politiques': 'Politiques',
+    'regional': 'Disparités régionales',
+    'international': 'Comparaisons internationales',
+    'strategies': None,
+}
+
+
+def chart_focus(chart_id):
+    """Domaine du focus d'analyse dont dépend un graphique"""
+    if chart_id in CHART_FOCUS:
+        return CHART_FOCUS[chart_id]
+    return CHART_FOCUS.get(chart_id.split('.')[0])
+
+
+def freeze_frame(df):
+    """Retourne un DataFrame en lecture seule sur les colonnes de df (sans copie si possible)"""
+    columns = {}
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            # Catégories conservées telles quelles (codes compacts, non modifiables en place)
+            columns[name] = df[name].array
+            continue
+        values = df[name].to_numpy()
+        if values.flags.writeable:
+            values.setflags(write=False)
+        columns[name] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+class YearIndex:
+    """Index trié des années d'un DataFrame, pour découper une période par recherche dichotomique"""
+
+    def __init__(self, df, column='annee'):
+        years = df[column].to_numpy()
+        self.frame = df
+        self.order = np.argsort(years, kind='stable')
+        self.sorted_years = years[self.order]
+        self.is_sorted = bool(np.all(self.order == np.arange(len(years))))
+
+    def slice(self, start, end):
+        """Retourne les lignes dont l'année est comprise entre start et end (inclus)"""
+        lo = np.searchsorted(self.sorted_years, start, side='left')
+        hi = np.searchsorted(self.sorted_years, end, side='right')
+        if self.is_sorted:
+            return self.frame.iloc[lo:hi]
+        return self.frame.iloc[np.sort(self.order[lo:hi])]
+
+
+# Indicateurs territoriaux agrégés par le moteur régional
+REGIONAL_INDICATORS = ['consommation_2023', 'evolution_2010_2023', 'buveurs_quotidiens', 'binge_drinking']
+
+# Année du portrait régional (colonnes consommation_2023, buveurs_quotidiens...)
+REGIONAL_SNAPSHOT_YEAR = 2023
+
+# Nombre maximal de territoires dans les classements en barres
+REGIONAL_BAR_LIMIT = 25
+
+
+def build_regional_engine(regional_data, territorial_data=None):
+    """Moteur régional sur les données infra-régionales si disponibles, sinon sur les régions"""
+    if territorial_data is not None:
+        return RegionalEngine(territorial_data, REGIONAL_INDICATORS)
+    return RegionalEngine(with_region_centroids(regional_data), REGIONAL_INDICATORS)
+
+
+# Indicateurs du panel annuel par région et libellés des axes
+REGIONAL_PANEL_INDICATORS = ['consommation_alcool', 'buveurs_quotidiens', 'binge_drinking']
+
+INDICATOR_LABELS = {
+    'consommation_alcool': "Consommation (L/pers/an)",
+    'buveurs_quotidiens': "Buveurs quotidiens (%)",
+    'binge_drinking': "Binge drinking (%)",
+}
+
+
+# Horizon des projections
+FORECAST_END_YEAR = 2030
+
+
+def prepare_tables(sources):
+    """Charge les tables du dashboard (types compacts, taux d'enquête appliqués, lecture seule) et l'enquête"""
+    datasets = load_datasets(sources)
+    territorial_data = load_datasets(sources, OPTIONAL_SCHEMAS, required=False).get('territorial_data')
+    # Micro-données d'enquête lues par blocs ; leurs taux remplacent ceux des tables s'ils sont observés
+    survey = load_survey(sources)
+    tables = {
+        'historical_data': with_survey_rates(datasets['historical_data'], survey, ['annee']),
+        'policy_timeline': datasets['policy_timeline'],
+        'regional_data': with_survey_rates(datasets['regional_data'], survey, ['region'],
+                                           year=REGIONAL_SNAPSHOT_YEAR),
+        'regional_panel': with_survey_rates(datasets['regional_panel'], survey, ['region', 'annee']),
+        'international_comparison': datasets['international_comparison'],
+        'health_impact_data': datasets['health_impact_data'],
+    }
+    if territorial_data is not None:
+        tables['territorial_data'] = territorial_data
+    return {name: freeze_frame(df) for name, df in tables.items()}, survey
+
+
+def attach_shared_tables(shared, sources):
+    """Tables mappées depuis le répertoire partagé ; la première version demandée y est publiée"""
+    def build():
+        tables, survey = prepare_tables(sources)
+        if survey is None:
+            return tables, {}
+        return {**tables, 'survey_sums': survey.sums}, {'survey': survey.metadata()}
+
+    tables, metadata = shared.load(sources_fingerprint(sources), build)
+    survey = None
+    if 'survey_sums' in tables:
+        survey = SurveyEstimates.restore(tables.pop('survey_sums'), **metadata['survey'])
+    return tables, survey
+
+
+def build_dashboard_data(sources, views=None, shared=None):
+    """Charge et prépare les données partagées (DataFrames en lecture seule, index, moteur régional)
+
+    views conserve les indicateurs dérivés d'un chargement à l'autre : lorsque les tables
+    ne font que s'allonger (nouvelles années ou régions), seuls les ajouts sont recalculés.
+    Avec shared (SharedTables), les tables sont mappées sans copie depuis la mémoire
+    partagée entre les processus serveur.
+    """
+    if views is None:
+        views = MaterializedViews()
+    if shared is None:
+        tables, survey = prepare_tables(sources)
+    else:
+        tables, survey = attach_shared_tables(shared, sources)
+    historical_data = tables['historical_data']
+    health_impact_data = tables['health_impact_data']
+    regional_data = tables['regional_data']
+    regional_panel = tables['regional_panel']
+    return {
+        'historical_data': historical_data,
+        'policy_timeline': tables['policy_timeline'],
+        'regional_data': regional_data,
+        'regional_engine': build_regional_engine(regional_data, tables.get('territorial_data')),
+        'regional_panel': regional_panel,
+        'regional_cube': PanelCube(regional_panel, 'region', REGIONAL_PANEL_INDICATORS),
+        'international_comparison': tables['international_comparison'],
+        'health_impact_data': health_impact_data,
+        'survey': survey,
+        'shared': shared is not None,
+        'year_indexes': {
+            'historical_data': YearIndex(historical_data),
+            'health_impact_data': YearIndex(health_impact_data),
+        },
+        # Indicateurs clés (dernière année, variations, moyennes mobiles) de chaque table annuelle
+        'key_metrics': {
+            'historical_data': views.refresh('historical_data', historical_data, KeyMetrics, ['annee']),
+            'health_impact_data': views.refresh('health_impact_data', health_impact_data, KeyMetrics, ['annee']),
+        },
+        # Indicateurs clés et classements de chaque région du panel annuel
+        'regional_metrics': views.refresh('regional_panel', regional_panel, RankedMetrics, ['region', 'annee']),
+        # Résultats dérivés (régressions, projections), calculés une fois par jeu de données
+        'derived': {},
+        'derived_lock': threading.RLock(),
+    }
+
+
+# Budget mémoire du cache de figures (taille JSON cumulée)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """Cache LRU de figures Plotly borné par la taille JSON cumulée des figures"""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, builder):
+        """Retourne la figure associée à la clé, en la construisant si besoin"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Construction hors verrou : les autres sessions ne sont pas bloquées
+        figure = builder()
+        size = len(figure.to_json().encode('utf-8'))
+
+        with self._lock:
+            if size > self.max_bytes or key in self._entries:
+                return figure
+            self._entries[key] = (figure, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+class DashboardModel:
+    """Données, filtres courants et figures du dashboard, indépendamment de l'interface"""
+
+    def __init__(self, data, data_key=(), figure_cache=None):
+        # Les DataFrames sont partagés entre sessions : ne jamais les modifier en place
+        self.data = data
+        self.data_key = tuple(data_key)
+        self.figure_cache = figure_cache
+        self.historical_data = data['historical_data']
+        self.policy_timeline = data['policy_timeline']
+        self.regional_data = data['regional_data']
+        self.regional_engine = data['regional_engine']
+        self.regional_panel = data['regional_panel']
+        self.regional_cube = data['regional_cube']
+        self.international_comparison = data['international_comparison']
+        self.health_impact_data = data['health_impact_data']
+        self.year_indexes = data['year_indexes']
+        self.key_metrics = data['key_metrics']
+        self.regional_metrics = data['regional_metrics']
+        self.survey = data['survey']
+
+        # Vues filtrées (données complètes par défaut)
+        years = self.historical_data['annee']
+        self.period = (int(years.min()), int(years.max()))
+        self.historical_view = self.historical_data
+        self.health_view = self.health_impact_data
+        self.focus = frozenset(FOCUS_AREAS)
+        self.show_projections = True
+
+    def cached_figure(self, chart_id, builder, *state):
+        """Retourne une figure mise en cache selon le graphique et l'état des filtres utilisés"""
+        if self.figure_cache is None:
+            return builder()
+        key = self.data_key + (chart_id,) + state
+        return self.figure_cache.get_or_build(key, builder)
+
+    def apply_filters(self, controls):
+        """Applique la période, le focus et les options choisis dans la sidebar"""
+        start, end = sorted((controls['annee_debut'], controls['annee_fin']))
+        self.period = (start, end)
+        self.historical_view = self.year_indexes['historical_data'].slice(start, end)
+        self.health_view = self.year_indexes['health_impact_data'].slice(start, end)
+        self.focus = frozenset(controls['focus_analysis'])
+        self.show_projections = controls['show_projections']
+
+    def period_label(self, df):
+        """Libellé de la période effectivement couverte par une vue filtrée"""
+        if df.empty:
+            return f"{self.period[0]}-{self.period[1]}"
+        return f"{df['annee'].min()}-{df['annee'].max()}"
+
+    def memory_report(self):
+        """Occupation mémoire des tables partagées (données sources et agrégats territoriaux)"""
+        tables = {
+            'historical_data': self.historical_data,
+            'policy_timeline': self.policy_timeline,
+            'regional_data': self.regional_data,
+            'regional_panel': self.regional_panel,
+            'international_comparison': self.international_comparison,
+            'health_impact_data': self.health_impact_data,
+        }
+        for level, table in self.regional_engine.tables.items():
+            tables[f'regional_engine.{level}'] = table
+        if self.survey is not None:
+            tables['survey.sommes'] = self.survey.sums
+        return memory_report(tables)
+
+    def derived(self, name, compute):
+        """Résultat dérivé des données, calculé une seule fois et partagé par tous les modèles"""
+        with self.data['derived_lock']:
+            if name not in self.data['derived']:
+                self.data['derived'][name] = compute()
+            return self.data['derived'][name]
+
+    def survey_profile(self, by=None, filters=None):
+        """Estimations pondérées de l'enquête ventilées selon by, ensemble si None (None sans micro-données)
+
+        Lues dans le cube d'agrégats de l'enquête : aucun regroupement sur les répondants.
+        """
+        if self.survey is None:
+            return None
+        return self.survey.estimates([by] if by else [], filters)
+
+    def policy_impacts(self):
+        """Effets estimés des politiques"""
+        return self.derived('policy_impacts', lambda: policy_impact_table(
+            self.historical_data, self.policy_timeline))
+
+    def forecast(self):
+        """Projection de référence de la consommation : (table, modèle)"""
+        return self.derived('forecast', lambda: forecast_table(
+            self.historical_data['annee'], self.historical_data['consommation_alcool'], FORECAST_END_YEAR))
+
+    def scenario_grid_job(self, executor=None):
+        """Calcul de la grille de scénarios, lancé une fois (dans executor si fourni)"""
+        def submit():
+            if executor is not None:
+                return executor.submit(ScenarioGrid, self.forecast()[0])
+            job = Future()
+            job.set_result(ScenarioGrid(self.forecast()[0]))
+            return job
+        return self.derived('scenario_grid', submit)
+
+    def scenario_grid(self):
+        """Grille de scénarios (attend la fin du calcul s'il tourne en arrière-plan)"""
+        return self.scenario_grid_job().result()
+
+    def build_consumption_figure(self):
+        """Figure : évolution de la consommation d'alcool"""
+        fig = px.line(self.historical_view, 
+                     x='annee', 
+                     y='consommation_alcool',
+                     title=f'Évolution de la Consommation d\'Alcool (litres/personne/an) - {self.period_label(self.historical_view)}',
+                     markers=True)
+        fig.update_layout(yaxis_title="Litres d'alcool pur/pers/an", xaxis_title="Année")
+        return fig
+
+    def build_wine_share_figure(self):
+        """Figure : part du vin dans la consommation totale"""
+        fig = px.area(self.historical_view, 
+                     x='annee', 
+                     y='part_vin',
+                     title=f'Part du Vin dans la Consommation Totale (%) - {self.period_label(self.historical_view)}')
+        fig.update_layout(yaxis_title="Part du vin (%)", xaxis_title="Année")
+        return fig
+
+    def build_daily_drinkers_figure(self):
+        """Figure : évolution des buveurs quotidiens"""
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=self.historical_view['annee'], 
+                               y=self.historical_view['buveurs_quotidiens'],
+                               name='Buveurs quotidiens',
+                               line=dict(color='brown')))
+
+        fig.update_layout(title='Évolution des Buveurs Quotidiens',
+                        yaxis_title="Pourcentage (%)", xaxis_title="Année")
+        return fig
+
+    def build_binge_drinking_figure(self):
+        """Figure : évolution du binge drinking"""
+        fig = px.line(self.historical_view, 
+                     x='annee', 
+                     y='binge_drinking',
+                     title=f'Évolution du Binge Drinking (%) - {self.period_label(self.historical_view)}',
+                     markers=True)
+        fig.update_layout(yaxis_title="Binge drinking (%)", xaxis_title="Année")
+        return fig
+
+    def build_mortality_figure(self):
+        """Figure : mortalité liée à l'alcool"""
+        fig = px.line(self.health_view, 
+                     x='annee', 
+                     y=['deces_alcool', 'cancers_digesifs', 'maladies_foie'],
+                     title=f'Mortalité Liée à l\'Alcool (milliers) - {self.period_label(self.health_view)}',
+                     markers=True)
+        fig.update_layout(yaxis_title="Nombre de décès (milliers)", xaxis_title="Année")
+        return fig
+
+    def build_health_costs_figure(self):
+        """Figure : coûts sanitaires liés à l'alcool"""
+        fig = px.area(self.health_view, 
+                     x='annee', 
+                     y='couts_sante',
+                     title=f'Coûts Sanitaires Liés à l\'Alcool (milliards €) - {self.period_label(self.health_view)}')
+        fig.update_layout(yaxis_title="Coûts (milliards €)", xaxis_title="Année")
+        return fig
+
+    def build_policy_timeline_figure(self):
+        """Figure : politiques positionnées sur la courbe de consommation"""
+        policy_df = self.policy_timeline.assign(annee=decimal_years(self.policy_timeline['date']))
+
+        # Position de chaque mesure sur la courbe (interpolation, mesures hors période exclues)
+        years = self.historical_view['annee'].to_numpy()
+        consumption = self.historical_view['consommation_alcool'].to_numpy()
+        if len(years):
+            policy_df = policy_df[policy_df['annee'].between(years.min(), years.max())]
+            policy_df = policy_df.assign(consommation_alcool=np.interp(policy_df['annee'], years, consumption))
+        else:
+            policy_df = policy_df.iloc[0:0].assign(consommation_alcool=np.nan)
+
+        fig = px.scatter(policy_df, 
+                       x='annee', 
+                       y='consommation_alcool',
+                       color='type',
+                       size_max=20,
+                       hover_name='titre',
+                       hover_data={'description': True, 'type': True},
+                       title='Impact des Politiques sur la Consommation d\'Alcool')
+
+        # Ajouter la ligne de tendance
+        fig.add_trace(go.Scatter(x=self.historical_view['annee'], 
+                               y=self.historical_view['consommation_alcool'],
+                               mode='lines',
+                               name='Consommation alcool',
+                               line=dict(color='gray', width=2)))
+
+        fig.update_layout(showlegend=True)
+        return fig
+
+    def get_policy_impact_data(self):
+        """Retourne l'impact estimé des politiques (uniquement celles estimables)"""
+        impacts = self.policy_impacts()
+        impact_df = impacts.dropna(subset=['impact_consommation']).copy()
+
+        # CORRECTION : Utiliser la valeur absolue pour la taille
+        impact_df['impact_absolu'] = impact_df['impact_consommation'].abs()
+        return impact_df
+
+    def build_policy_impact_figure(self):
+        """Figure : impact des politiques sur la consommation"""
+        fig = px.bar(self.get_policy_impact_data(), 
+                    x='politique', 
+                    y='impact_consommation',
+                    error_y='erreur_type',
+                    title='Impact sur la Consommation (litres/pers/an)',
+                    color='impact_consommation',
+                    color_continuous_scale='RdYlGn')
+        fig.update_layout(xaxis_tickangle=45)
+        return fig
+
+    def build_policy_delay_figure(self):
+        """Figure : délai vs amplitude des impacts"""
+        fig = px.scatter(self.get_policy_impact_data(), 
+                       x='delai_impact', 
+                       y='impact_consommation',
+                       size='impact_absolu',  # Utiliser les valeurs absolues
+                       color='politique',
+                       hover_name='politique',
+                       title='Délai vs Amplitude des Impacts',
+                       size_max=30)
+        return fig
+
+    def build_strategy_efficiency_figure(self):
+        """Figure : efficacité vs coût des stratégies"""
+        strategies = [
+            {'strategie': 'Augmentation des prix', 'efficacite': 8.2, 'cout': 3, 'acceptabilite': 4},
+            {'strategie': 'Limitation publicité', 'efficacite': 6.8, 'cout': 2, 'acceptabilite': 7},
+            {'strategie': 'Contrôles routiers', 'efficacite': 7.5, 'cout': 4, 'acceptabilite': 6},
+            {'strategie': 'Interdiction vente mineurs', 'efficacite': 6.2, 'cout': 2, 'acceptabilite': 8},
+            {'strategie': 'Campagnes prévention', 'efficacite': 5.8, 'cout': 5, 'acceptabilite': 9},
+            {'strategie': 'Services d\'aide', 'efficacite': 6.5, 'cout': 6, 'acceptabilite': 8},
+        ]
+
+        strategy_df = pd.DataFrame(strategies)
+
+        fig = px.scatter(strategy_df, 
+                       x='cout', 
+                       y='efficacite',
+                       size='acceptabilite',
+                       color='strategie',
+                       hover_name='strategie',
+                       title='Efficacité vs Coût des Stratégies',
+                       size_max=30)
+        return fig
+
+    def build_regional_map_figure(self, level='region'):
+        """Figure : carte de la consommation par territoire"""
+        # Points de la carte (décimés côté serveur au-delà de MAP_MAX_POINTS)
+        table = self.regional_engine.tables[level]
+        if 'lat' in table.columns:
+            coords_df = self.regional_engine.map_points(level)
+        else:
+            coords_df = with_region_centroids(table)
+
+        # Créer une carte scatter_geo avec un fond de carte visible
+        fig = px.scatter_geo(coords_df,
+                            lat='lat',
+                            lon='lon',
+                            color='consommation_2023',
+                            size='consommation_2023',
+                            hover_name=level,
+                            hover_data={'consommation_2023': True},
+                            labels={'consommation_2023': 'consommation'},
+                            title=f'Consommation d\'Alcool par {LEVEL_LABELS[level]} (litres/pers/an) - 2023',
+                            color_continuous_scale='RdYlGn_r',
+                            size_max=20,
+                            projection='natural earth')
+
+        # Configuration pour rendre la carte visible
+        fig.update_geos(
+            visible=True,
+            resolution=50,
+            scope='europe',
+            showcountries=True,
+            countrycolor="black",
+            showsubunits=True,
+            subunitcolor="blue",
+            landcolor="lightgray",
+            oceancolor="lightblue",
+            lakecolor="blue",
+            bgcolor="white"
+        )
+
+        # Ajuster la vue sur la France
+        fig.update_geos(
+            center=dict(lat=46.5, lon=2),
+            projection_scale=5
+        )
+
+        fig.update_layout(
+            height=600,
+            geo=dict(
+                bgcolor='rgba(255,255,255,0.1)',
+                landcolor='lightgreen'
+            )
+        )
+        return fig
+
+    def build_regional_choropleth_figure(self, level, geo_layer, tier='moyenne'):
+        """Figure : carte choroplèthe à partir des contours locaux simplifiés"""
+        table = self.regional_engine.tables[level]
+        table = table.assign(**{level: table[level].astype(str)})
+
+        fig = px.choropleth(table,
+                            geojson=geo_layer.to_geojson(tier),
+                            locations=level,
+                            featureidkey=f'properties.{NAME_PROPERTY}',
+                            color='consommation_2023',
+                            hover_name=level,
+                            labels={'consommation_2023': 'consommation'},
+                            title=f'Consommation d\'Alcool par {LEVEL_LABELS[level]} (litres/pers/an) - 2023',
+                            color_continuous_scale='RdYlGn_r')
+
+        # Pas de fond de carte : seuls les contours fournis sont dessinés (aucun accès réseau)
+        fig.update_geos(fitbounds='locations', visible=False)
+        fig.update_layout(height=600)
+        return fig
+
+    def build_europe_map_figure(self):
+        """Figure : carte choroplèthe européenne"""
+        # Données pour l'Europe
+        europe_data = {
+            'pays': ['France', 'Allemagne', 'Italie', 'Espagne', 'Royaume-Uni', 'Belgique', 'Pays-Bas', 'Suisse'],
+            'consommation': [8.3, 10.6, 6.9, 7.5, 9.8, 10.2, 8.7, 9.1],
+            'code': ['FRA', 'DEU', 'ITA', 'ESP', 'GBR', 'BEL', 'NLD', 'CHE']
+        }
+
+        europe_df = pd.DataFrame(europe_data)
+
+        fig_europe = px.choropleth(europe_df,
+                                 locations='code',
+                                 color='consommation',
+                                 hover_name='pays',
+                                 title='Consommation d\'Alcool en Europe (litres/pers/an)',
+                                 color_continuous_scale='RdYlGn_r',
+                                 scope='europe')
+
+        fig_europe.update_geos(
+            visible=True,
+            resolution=50,
+            showcountries=True,
+            countrycolor="black"
+        )
+        return fig_europe
+
+    def ranking_suffix(self, level):
+        """Mention ajoutée aux titres lorsque le classement est tronqué"""
+        if len(self.regional_engine.tables[level]) > REGIONAL_BAR_LIMIT:
+            return f" ({REGIONAL_BAR_LIMIT} valeurs les plus élevées)"
+        return ""
+
+    def build_regional_ranking_figure(self, level='region'):
+        """Figure : classement des territoires"""
+        fig = px.bar(self.regional_engine.ranked(level, 'consommation_2023', limit=REGIONAL_BAR_LIMIT), 
+                    x='consommation_2023', 
+                    y=level,
+                    orientation='h',
+                    title=f'Consommation d\'Alcool par {LEVEL_LABELS[level]} - 2023{self.ranking_suffix(level)}',
+                    color='consommation_2023',
+                    color_continuous_scale='RdYlGn_r')
+        return fig
+
+    def build_regional_evolution_figure(self, level='region'):
+        """Figure : évolution territoriale 2010-2023 (régions : du début à la fin du panel annuel)"""
+        if level == 'region':
+            return self.build_regional_panel_evolution_figure()
+        fig = px.bar(self.regional_engine.ranked(level, 'evolution_2010_2023', limit=REGIONAL_BAR_LIMIT), 
+                    x='evolution_2010_2023', 
+                    y=level,
+                    orientation='h',
+                    title=f'Évolution de la Consommation 2010-2023 (litres/pers/an){self.ranking_suffix(level)}',
+                    color='evolution_2010_2023',
+                    color_continuous_scale='RdYlGn')
+        return fig
+
+    def build_regional_panel_evolution_figure(self, indicator='consommation_alcool'):
+        """Figure : évolution de chaque région entre la première et la dernière année du panel"""
+        metrics = self.regional_metrics
+        ranking = pd.DataFrame(metrics.ranking(indicator, 'evolution', limit=REGIONAL_BAR_LIMIT),
+                               columns=['region', 'evolution'])
+        first = min(metrics[region][indicator]['annee_debut'] for region in ranking['region'])
+        last = max(metrics[region][indicator]['annee'] for region in ranking['region'])
+        column = f'evolution_{first}_{last}'
+        fig = px.bar(ranking.rename(columns={'evolution': column}),
+                    x=column,
+                    y='region',
+                    orientation='h',
+                    title=f'Évolution de la Consommation {first}-{last} (litres/pers/an){self.ranking_suffix("region")}',
+                    color=column,
+                    color_continuous_scale='RdYlGn')
+        return fig
+
+    def build_regional_year_ranking_figure(self, indicator, year):
+        """Figure : classement des régions pour une année du panel"""
+        fig = px.bar(self.regional_cube.ranked(year, indicator),
+                    x=indicator,
+                    y='region',
+                    orientation='h',
+                    labels={indicator: INDICATOR_LABELS[indicator], 'region': ''},
+                    title=f'{INDICATOR_LABELS[indicator]} par Région - {year}',
+                    color=indicator,
+                    color_continuous_scale='RdYlGn_r')
+        return fig
+
+    def build_regional_yoy_figure(self, indicator, year):
+        """Figure : variation de l'indicateur sur un an par région"""
+        fig = px.bar(self.regional_cube.ranked(year, indicator, deltas=True),
+                    x=indicator,
+                    y='region',
+                    orientation='h',
+                    labels={indicator: 'Variation', 'region': ''},
+                    title=f'Variation {year - 1}-{year} : {INDICATOR_LABELS[indicator]}',
+                    color=indicator,
+                    color_continuous_scale='RdYlGn_r',
+                    color_continuous_midpoint=0)
+        return fig
+
+    def build_regional_trends_figure(self, indicator):
+        """Figure : séries annuelles de l'indicateur pour chaque région"""
+        cube = self.regional_cube
+        fig = px.line(cube.frame([indicator]),
+                     x='annee',
+                     y=indicator,
+                     color='region',
+                     labels={indicator: INDICATOR_LABELS[indicator], 'annee': 'Année', 'region': 'Région'},
+                     title=f'{INDICATOR_LABELS[indicator]} par Région {cube.years[0]}-{cube.years[-1]}')
+        fig.update_layout(height=500)
+        return fig
+
+    def build_regional_animation_figure(self, indicator):
+        """Figure : carte animée des régions, une image par année du panel"""
+        cube = self.regional_cube
+        frame = with_region_centroids(cube.frame([indicator])).dropna(subset=['lat', indicator])
+        # Échelle de couleur commune à toutes les années
+        values = cube.values[..., cube.indicators.index(indicator)]
+        fig = px.scatter_geo(frame,
+                            lat='lat',
+                            lon='lon',
+                            color=indicator,
+                            size=indicator,
+                            hover_name='region',
+                            animation_frame='annee',
+                            range_color=(float(np.nanmin(values)), float(np.nanmax(values))),
+                            labels={indicator: INDICATOR_LABELS[indicator], 'annee': 'Année'},
+                            title=f'{INDICATOR_LABELS[indicator]} par Région {cube.years[0]}-{cube.years[-1]}',
+                            color_continuous_scale='RdYlGn_r',
+                            size_max=20)
+        fig.update_geos(
+            visible=True,
+            resolution=50,
+            scope='europe',
+            showcountries=True,
+            countrycolor="black",
+            landcolor="lightgray",
+            center=dict(lat=46.5, lon=2),
+            projection_scale=5
+        )
+        fig.update_layout(height=600)
+        return fig
+
+    def build_survey_crosstab_figure(self, measure, rows='tranche_age', columns='csp', filters=()):
+        """Figure : estimation pondérée croisée selon deux variables de l'enquête"""
+        estimates = self.survey.estimates([rows, columns], dict(filters))
+        scale = 100 if measure in SURVEY_PROPORTIONS else 1
+        table = estimates.pivot(index=rows, columns=columns, values=measure) * scale
+        origin = '' if self.survey.observed else ' (données simulées)'
+        fig = px.imshow(table,
+                        text_auto='.1f',
+                        aspect='auto',
+                        labels={'color': SURVEY_LABELS[measure], 'x': '', 'y': ''},
+                        title=f'{SURVEY_LABELS[measure]} - estimations pondérées{origin}',
+                        color_continuous_scale='RdYlGn_r')
+        return fig
+
+    def build_international_consumption_figure(self):
+        """Figure : consommation comparée entre pays"""
+        fig = px.bar(self.international_comparison.sort_values('consommation_alcool'), 
+                    x='pays', 
+                    y='consommation_alcool',
+                    title='Consommation d\'Alcool - Comparaison Internationale',
+                    color='consommation_alcool',
+                    color_continuous_scale='RdYlGn_r')
+        return fig
+
+    def build_price_consumption_figure(self):
+        """Figure : relation prix vs consommation"""
+        fig = px.scatter(self.international_comparison, 
+                       x='prix_biere_eur', 
+                       y='consommation_alcool',
+                       size='mortalite_liee_alcool',
+                       color='pays',
+                       hover_name='pays',
+                       title='Relation Prix vs Consommation',
+                       size_max=30)
+        return fig
+
+    def build_policy_comparison_figure(self):
+        """Figure : comparaison des politiques nationales"""
+        policy_comparison = [
+            {'pays': 'France', 'publicite_limitee': 1, 'taxes_elevees': 1, 'controles_renforces': 1, 'prevention_jeunes': 1},
+            {'pays': 'Royaume-Uni', 'publicite_limitee': 1, 'taxes_elevees': 1, 'controles_renforces': 1, 'prevention_jeunes': 1},
+            {'pays': 'Pays-Bas', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 1, 'prevention_jeunes': 1},
+            {'pays': 'Allemagne', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 0, 'prevention_jeunes': 0},
+            {'pays': 'États-Unis', 'publicite_limitee': 0, 'taxes_elevees': 0, 'controles_renforces': 1, 'prevention_jeunes': 1},
+        ]
+
+        policy_df = pd.DataFrame(policy_comparison)
+
+        fig = px.imshow(policy_df.set_index('pays'),
+                      title='Comparaison des Politiques sur l\'Alcool',
+                      color_continuous_scale='RdYlGn')
+        return fig
+
+    def build_national_performance_figure(self):
+        """Figure : investissement vs réduction de la consommation"""
+        performance_data = [
+            {'pays': 'Royaume-Uni', 'reduction_10ans': -2.8, 'investissement_prevention': 0.8, 'classement': 1},
+            {'pays': 'France', 'reduction_10ans': -2.1, 'investissement_prevention': 0.4, 'classement': 2},
+            {'pays': 'Italie', 'reduction_10ans': -1.9, 'investissement_prevention': 0.3, 'classement': 3},
+            {'pays': 'Canada', 'reduction_10ans': -1.7, 'investissement_prevention': 0.6, 'classement': 4},
+            {'pays': 'États-Unis', 'reduction_10ans': -1.2, 'investissement_prevention': 1.2, 'classement': 5},
+            {'pays': 'Allemagne', 'reduction_10ans': -0.8, 'investissement_prevention': 0.3, 'classement': 6},
+        ]
+
+        perf_df = pd.DataFrame(performance_data)
+
+        # CORRECTION : Utiliser une colonne positive pour la taille
+        perf_df['reduction_absolue'] = perf_df['reduction_10ans'].abs()
+
+        fig = px.scatter(perf_df, 
+                       x='investissement_prevention', 
+                       y='reduction_10ans',
+                       size='reduction_absolue',  # Utiliser les valeurs absolues
+                       color='pays',
+                       hover_name='pays',
+                       title='Investissement vs Réduction de la Consommation',
+                       size_max=30)
+        return fig
+
+    def build_projection_figure(self, scenario=(0, 0.0, 0.0)):
+        """Figure : projection de la consommation jusqu'en 2030"""
+        forecast, _ = self.forecast()
+        years = forecast['annee']
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=pd.concat([years, years[::-1]]),
+                                 y=pd.concat([forecast['haut_95'], forecast['bas_95'][::-1]]),
+                                 fill='toself', fillcolor='rgba(210, 105, 30, 0.15)', line=dict(width=0),
+                                 name='Intervalle 95 %', hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=pd.concat([years, years[::-1]]),
+                                 y=pd.concat([forecast['haut_80'], forecast['bas_80'][::-1]]),
+                                 fill='toself', fillcolor='rgba(210, 105, 30, 0.3)', line=dict(width=0),
+                                 name='Intervalle 80 %', hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=self.historical_data['annee'], y=self.historical_data['consommation_alcool'],
+                                 mode='lines+markers', name='Observé', line=dict(color='brown')))
+        fig.add_trace(go.Scatter(x=years, y=forecast['prevision'], mode='lines+markers',
+                                 name='Tendance actuelle', line=dict(color='#D2691E', dash='dash')))
+        if any(scenario):
+            grid = self.scenario_grid()
+            fig.add_trace(go.Scatter(x=grid.years, y=grid.lookup(*scenario), mode='lines+markers',
+                                     name='Scénario', line=dict(color='green')))
+
+        fig.add_hrect(y0=0, y1=6.5, line_width=0, fillcolor="green", opacity=0.2,
+                     annotation_text="Objectif 2030")
+        fig.update_layout(title=f'Projection de la Consommation d\'Alcool {years.iloc[0]}-{years.iloc[-1]}',
+                          yaxis_title="Consommation (L/pers/an)", xaxis_title="Année")
+        return fig
+
+    def figure_catalog(self, level='region'):
+        """Toutes les figures du dashboard : (section, identifiant, constructeur, état des filtres)"""
+        no_scenario = (0, 0.0, 0.0)
+        indicator, year = 'consommation_alcool', self.regional_cube.latest_year
+        # Choroplèthe si les contours sont compilés (même clé de cache que l'onglet Cartographie)
+        geo_mtime = layer_mtime(level)
+        if geo_mtime is not None:
+            regional_map = ("Régional", 'regional.choroplethe',
+                            lambda: self.build_regional_choropleth_figure(level, load_layer(level)),
+                            (level, 'moyenne', geo_mtime))
+        else:
+            regional_map = ("Régional", 'regional.carte', lambda: self.build_regional_map_figure(level), (level,))
+        survey = []
+        if self.survey is not None:
+            survey.append(("Régional", 'regional.profil_croise',
+                           lambda: self.build_survey_crosstab_figure('consommation_alcool'), ('consommation_alcool', ())))
+        return [
+            ("Historique", 'historique.consommation', self.build_consumption_figure, self.period),
+            ("Historique", 'historique.part_vin', self.build_wine_share_figure, self.period),
+            ("Historique", 'historique.buveurs_quotidiens', self.build_daily_drinkers_figure, self.period),
+            ("Historique", 'historique.binge_drinking', self.build_binge_drinking_figure, self.period),
+            ("Historique", 'historique.mortalite', self.build_mortality_figure, self.period),
+            ("Historique", 'historique.couts_sante', self.build_health_costs_figure, self.period),
+            ("Politiques", 'politiques.timeline', self.build_policy_timeline_figure, self.period),
+            ("Politiques", 'politiques.impact', self.build_policy_impact_figure, ()),
+            ("Politiques", 'politiques.delai_impact', self.build_policy_delay_figure, ()),
+            ("Politiques", 'politiques.efficacite', self.build_strategy_efficiency_figure, ()),
+            regional_map,
+            ("Régional", 'regional.europe', self.build_europe_map_figure, ()),
+            ("Régional", 'regional.classement', lambda: self.build_regional_ranking_figure(level), (level,)),
+            ("Régional", 'regional.evolution', lambda: self.build_regional_evolution_figure(level), (level,)),
+            ("Régional", 'regional.animation', lambda: self.build_regional_animation_figure(indicator),
+             (indicator,)),
+            ("Régional", 'regional.classement_annuel',
+             lambda: self.build_regional_year_ranking_figure(indicator, year), (indicator, year)),
+            ("Régional", 'regional.variation_annuelle',
+             lambda: self.build_regional_yoy_figure(indicator, year), (indicator, year)),
+            ("Régional", 'regional.series', lambda: self.build_regional_trends_figure(indicator), (indicator,)),
+            *survey,
+            ("International", 'international.consommation', self.build_international_consumption_figure, ()),
+            ("International", 'international.prix', self.build_price_consumption_figure, ()),
+            ("International", 'international.politiques', self.build_policy_comparison_figure, ()),
+            ("International", 'international.performances', self.build_national_performance_figure, ()),
+            ("Stratégies", 'strategies.projection', lambda: self.build_projection_figure(no_scenario), no_scenario),
+        ]
+
+    def export_tables(self):
+        """Tables jointes à l'export, restreintes à la période sélectionnée"""
+        forecast, _ = self.forecast()
+        tables = {
+            'historique': self.historical_view,
+            'impact_sante': self.health_view,
+            'politiques': self.policy_timeline,
+            'impact_politiques': self.policy_impacts(),
+            'regions': self.regional_engine.tables['region'],
+            'regions_annuel': self.regional_panel,
+            'international': self.international_comparison,
+            'projection': forecast,
+        }
+        if self.survey is not None:
+            tables['profil_csp'] = self.survey_profile('csp')
+            tables['profil_age'] = self.survey_profile('tranche_age')
+        return tables
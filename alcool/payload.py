@@ -0,0 +1,129 @@
+"""Réduction de la charge JSON des figures envoyées au navigateur
+
+Une figure compacte ne garde du modèle (template) que les styles des types de traces
+qu'elle contient, arrondit les valeurs à la précision d'affichage, encode les séries
+numériques en tableaux typés float32 / entiers courts (base64 binaire) et décime les
+courbes trop longues en conservant les extrêmes de chaque intervalle.
+"""
+import numpy as np
+
+from alcool.lazy import lazy_import
+
+go = lazy_import('plotly.graph_objects')
+pio = lazy_import('plotly.io')
+
+# Chiffres significatifs conservés (précision d'affichage des survols)
+PAYLOAD_DIGITS = 4
+
+# En dessous de cette longueur, une série reste en JSON texte (plus court que le base64)
+TYPED_ARRAY_MIN_LENGTH = 8
+
+# Nombre maximal de points d'une courbe avant décimation
+MAX_TRACE_POINTS = 5000
+
+# Types de traces décimables (courbes ordonnées selon x)
+DECIMATED_TRACES = {'scatter', 'scattergl'}
+
+
+def payload_bytes(fig):
+    """Taille de la figure telle que sérialisée pour le navigateur"""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+def round_significant(values, digits=PAYLOAD_DIGITS):
+    """Arrondit chaque valeur à digits chiffres significatifs"""
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.zeros_like(values)
+    nonzero = np.isfinite(values) & (values != 0)
+    magnitude[nonzero] = np.floor(np.log10(np.abs(values[nonzero])))
+    factor = 10.0 ** (digits - 1 - magnitude)
+    return np.round(values * factor) / factor
+
+
+def compact_array(values, digits=PAYLOAD_DIGITS):
+    """Série numérique compacte ; toute autre valeur est retournée inchangée"""
+    if isinstance(values, (list, tuple)):
+        if not values or not all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                                 for value in values):
+            return values
+        values = np.asarray(values)
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in 'iuf' or values.size == 0:
+        return values
+
+    if values.dtype.kind == 'f':
+        values = round_significant(values, digits)
+        if values.ndim == 1 and values.size < TYPED_ARRAY_MIN_LENGTH:
+            return [None if np.isnan(value) else value for value in values.tolist()]
+        return values.astype(np.float32)
+
+    if values.ndim == 1 and values.size < TYPED_ARRAY_MIN_LENGTH:
+        return values.tolist()
+    for dtype in (np.int8, np.int16, np.int32):
+        limits = np.iinfo(dtype)
+        if values.min() >= limits.min and values.max() <= limits.max:
+            return values.astype(dtype)
+    return values
+
+
+def decimation_indices(y, max_points=MAX_TRACE_POINTS):
+    """Indices conservés : premier, dernier, minimum et maximum de chaque intervalle"""
+    y = np.asarray(y, dtype=np.float64)
+    buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(1, len(y) - 1, buckets + 1).astype(int)
+    kept = [0, len(y) - 1]
+    filled = np.where(np.isnan(y), 0, y)
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            kept += [start + int(np.argmin(filled[start:end])), start + int(np.argmax(filled[start:end]))]
+    return np.unique(kept)
+
+
+def decimate_trace(trace, max_points=MAX_TRACE_POINTS):
+    """Réduit une courbe trop longue à max_points points environ (modifie trace)"""
+    if trace.get('type', 'scatter') not in DECIMATED_TRACES:
+        return
+    y = trace.get('y')
+    if y is None or len(y) <= max_points or 'markers' in trace.get('mode', 'lines'):
+        return
+    try:
+        kept = decimation_indices(y, max_points)
+    except (TypeError, ValueError):
+        return
+    size = len(y)
+    for name, values in list(trace.items()):
+        if isinstance(values, (list, tuple, np.ndarray)) and not isinstance(values, str) and len(values) == size:
+            trace[name] = np.asarray(values)[kept]
+
+
+def compact_value(value, digits):
+    """Parcourt les attributs d'une trace et compacte chaque série numérique"""
+    if isinstance(value, dict):
+        return {name: compact_value(item, digits) for name, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and all(isinstance(item, dict) for item in value):
+        return [compact_value(item, digits) for item in value]
+    return compact_array(value, digits)
+
+
+def compact_figure(fig, digits=PAYLOAD_DIGITS, max_points=MAX_TRACE_POINTS):
+    """Copie de la figure allégée pour l'affichage (le rendu visuel est inchangé)"""
+    # Attributs sous forme de tableaux NumPy (Figure.to_plotly_json les encode déjà en base64)
+    spec = {
+        'data': [trace.to_plotly_json() for trace in fig.data],
+        'layout': fig.layout.to_plotly_json(),
+        'frames': [frame.to_plotly_json() for frame in fig.frames],
+    }
+    traces = list(spec.get('data', []))
+    for frame in spec.get('frames', []):
+        traces += frame.get('data', [])
+
+    for trace in traces:
+        decimate_trace(trace, max_points)
+        for name, value in list(trace.items()):
+            trace[name] = compact_value(value, digits)
+
+    # Styles du modèle limités aux types de traces présents
+    template = spec.get('layout', {}).get('template')
+    if template and 'data' in template:
+        used = {trace.get('type', 'scatter') for trace in traces}
+        template['data'] = {name: styles for name, styles in template['data'].items() if name in used}
+    return go.Figure(spec)
@@ -0,0 +1,111 @@
+"""Estimation de l'effet des politiques par séries temporelles interrompues
+
+Pour chaque politique et chaque délai candidat, on ajuste une régression segmentée
+    y = b0 + b1·t + b2·après + b3·(t - t_effet)·après
+où ``après`` vaut 1 à partir de la date d'effet (date de la politique + délai). b2 est
+le changement de niveau, b3 le changement de pente. Tous les modèles (politiques ×
+délais) sont résolus d'un bloc par pseudo-inverses NumPy empilées ; le délai retenu
+est celui qui minimise la somme des carrés des résidus.
+
+Chaque politique est estimée isolément : lorsque plusieurs mesures sont proches dans
+le temps, leurs effets se confondent et doivent être lus comme des ordres de grandeur.
+"""
+import numpy as np
+import pandas as pd
+
+# Délais candidats entre l'adoption d'une mesure et son effet (années)
+DEFAULT_LAGS = np.arange(0, 5)
+
+# Nombre minimal d'observations de part et d'autre de la date d'effet
+MIN_PRE_POINTS = 3
+MIN_POST_POINTS = 2
+
+
+def decimal_years(dates):
+    """Convertit des dates en années décimales (2009-07-01 -> 2009.5)"""
+    dates = pd.to_datetime(pd.Series(dates))
+    return (dates.dt.year + (dates.dt.dayofyear - 1) / 365.25).to_numpy(np.float64)
+
+
+def estimate_policy_effects(times, values, policy_times, lags=DEFAULT_LAGS):
+    """Ajuste tous les modèles segmentés et retient le meilleur délai par politique
+
+    times, values : série observée (années décimales, valeurs) ;
+    policy_times : dates d'adoption (années décimales).
+    Retourne un dict de tableaux alignés sur policy_times : effet, pente, erreur_type,
+    delai, r2 ; NaN lorsque la série ne couvre pas assez la période de la politique.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    policy_times = np.asarray(policy_times, dtype=np.float64)
+    lags = np.asarray(lags, dtype=np.float64)
+    n_policies, n_lags, n_points = len(policy_times), len(lags), len(times)
+
+    # Dates d'effet (politiques × délais) et indicatrices « après » (politiques × délais × temps)
+    effect_times = policy_times[:, None] + lags[None, :]
+    after = (times[None, None, :] >= effect_times[:, :, None]).astype(np.float64)
+    post_points = after.sum(axis=2)
+    valid = (post_points >= MIN_POST_POINTS) & (n_points - post_points >= MIN_PRE_POINTS)
+
+    design = np.empty((n_policies, n_lags, n_points, 4))
+    design[..., 0] = 1.0
+    design[..., 1] = times - times.mean()
+    design[..., 2] = after
+    design[..., 3] = (times[None, None, :] - effect_times[:, :, None]) * after
+
+    coefficients = np.linalg.pinv(design) @ values
+    residuals = values - np.einsum('pltk,plk->plt', design, coefficients)
+    sse = np.einsum('plt,plt->pl', residuals, residuals)
+    sse = np.where(valid, sse, np.inf)
+
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_policies)
+    best_coefficients = coefficients[rows, best]
+    best_design = design[rows, best]
+    best_sse = sse[rows, best]
+    found = np.isfinite(best_sse)
+
+    # Erreur type du changement de niveau : sigma² · (XᵀX)⁻¹[2, 2]
+    dof = max(n_points - 4, 1)
+    xtx_inv = np.linalg.pinv(np.einsum('ptk,ptj->pkj', best_design, best_design))
+    with np.errstate(invalid='ignore'):
+        standard_errors = np.sqrt(best_sse / dof * xtx_inv[:, 2, 2])
+    total = ((values - values.mean()) ** 2).sum()
+    r2 = 1 - best_sse / total if total > 0 else np.full(n_policies, np.nan)
+
+    def masked(array):
+        return np.where(found, array, np.nan)
+
+    return {
+        'effet': masked(best_coefficients[:, 2]),
+        'pente': masked(best_coefficients[:, 3]),
+        'erreur_type': masked(standard_errors),
+        'delai': masked(lags[best]),
+        'r2': masked(r2),
+    }
+
+
+def policy_impact_table(series, policies, value_column='consommation_alcool', lags=DEFAULT_LAGS):
+    """Tableau des effets estimés pour chaque politique
+
+    series : DataFrame avec ``annee`` (ou ``date``) et la colonne analysée ;
+    policies : DataFrame avec ``date`` et ``titre``.
+    """
+    if 'date' in series.columns:
+        times = decimal_years(series['date'])
+    else:
+        times = series['annee'].to_numpy(np.float64)
+    order = np.argsort(times, kind='stable')
+    policy_times = decimal_years(policies['date'])
+    effects = estimate_policy_effects(times[order], series[value_column].to_numpy(np.float64)[order],
+                                      policy_times, lags)
+    table = pd.DataFrame({
+        'politique': [f"{title} ({int(year)})" for title, year in zip(policies['titre'], policy_times)],
+        'type': policies['type'].to_numpy() if 'type' in policies.columns else None,
+        'impact_consommation': effects['effet'],
+        'changement_pente': effects['pente'],
+        'erreur_type': effects['erreur_type'],
+        'delai_impact': effects['delai'],
+        'r2': effects['r2'],
+    })
+    return table
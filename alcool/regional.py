@@ -0,0 +1,152 @@
+"""Moteur régional multi-niveaux : commune → département → région
+
+Les territoires sont encodés une fois en catégories (codes entiers) ; les agrégations
+vers les niveaux supérieurs sont des sommes pondérées par ``np.bincount`` sur ces codes,
+et les ordres de tri et rangs de chaque indicateur sont précalculés à la construction.
+"""
+import numpy as np
+import pandas as pd
+
+# Niveaux géographiques, du plus fin au plus agrégé
+LEVELS = ('commune', 'departement', 'region')
+
+LEVEL_LABELS = {'commune': 'Commune', 'departement': 'Département', 'region': 'Région'}
+
+# Nombre maximal de points envoyés au navigateur pour une carte
+MAP_MAX_POINTS = 2000
+
+# Centroïdes approximatifs des régions métropolitaines
+REGION_CENTROIDS = {
+    'Île-de-France': (48.8566, 2.3522),
+    'Auvergne-Rhône-Alpes': (45.75, 4.85),
+    'Nouvelle-Aquitaine': (44.8378, -0.5792),
+    'Occitanie': (43.6, 1.4333),
+    'Hauts-de-France': (50.6292, 3.0573),
+    'Provence-Alpes-Côte d\'Azur': (43.3, 5.37),
+    'Pays de la Loire': (47.2181, -1.5528),
+    'Bretagne': (48.1173, -1.6778),
+    'Normandie': (49.18, -0.37),
+    'Grand Est': (48.5734, 7.7521),
+    'Bourgogne-Franche-Comté': (47.24, 6.02),
+    'Centre-Val de Loire': (47.9, 1.9),
+    'Corse': (42.15, 9.08),
+}
+
+
+def with_region_centroids(df):
+    """Ajoute les colonnes lat/lon des centroïdes régionaux à un tableau par région"""
+    lat = {region: coords[0] for region, coords in REGION_CENTROIDS.items()}
+    lon = {region: coords[1] for region, coords in REGION_CENTROIDS.items()}
+    return df.assign(lat=df['region'].map(lat), lon=df['region'].map(lon))
+
+
+def grouped_means(codes, count, values, weights):
+    """Moyennes pondérées par groupe ; les valeurs manquantes sont exclues des sommes comme des poids"""
+    present = ~np.isnan(values)
+    weights = np.where(present, weights, 0.0)
+    totals = np.bincount(codes, weights=weights * np.where(present, values, 0.0), minlength=count)
+    denominators = np.bincount(codes, weights=weights, minlength=count)
+    # Groupe sans aucune valeur : NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return totals / denominators
+
+
+class RegionalEngine:
+    """Indicateurs territoriaux agrégés par niveau, avec tris et rangs précalculés"""
+
+    def __init__(self, df, indicators, weight='population'):
+        self.levels = [level for level in LEVELS if level in df.columns]
+        if not self.levels:
+            raise ValueError("Aucune colonne de niveau géographique (commune, departement, region)")
+        self.indicators = list(indicators)
+
+        size = len(df)
+        self._weights = (df[weight].to_numpy(np.float64) if weight in df.columns
+                         else np.ones(size))
+        # Valeurs par territoire en float32 (les sommes pondérées sont calculées en float64)
+        self._values = {column: df[column].to_numpy(np.float32) for column in self.indicators}
+        self._coords = None
+        if 'lat' in df.columns and 'lon' in df.columns:
+            self._coords = (df['lat'].to_numpy(np.float32), df['lon'].to_numpy(np.float32))
+
+        self._codes = {}
+        self._categories = {}
+        for level in self.levels:
+            categorical = pd.Categorical(df[level])
+            self._codes[level] = categorical.codes.astype(np.int32)
+            self._categories[level] = categorical.categories
+
+        self.tables = {level: self._aggregate(level) for level in self.levels}
+        self._orders = {}
+        for level, table in self.tables.items():
+            for column in self.indicators:
+                values = table[column].to_numpy()
+                # Les valeurs manquantes sont placées en tête (rang le plus faible)
+                self._orders[(level, column)] = np.argsort(np.nan_to_num(values, nan=-np.inf), kind='stable')
+
+    def _weighted_means(self, codes, count):
+        """Moyennes pondérées de chaque indicateur par groupe (valeurs manquantes ignorées)"""
+        return {column: grouped_means(codes, count, values, self._weights) for column, values in self._values.items()}
+
+    def _aggregate(self, level):
+        codes = self._codes[level]
+        categories = self._categories[level]
+        count = len(categories)
+
+        table = {level: pd.Categorical.from_codes(np.arange(count), categories)}
+        # Niveaux parents : un territoire appartient à un seul parent
+        for parent in self.levels[self.levels.index(level) + 1:]:
+            parent_codes = np.full(count, -1, dtype=np.int32)
+            parent_codes[codes] = self._codes[parent]
+            table[parent] = pd.Categorical.from_codes(parent_codes, self._categories[parent])
+
+        table['population'] = np.bincount(codes, weights=self._weights, minlength=count)
+        table.update(self._weighted_means(codes, count))
+        if self._coords is not None:
+            lat, lon = self._coords
+            table['lat'] = np.bincount(codes, weights=lat * self._weights, minlength=count) / table['population']
+            table['lon'] = np.bincount(codes, weights=lon * self._weights, minlength=count) / table['population']
+        return pd.DataFrame(table)
+
+    def ranked(self, level, indicator, ascending=True, limit=None):
+        """Tableau du niveau trié selon l'indicateur ; limit garde les plus élevés"""
+        order = self._orders[(level, indicator)]
+        if limit is not None and len(order) > limit:
+            order = order[-limit:]
+        if not ascending:
+            order = order[::-1]
+        return self.tables[level].iloc[order]
+
+    def map_points(self, level, max_points=MAP_MAX_POINTS):
+        """Points de carte du niveau, décimés par grille au-delà de max_points
+
+        Les territoires d'une même cellule de grille sont fusionnés en un point
+        (moyennes pondérées par la population) : la taille envoyée au navigateur reste bornée.
+        """
+        table = self.tables[level]
+        if 'lat' not in table.columns:
+            raise ValueError("Coordonnées lat/lon absentes pour ce niveau")
+        table = table.dropna(subset=['lat', 'lon'])
+        if len(table) <= max_points:
+            return table
+
+        lat = table['lat'].to_numpy()
+        lon = table['lon'].to_numpy()
+        side = max(1, int(np.sqrt(max_points)))
+        rows = np.minimum(((lat - lat.min()) / (np.ptp(lat) or 1.0) * side).astype(np.int64), side - 1)
+        cols = np.minimum(((lon - lon.min()) / (np.ptp(lon) or 1.0) * side).astype(np.int64), side - 1)
+        cells, cell_codes = np.unique(rows * side + cols, return_inverse=True)
+        count = len(cells)
+
+        weights = table['population'].to_numpy()
+        population = np.bincount(cell_codes, weights=weights, minlength=count)
+        points = {'population': population}
+        for column in ['lat', 'lon'] + self.indicators:
+            points[column] = grouped_means(cell_codes, count, table[column].to_numpy(), weights)
+        # Libellé : territoire le plus peuplé de la cellule
+        heaviest = np.lexsort((-weights, cell_codes))
+        first = np.r_[0, np.flatnonzero(np.diff(cell_codes[heaviest])) + 1]
+        labels = table[level].astype(str).to_numpy()[heaviest[first]]
+        points[level] = [f"{label} (+{size - 1})" if size > 1 else label
+                         for label, size in zip(labels, np.bincount(cell_codes, minlength=count))]
+        return pd.DataFrame(points)
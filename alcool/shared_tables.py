@@ -0,0 +1,139 @@
+"""Tables du dashboard partagées entre processus par fichiers Arrow IPC en mémoire mappée
+
+Le premier processus qui charge une version des données écrit les tables préparées
+(types compacts, taux d'enquête appliqués) dans un répertoire en mémoire partagée
+(/dev/shm par défaut) ; tous les processus, y compris celui qui les a écrites, les mappent
+ensuite sans copie. Les colonnes numériques restent dans les pages du fichier, communes
+à tous les processus : ajouter des processus serveur ne multiplie pas la mémoire des
+données. Les structures dérivées (moteur régional, cubes) restent propres à chaque processus.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows : pas de verrou, chaque processus peut publier la même version
+    fcntl = None
+
+# Répertoire par défaut : mémoire partagée si disponible
+SHARED_TABLES_DIR = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                                 'alcool-dashboard')
+
+# Versions conservées dans le répertoire (les plus récentes)
+SHARED_VERSIONS_KEPT = 2
+
+MANIFEST = 'manifest.json'
+
+
+def to_arrow(df):
+    """Table Arrow de df ; les NaN des colonnes flottantes restent des valeurs (lecture sans copie)"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df)
+    # Colonnes de données en tête, dans l'ordre de df (l'index éventuel est ajouté après)
+    for position in range(len(df.columns)):
+        values = df.iloc[:, position].to_numpy()
+        if values.dtype.kind == 'f' and table.column(position).null_count:
+            table = table.set_column(position, table.schema.field(position), pa.array(values))
+    return table
+
+
+class SharedTables:
+    """Versions des tables publiées dans un répertoire partagé, mappées par chaque processus"""
+
+    def __init__(self, directory=SHARED_TABLES_DIR, namespace='', keep=SHARED_VERSIONS_KEPT):
+        self.directory = directory
+        self.namespace = namespace
+        self.keep = keep
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{self.namespace}-{key}" if self.namespace else key)
+
+    def load(self, key, build):
+        """Tables et métadonnées de la version key : mappées si publiées, sinon build() puis publiées
+
+        build retourne (tables, metadonnees) ; un verrou de fichier garantit qu'un seul
+        processus construit une version donnée, les autres attendant sa publication.
+        """
+        shared = self.attach(key)
+        if shared is not None:
+            return shared
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(key) + '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                shared = self.attach(key)
+                if shared is None:
+                    self.publish(key, *build())
+                    shared = self.attach(key)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+        return shared
+
+    def attach(self, key):
+        """Tables mappées sans copie et métadonnées d'une version publiée, ou None"""
+        import pyarrow as pa
+
+        path = self.path(key)
+        try:
+            with open(os.path.join(path, MANIFEST), encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        tables = {}
+        for name in manifest['tables']:
+            source = pa.memory_map(os.path.join(path, f"{name}.arrow"))
+            table = pa.ipc.open_file(source).read_all()
+            tables[name] = table.to_pandas(split_blocks=True)
+        return tables, manifest['metadata']
+
+    def publish(self, key, tables, metadata=None):
+        """Écrit une version (répertoire temporaire renommé d'un bloc) et supprime les plus anciennes"""
+        import pyarrow as pa
+
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        for name, df in tables.items():
+            table = to_arrow(df)
+            with pa.OSFile(os.path.join(tmp_path, f"{name}.arrow"), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        # Manifeste écrit en dernier : une version sans manifeste n'est jamais lue
+        with open(os.path.join(tmp_path, MANIFEST), 'w', encoding='utf-8') as handle:
+            json.dump({'tables': list(tables), 'metadata': metadata or {}}, handle, default=json_default)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Version publiée entre-temps par un autre processus
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.prune(path)
+
+    def prune(self, current):
+        """Supprime les versions au-delà des keep plus récentes (les processus qui les mappent gardent leurs pages)"""
+        prefix = f"{self.namespace}-" if self.namespace else ''
+        versions = []
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            if entry.startswith(prefix) and os.path.isdir(path) and not entry.endswith('.tmp'):
+                versions.append((os.stat(path).st_mtime_ns, path))
+        for _, path in sorted(versions, reverse=True)[self.keep:]:
+            if path != current:
+                shutil.rmtree(path, ignore_errors=True)
+                try:
+                    os.remove(path + '.lock')
+                except OSError:
+                    pass
+
+
+def json_default(value):
+    """Sérialise les scalaires NumPy des métadonnées"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} non sérialisable")
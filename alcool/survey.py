@@ -0,0 +1,210 @@
+"""Estimations pondérées à partir des micro-données d'enquête (une ligne par répondant)
+
+Le fichier est lu par blocs de lignes : chaque bloc est agrégé par groupe (année, région,
+sexe, tranche d'âge, CSP) en sommes pondérées Σw, Σw·x, Σw·x², Σw², puis ajouté aux
+totaux courants. La mémoire utilisée dépend du nombre de groupes et non du nombre de
+répondants, et un seul passage suffit. Les sommes étant additives, toute ventilation
+plus grossière (par CSP, par âge, par année...) s'en déduit sans relire le fichier.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from alcool.cube import SumCube
+from alcool.data_sources import BuiltinSource
+
+# Jeu de données lu par blocs (fichier data/survey_microdata.csv ou .parquet)
+SURVEY_DATASET = 'survey_microdata'
+
+# Lignes lues par bloc
+SURVEY_CHUNK_ROWS = 250_000
+
+# Variables de ventilation, de la plus grossière à la plus fine
+SURVEY_GROUPS = ['annee', 'region', 'sexe', 'tranche_age', 'csp']
+
+# Variables estimées (moyennes pondérées ; les indicatrices 0/1 donnent des proportions)
+SURVEY_MEASURES = ['consommation_alcool', 'buveur_quotidien', 'binge_drinking', 'age_premiere_ivresse']
+
+# Taux des tables du dashboard (en %) et indicatrices d'enquête correspondantes
+SURVEY_RATES = {'buveurs_quotidiens': 'buveur_quotidien', 'binge_drinking': 'binge_drinking'}
+
+# Quantile de la loi normale pour les intervalles de confiance à 95 %
+Z_95 = 1.959964
+
+
+# Libellés des variables estimées ; les proportions sont affichées en %
+SURVEY_LABELS = {
+    'consommation_alcool': "Consommation (L/pers/an)",
+    'buveur_quotidien': "Buveurs quotidiens (%)",
+    'binge_drinking': "Binge drinking (%)",
+    'age_premiere_ivresse': "Âge de 1ère ivresse (ans)",
+}
+
+SURVEY_PROPORTIONS = {'buveur_quotidien', 'binge_drinking'}
+
+
+class SurveyEstimates:
+    """Sommes pondérées par groupe, accumulées bloc par bloc puis rangées dans un cube"""
+
+    def __init__(self, groups=SURVEY_GROUPS, measures=SURVEY_MEASURES, weight='poids'):
+        self.groups = list(groups)
+        self.measures = list(measures)
+        self.weight = weight
+        self.respondents = 0
+        self.observed = False
+        self.sums = None
+        self.cube = None
+
+    def add(self, chunk):
+        """Ajoute un bloc de répondants aux sommes courantes"""
+        if chunk.empty:
+            return
+        weights = chunk[self.weight].to_numpy(np.float64)
+        weights = np.where(np.isnan(weights), 0.0, weights)
+        parts = {('repondants', ''): np.ones(len(chunk)), ('poids', ''): weights}
+        for measure in self.measures:
+            if measure not in chunk.columns:
+                continue
+            values = chunk[measure].to_numpy(np.float64)
+            valid = ~np.isnan(values)
+            w = np.where(valid, weights, 0.0)
+            x = np.where(valid, values, 0.0)
+            parts[(measure, 'w')] = w
+            parts[(measure, 'wx')] = w * x
+            parts[(measure, 'wxx')] = w * x * x
+            parts[(measure, 'ww')] = w * w
+            parts[(measure, 'n')] = valid.astype(np.float64)
+
+        # Clés en valeurs simples : les catégories peuvent différer d'un bloc à l'autre
+        keys = [chunk[group].to_numpy(np.int64) if group == 'annee' else chunk[group].astype(str).to_numpy()
+                for group in self.groups]
+        sums = pd.DataFrame(parts).groupby(keys, sort=False).sum()
+        sums.index.names = self.groups
+        self.sums = sums if self.sums is None else self.sums.add(sums, fill_value=0.0)
+        self.respondents += len(chunk)
+        self.cube = None
+
+    @classmethod
+    def restore(cls, sums, respondents, observed):
+        """Estimations reconstruites à partir de sommes déjà agrégées (tables partagées)"""
+        measures = [measure for measure, term in sums.columns if term == 'w']
+        survey = cls(groups=sums.index.names, measures=measures)
+        survey.sums = sums
+        survey.respondents = respondents
+        survey.observed = observed
+        return survey.finish()
+
+    def metadata(self):
+        """Attributs nécessaires à restore, en plus des sommes"""
+        return {'respondents': int(self.respondents), 'observed': bool(self.observed)}
+
+    def finish(self):
+        """Range les sommes dans un cube dont tous les agrégats sont précalculés (après le dernier bloc)"""
+        self.cube = SumCube(self.sums)
+        return self
+
+    def rollup(self, by=(), filters=None):
+        """Sommes ventilées selon les variables by (total général si by est vide), restreintes à filters"""
+        if self.cube is None:
+            self.finish()
+        return self.cube.query(by, filters)
+
+    def estimates(self, by=(), filters=None):
+        """Moyennes pondérées, erreurs types et intervalles de confiance à 95 % par groupe non vide
+
+        L'erreur type utilise la taille d'échantillon effective de Kish (Σw)² / Σw², sans
+        effet de plan de sondage (strates, grappes).
+        """
+        sums = self.rollup(by, filters)
+        values = sums.to_numpy()
+        column = {term: position for position, term in enumerate(sums.columns)}
+        rows = values[:, column[('repondants', '')]] > 0
+        values = values[rows]
+
+        table = {'repondants': values[:, column[('repondants', '')]].astype(np.int64),
+                 'poids': values[:, column[('poids', '')]]}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for measure in self.measures:
+                if (measure, 'w') not in column:
+                    continue
+                total, wx, wxx, ww = (values[:, column[(measure, term)]] for term in ('w', 'wx', 'wxx', 'ww'))
+                total = np.where(total > 0, total, np.nan)
+                mean = wx / total
+                variance = np.clip(wxx / total - mean ** 2, 0, None)
+                error = np.sqrt(variance / (total ** 2 / ww))
+                table[measure] = mean
+                table[f'{measure}_se'] = error
+                table[f'{measure}_ic_bas'] = mean - Z_95 * error
+                table[f'{measure}_ic_haut'] = mean + Z_95 * error
+        table = pd.DataFrame(table, index=sums.index[rows])
+        return table.reset_index(drop=not by)
+
+
+def survey_from_chunks(chunks):
+    """Estimations agrégées bloc par bloc, ou None sans aucun répondant"""
+    survey = SurveyEstimates()
+    for chunk in chunks:
+        survey.add(chunk)
+    if survey.sums is None:
+        return None
+    return survey.finish()
+
+
+@lru_cache(maxsize=4)
+def simulated_survey(builder, chunksize=SURVEY_CHUNK_ROWS):
+    """Estimations de l'échantillon simulé intégré, générées et agrégées une seule fois par processus
+
+    Le constructeur est déterministe (graine fixe) : les reconstructions du modèle réutilisent
+    le même objet, partagé en lecture seule.
+    """
+    return survey_from_chunks(BuiltinSource({SURVEY_DATASET: builder}).load_chunks(SURVEY_DATASET, chunksize))
+
+
+def load_survey(sources, chunksize=SURVEY_CHUNK_ROWS):
+    """Estimations à partir de la première source qui fournit les micro-données, ou None
+
+    Les données intégrées sont un échantillon simulé (observed False) : elles ne remplacent
+    pas les taux publiés.
+    """
+    for source in sources:
+        if isinstance(source, BuiltinSource):
+            if SURVEY_DATASET in source.builders:
+                return simulated_survey(source.builders[SURVEY_DATASET], chunksize)
+            continue
+        chunks = source.load_chunks(SURVEY_DATASET, chunksize)
+        if chunks is None:
+            continue
+        survey = survey_from_chunks(chunks)
+        if survey is not None:
+            survey.observed = True
+        return survey
+    return None
+
+
+def with_survey_rates(df, survey, keys, year=None):
+    """Remplace les taux (%) de df par les estimations de l'enquête pour les clés qu'elle couvre
+
+    Avec year, seules les réponses de cette année sont utilisées (tables sans colonne annee).
+    """
+    if survey is None or not survey.observed or not all(key in survey.groups for key in keys):
+        return df
+    if year is None:
+        estimates = survey.estimates(keys)
+    else:
+        estimates = survey.estimates(['annee'] + keys)
+        estimates = estimates[estimates['annee'] == year]
+    # Rapprochement sur les valeurs des clés (catégories et chaînes confondues)
+    index = pd.MultiIndex.from_frame(estimates[keys].astype(str))
+    positions = index.get_indexer(pd.MultiIndex.from_frame(df[keys].astype(str)))
+    covered = positions >= 0
+
+    columns = {}
+    for column, measure in SURVEY_RATES.items():
+        if column not in df.columns or measure not in estimates.columns:
+            continue
+        rates = np.full(len(df), np.nan)
+        rates[covered] = estimates[measure].to_numpy(np.float64)[positions[covered]] * 100
+        values = np.where(np.isnan(rates), df[column].to_numpy(np.float64), rates)
+        columns[column] = values.astype(df[column].dtype)
+    return df.assign(**columns) if columns else df
@@ -0,0 +1,327 @@
+"""Mesures de performance du dashboard
+
+Démarrage à froid (processus neuf), relance à chaud, coût de chaque section de
+navigation, coût de construction et taille JSON de chaque figure (complète et
+allégée pour le navigateur), débit de l'API locale, mémoire maximale.
+Les résultats sont écrits en JSON et peuvent être comparés à une référence :
+
+    python benchmark.py --output bench_results.json
+    python benchmark.py --baseline bench_baseline.json
+
+Le code de retour vaut 1 si une mesure régresse au-delà de la tolérance.
+``--check-startup`` vérifie seulement le budget du chemin de démarrage (intégration continue).
+"""
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+DASHBOARD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Dashboard.py')
+
+# Sections de navigation et méthodes de rendu correspondantes
+SECTIONS = {
+    "📈 Historique": 'create_historical_analysis',
+    "🏛️ Politiques": 'create_policy_analysis',
+    "🗺️ Régional": 'create_regional_analysis',
+    "🌍 International": 'create_international_comparison',
+    "🎯 Stratégies": 'create_strategic_recommendations',
+    "💡 Synthèse": 'create_synthesis',
+}
+
+# Délai maximal d'un rendu AppTest (secondes)
+APP_TIMEOUT = 300
+
+# Écart relatif toléré avant de signaler une régression
+DEFAULT_TOLERANCE = 0.25
+
+# En dessous de ces écarts absolus, une variation relève du bruit de mesure
+NOISE_FLOOR = {'_s': 0.005, '_bytes': 1024, '.bytes': 1024}
+
+# Budget du chemin de démarrage : import de Dashboard et préparation des données,
+# streamlit déjà importé (chargé par le serveur avant la première session)
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Modules lourds chargés seulement à l'affichage de la section qui les utilise
+DEFERRED_MODULES = ('plotly.express', 'alcool.export', 'openpyxl', 'kaleido')
+
+def peak_rss_bytes():
+    """Mémoire résidente maximale du processus courant"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kio sous Linux, octets sous macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def timed(function, repeat):
+    """Durée médiane (secondes) de repeat appels à function"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def probe_cold_start():
+    """Premier rendu complet dans le processus courant (appelé dans un sous-processus neuf)"""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(DASHBOARD, default_timeout=APP_TIMEOUT)
+    app.run()
+    elapsed = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+    return {'cold_start_s': elapsed, 'peak_rss_bytes': peak_rss_bytes()}
+
+def probe_startup():
+    """Chemin de démarrage d'une session, avant le rendu de la première section"""
+    import streamlit  # noqa: F401  (importé par le serveur, hors budget)
+    start = time.perf_counter()
+    from alcool.model import DashboardModel, build_dashboard_data
+    from Dashboard import get_data_sources
+    DashboardModel(build_dashboard_data(get_data_sources()))
+    elapsed = time.perf_counter() - start
+
+    return {'startup_s': elapsed, 'eager_modules': [name for name in DEFERRED_MODULES if name in sys.modules]}
+
+def measure_startup(repeat):
+    """Chemin de démarrage médian, chaque mesure dans un interpréteur neuf"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--probe-startup'],
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    eager_modules = sorted({name for run in runs for name in run['eager_modules']})
+    return statistics.median(run['startup_s'] for run in runs), eager_modules
+
+def check_startup(startup, eager_modules, budget):
+    """Messages d'erreur si le démarrage dépasse le budget ou charge des modules différés"""
+    errors = []
+    if startup > budget:
+        errors.append(f"démarrage {startup * 1000:.0f} ms > budget {budget * 1000:.0f} ms")
+    if eager_modules:
+        errors.append(f"modules chargés au démarrage au lieu de l'affichage : {', '.join(eager_modules)}")
+    return errors
+
+def measure_cold_start(repeat):
+    """Démarrage à froid médian, chaque mesure dans un interpréteur neuf"""
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--probe-cold'],
+                                capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        'cold_start_s': statistics.median(run['cold_start_s'] for run in runs),
+        'peak_rss_bytes': max(run['peak_rss_bytes'] for run in runs),
+    }
+
+def measure_reruns(repeat):
+    """Relance à chaud de la page, puis de chaque section de navigation"""
+    from streamlit.testing.v1 import AppTest
+    app = AppTest.from_file(DASHBOARD, default_timeout=APP_TIMEOUT)
+    app.run()
+    metrics = {'warm_rerun_s': timed(app.run, repeat)}
+
+    for label, method in SECTIONS.items():
+        # Premier affichage de la section (figures hors cache), puis relances à chaud
+        start = time.perf_counter()
+        app.radio(key='navigation').set_value(label).run()
+        metrics[f'section.{method}.first_s'] = time.perf_counter() - start
+        metrics[f'section.{method}.warm_s'] = timed(app.run, repeat)
+        if app.exception:
+            raise RuntimeError(f"{label} : {app.exception[0].message}")
+    return metrics
+
+def measure_figures(repeat):
+    """Coût de construction (hors cache) et taille JSON de chaque figure du catalogue"""
+    from alcool.model import DashboardModel, build_dashboard_data
+    from alcool.payload import compact_figure, payload_bytes
+    from Dashboard import get_data_sources
+
+    metrics = {}
+    start = time.perf_counter()
+    data = build_dashboard_data(get_data_sources())
+    metrics['data_load_s'] = time.perf_counter() - start
+
+    model = DashboardModel(data)
+    for row in model.memory_report().itertuples():
+        metrics[f'memory.{row.table}.bytes'] = row.octets
+    # Résultats dérivés (régressions, projections) mesurés à part des figures
+    metrics['derived.policy_impacts_s'] = timed(model.policy_impacts, 1)
+    metrics['derived.forecast_s'] = timed(model.forecast, 1)
+    metrics['derived.scenario_grid_s'] = timed(model.scenario_grid, 1)
+
+    total_bytes = total_payload = 0
+    for _, chart_id, builder, _ in model.figure_catalog():
+        metrics[f'figure.{chart_id}.build_s'] = timed(builder, repeat)
+        figure = builder()
+        size = len(figure.to_json().encode('utf-8'))
+        metrics[f'figure.{chart_id}.json_bytes'] = size
+        total_bytes += size
+        # Charge réellement envoyée au navigateur (figure allégée)
+        compact = compact_figure(figure)
+        metrics[f'figure.{chart_id}.compact_s'] = timed(lambda: compact_figure(figure), repeat)
+        metrics[f'figure.{chart_id}.payload_bytes'] = payload_bytes(compact)
+        total_payload += metrics[f'figure.{chart_id}.payload_bytes']
+    metrics['figure.total.json_bytes'] = total_bytes
+    metrics['figure.total.payload_bytes'] = total_payload
+    return metrics
+
+# Charge de l'API : connexions keep-alive simultanées × requêtes par connexion
+API_CONNECTIONS = 16
+API_REQUESTS = 500
+
+# Ressources de l'API mesurées
+API_PATHS = {
+    'historical_data': '/datasets/historical_data',
+    'key_metrics': '/aggregates/key_metrics/historical_data',
+    'regional_metrics': '/aggregates/regional_metrics',
+}
+
+async def api_client(port, path, requests):
+    """Requêtes successives sur une connexion ; retourne la taille du dernier corps reçu"""
+    import asyncio
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    request = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept-Encoding: gzip\r\n\r\n".encode('ascii')
+    size = 0
+    for _ in range(requests):
+        writer.write(request)
+        head = await reader.readuntil(b'\r\n\r\n')
+        size = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+        await reader.readexactly(size)
+    writer.close()
+    return size
+
+async def api_batch(port, path):
+    """API_CONNECTIONS connexions simultanées de API_REQUESTS requêtes chacune"""
+    import asyncio
+    sizes = await asyncio.gather(*(api_client(port, path, API_REQUESTS) for _ in range(API_CONNECTIONS)))
+    return sizes[0]
+
+def measure_api(repeat):
+    """Durée d'un lot de requêtes sur l'API locale (serveur dans un processus séparé) et taille gzip des réponses"""
+    import asyncio
+    import socket
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([sys.executable, '-m', 'alcool.api', '--port', str(port)],
+                              cwd=os.path.dirname(DASHBOARD), stdout=subprocess.DEVNULL)
+    try:
+        # Le port n'est ouvert qu'une fois les réponses préparées
+        deadline = time.monotonic() + APP_TIMEOUT
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("L'API n'a pas démarré")
+                time.sleep(0.1)
+        metrics = {}
+        for name, path in API_PATHS.items():
+            metrics[f'api.{name}.gzip_bytes'] = asyncio.run(api_batch(port, path))
+            metrics[f'api.{name}.batch_s'] = timed(lambda: asyncio.run(api_batch(port, path)), repeat)
+        return metrics
+    finally:
+        server.terminate()
+        server.wait()
+
+def compare(metrics, baseline, tolerance):
+    """Liste des mesures en régression par rapport à la référence : (nom, référence, valeur)"""
+    regressions = []
+    for name, value in sorted(metrics.items()):
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        floor = next((amount for suffix, amount in NOISE_FLOOR.items() if name.endswith(suffix)), 0)
+        if value > reference * (1 + tolerance) and value - reference > floor:
+            regressions.append((name, reference, value))
+    return regressions
+
+def format_value(name, value):
+    """Affichage lisible d'une mesure selon son unité"""
+    if name.endswith('_s'):
+        return f"{value * 1000:.1f} ms"
+    return f"{value / 1024:.1f} Kio"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mesures de performance du dashboard")
+    parser.add_argument('--output', default='bench_results.json', help="fichier de résultats JSON")
+    parser.add_argument('--baseline', help="résultats de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="écart relatif toléré (0.25 = +25 %%)")
+    parser.add_argument('--repeat', type=int, default=5, help="répétitions par mesure (médiane)")
+    parser.add_argument('--cold-runs', type=int, default=3, help="démarrages à froid mesurés")
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="budget du chemin de démarrage (secondes)")
+    parser.add_argument('--check-startup', action='store_true',
+                        help="vérifie seulement le budget de démarrage (code de retour 1 si dépassé)")
+    parser.add_argument('--probe-cold', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--probe-startup', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe_cold:
+        print(json.dumps(probe_cold_start()))
+        return 0
+    if args.probe_startup:
+        print(json.dumps(probe_startup()))
+        return 0
+
+    startup, eager_modules = measure_startup(args.cold_runs)
+    startup_errors = check_startup(startup, eager_modules, args.startup_budget)
+    if args.check_startup:
+        for error in startup_errors:
+            print(f"ÉCHEC {error}")
+        if not startup_errors:
+            print(f"Démarrage {startup * 1000:.0f} ms (budget {args.startup_budget * 1000:.0f} ms)")
+        return 1 if startup_errors else 0
+
+    metrics = {'startup_s': startup}
+    metrics.update(measure_cold_start(args.cold_runs))
+    metrics.update(measure_reruns(args.repeat))
+    metrics.update(measure_figures(args.repeat))
+    metrics.update(measure_api(args.repeat))
+
+    import pandas, plotly, streamlit
+    results = {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'streamlit': streamlit.__version__,
+            'plotly': plotly.__version__,
+            'pandas': pandas.__version__,
+            'repeat': args.repeat,
+        },
+        'metrics': metrics,
+    }
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(results, handle, indent=2)
+
+    for name, value in metrics.items():
+        print(f"{name:60s} {format_value(name, value):>12s}")
+    print(f"Résultats écrits dans {args.output}")
+
+    status = 0
+    for error in startup_errors:
+        print(f"ÉCHEC {error}")
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            baseline = json.load(handle)['metrics']
+        regressions = compare(metrics, baseline, args.tolerance)
+        for name, reference, value in regressions:
+            print(f"RÉGRESSION {name} : {format_value(name, reference)} -> {format_value(name, value)}")
+        if regressions:
+            return 1
+        print(f"Aucune régression par rapport à {args.baseline} (tolérance {args.tolerance:.0%})")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Racine du dépôt dans le chemin d'import (modules alcool, Dashboard, benchmark)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
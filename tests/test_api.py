@@ -0,0 +1,93 @@
+"""Réponses de l'API : ETag, requêtes conditionnelles, négociation du format et de l'encodage"""
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from alcool import api
+from alcool.builtin_data import BUILTIN_DATASETS
+from alcool.data_sources import BuiltinSource
+
+
+@pytest.fixture(scope='module')
+def server():
+    server = api.ApiServer([BuiltinSource(BUILTIN_DATASETS)])
+    server.snapshot = server.load()
+    return server
+
+
+def header(extra, name):
+    return dict(extra)[name].decode('ascii')
+
+
+def test_etag_includes_data_version(server, monkeypatch):
+    _, extra, _ = server.respond('GET', '/datasets/historical_data', {})
+    etag = header(extra, b'ETag')
+    assert api.DATA_VERSION in etag
+
+    # Jeux intégrés seulement : l'empreinte est constante, seule DATA_VERSION change
+    monkeypatch.setattr(api, 'DATA_VERSION', 'suivante')
+    assert server.version() != server.snapshot.version
+
+
+def test_if_none_match(server):
+    _, extra, _ = server.respond('GET', '/datasets/historical_data', {'accept-encoding': 'gzip'})
+    status, _, body = server.respond('GET', '/datasets/historical_data', {'if-none-match': header(extra, b'ETag')})
+    assert (status, body) == (304, b'')
+    status, _, _ = server.respond('GET', '/datasets/historical_data', {'if-none-match': '"autre"'})
+    assert status == 200
+
+
+def test_gzip_body(server):
+    status, extra, body = server.respond('GET', '/datasets/regional_panel', {'accept-encoding': 'gzip'})
+    assert status == 200 and header(extra, b'Content-Encoding') == 'gzip'
+    assert len(json.loads(gzip.decompress(body))) == 182
+
+
+def test_errors(server):
+    assert server.respond('POST', '/', {})[0] == 405
+    assert server.respond('GET', '/inconnue', {})[0] == 404
+    assert server.respond('GET', '/datasets/historical_data?format=xml', {})[0] == 406
+
+
+@pytest.mark.parametrize('path, column', [
+    ('/aggregates/key_metrics/historical_data', 'valeur'),
+    ('/aggregates/key_metrics/historical_data', 'variation'),
+    ('/aggregates/territories/region', 'consommation_2023'),
+    ('/aggregates/regional_metrics', 'precedent'),
+    ('/datasets/historical_data', 'buveurs_quotidiens'),
+])
+def test_json_floats_without_float32_noise(server, path, column):
+    _, _, body = server.respond('GET', path, {})
+    for row in json.loads(body):
+        value = row[column]
+        if value is not None:
+            # Écriture décimale courte : au plus 7 chiffres significatifs
+            assert len(repr(value).replace('-', '').replace('.', '').strip('0')) <= 7, value
+
+
+def test_watch_survives_reload_errors(monkeypatch):
+    server = api.ApiServer([BuiltinSource(BUILTIN_DATASETS)], poll=0.01)
+    versions = iter(['v1', 'v2', 'v3'])
+    loads = []
+
+    def load():
+        loads.append(None)
+        if len(loads) == 1:
+            raise RuntimeError("fichier invalide")
+        return 'snapshot'
+
+    monkeypatch.setattr(server, 'version', lambda: next(versions, 'v3'))
+    monkeypatch.setattr(server, 'load', load)
+
+    async def run():
+        watcher = asyncio.ensure_future(server.watch())
+        for _ in range(200):
+            await asyncio.sleep(0.01)
+            if server.snapshot is not None:
+                break
+        watcher.cancel()
+
+    asyncio.run(run())
+    assert server.snapshot == 'snapshot' and len(loads) >= 2
@@ -0,0 +1,42 @@
+"""Mode batch : arguments de la ligne de commande et génération des rapports sans serveur Streamlit"""
+import argparse
+import json
+
+import pytest
+
+from Dashboard import batch_main, period_argument
+
+
+def test_period_argument():
+    assert period_argument('2010-2023') == (2010, 2023)
+    assert period_argument('2015') == (2015, 2015)
+    for value in ('2023-2010', 'deux mille', '2010-', '2010-20x3'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            period_argument(value)
+
+
+def test_batch_main_writes_reports(tmp_path, capsys):
+    out = tmp_path / 'rapports'
+
+    assert batch_main(['--out', str(out), '--periode', '2015-2020', '--focus', 'Consommation',
+                       '--format', 'json', '--format', 'html', '--workers', '1']) == 0
+
+    manifest = json.loads((out / 'manifest.json').read_text(encoding='utf-8'))
+    assert len(manifest) == 1 and manifest[0]['periode'] == [2015, 2020]
+    charts = manifest[0]['graphiques']
+    assert charts and {chart['section'] for chart in charts}
+    for chart in charts:
+        figure = json.loads((out / manifest[0]['slug'] / f"{chart['graphique']}.json").read_text(encoding='utf-8'))
+        assert figure['data']
+        assert (out / manifest[0]['slug'] / f"{chart['graphique']}.html").exists()
+    assert 'Consommation' in (out / 'index.html').read_text(encoding='utf-8')
+    assert '1 combinaisons' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('argv', [['--focus', 'Consommation,Inconnu'], ['--niveau', 'commune']])
+def test_batch_main_rejects_unavailable_choices(tmp_path, argv):
+    with pytest.raises(SystemExit) as error:
+        batch_main(['--out', str(tmp_path / 'rapports')] + argv)
+
+    assert error.value.code == 2
+    assert not (tmp_path / 'rapports').exists()
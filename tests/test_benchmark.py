@@ -0,0 +1,15 @@
+"""Comparaison des mesures à la référence : tolérance relative et seuils de bruit"""
+import pytest
+
+from benchmark import compare
+
+
+@pytest.mark.parametrize('name', ['memory.historical_data.bytes', 'figure.total.payload_bytes'])
+def test_small_byte_changes_are_noise(name):
+    assert compare({name: 1500}, {name: 1000}, 0.1) == []
+    assert compare({name: 5000}, {name: 1000}, 0.1) == [(name, 1000, 5000)]
+
+
+def test_small_time_changes_are_noise():
+    assert compare({'data_load_s': 0.004}, {'data_load_s': 0.001}, 0.1) == []
+    assert compare({'data_load_s': 0.5}, {'data_load_s': 0.1}, 0.1) == [('data_load_s', 0.1, 0.5)]
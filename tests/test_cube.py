@@ -0,0 +1,103 @@
+"""Cubes : panel entité × année comparé à pandas, sommes agrégées comparées à un groupby"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.cube import PanelCube, SumCube
+
+PANEL = pd.DataFrame({
+    'region': ['Bretagne'] * 4 + ['Corse'] * 3 + ['Normandie'] * 4,
+    'annee': [2020, 2021, 2022, 2023, 2020, 2022, 2023, 2020, 2021, 2022, 2023],
+    'consommation_alcool': [11.0, 10.5, 10.25, 10.0, 9.0, 9.5, 9.25, 12.0, 11.0, 10.75, np.nan],
+    'binge_drinking': [20.0, 19.0, 19.5, 18.0, 15.0, 16.0, 15.5, 21.0, 20.5, 20.0, 19.0],
+})
+
+INDICATORS = ['consommation_alcool', 'binge_drinking']
+
+
+@pytest.fixture
+def panel():
+    return PanelCube(PANEL, 'region', INDICATORS)
+
+
+def pivot(indicator):
+    return PANEL.pivot(index='region', columns='annee', values=indicator).reindex(columns=range(2020, 2024))
+
+
+def test_cross_sections_match_pivot(panel):
+    for indicator in INDICATORS:
+        expected = pivot(indicator)
+        for year in range(2020, 2024):
+            np.testing.assert_allclose(panel.cross_section(year, indicator), expected[year].to_numpy(np.float32))
+            np.testing.assert_allclose(panel.cross_section(year, indicator, deltas=True),
+                                       expected.diff(axis=1)[year].to_numpy(np.float32))
+
+
+def test_ranked_matches_sorted_values(panel):
+    ranked = panel.ranked(2023, 'consommation_alcool')
+    expected = PANEL[PANEL['annee'] == 2023].dropna().sort_values('consommation_alcool')
+    assert ranked['region'].tolist() == expected['region'].tolist()
+    assert panel.ranked(2023, 'binge_drinking', limit=2)['region'].tolist() == ['Bretagne', 'Normandie']
+    # Corse : pas de valeur 2021, donc pas de variation 2022
+    assert panel.ranked(2022, 'binge_drinking', deltas=True)['region'].tolist() == ['Normandie', 'Bretagne']
+
+
+def test_frame_round_trips_the_panel(panel):
+    frame = panel.frame()
+    expected = PANEL.sort_values(['region', 'annee']).reset_index(drop=True)
+    assert frame['region'].astype(str).tolist() == expected['region'].tolist()
+    assert frame['annee'].tolist() == expected['annee'].tolist()
+    np.testing.assert_allclose(frame[INDICATORS].to_numpy(), expected[INDICATORS].to_numpy(np.float32))
+
+
+def test_years_outside_the_panel(panel):
+    assert panel.latest_year == 2023
+    with pytest.raises(KeyError):
+        panel.cross_section(2019, 'consommation_alcool')
+
+
+@pytest.fixture(scope='module')
+def sums():
+    rng = np.random.default_rng(3)
+    rows = pd.DataFrame({
+        'annee': rng.choice([2021, 2022, 2023], 500),
+        'region': rng.choice(['Bretagne', 'Corse', 'Normandie'], 500),
+        'sexe': rng.choice(['Femme', 'Homme'], 500),
+        'w': rng.random(500),
+        'wx': rng.random(500) * 10,
+    })
+    # Combinaisons absentes : le cube dense les compte à zéro
+    rows = rows[~((rows['region'] == 'Corse') & (rows['annee'] == 2021))]
+    return rows.groupby(['annee', 'region', 'sexe']).sum()
+
+
+@pytest.mark.parametrize('by', [[], ['sexe'], ['region', 'annee'], ['sexe', 'region', 'annee']])
+def test_sum_cube_matches_groupby(sums, by):
+    cube = SumCube(sums)
+
+    result = cube.query(by)
+
+    if not by:
+        np.testing.assert_allclose(result.to_numpy()[0], sums.sum().to_numpy())
+        return
+    expected = sums.groupby(level=by).sum()
+    assert result.index.names == by
+    np.testing.assert_allclose(result.loc[expected.index].to_numpy(), expected.to_numpy())
+    assert (result.drop(expected.index).to_numpy() == 0).all()
+
+
+def test_sum_cube_filters_match_groupby(sums):
+    cube = SumCube(sums)
+
+    result = cube.query(['region'], {'annee': [2022, 2023], 'sexe': ['Femme'], 'region': ['Corse', 'Bretagne']})
+
+    frame = sums.reset_index()
+    selected = frame[frame['annee'].isin([2022, 2023]) & (frame['sexe'] == 'Femme')
+                     & frame['region'].isin(['Corse', 'Bretagne'])]
+    expected = selected.groupby('region')[['w', 'wx']].sum()
+    # Modalités dans l'ordre du filtre
+    assert result.index.get_level_values('region').tolist() == ['Corse', 'Bretagne']
+    np.testing.assert_allclose(result.to_numpy(), expected.loc[['Corse', 'Bretagne']].to_numpy())
+    # Modalité inconnue ignorée, filtre None sans effet
+    np.testing.assert_allclose(cube.query(['sexe'], {'region': ['Occitanie', 'Corse'], 'annee': None}).to_numpy(),
+                               frame[frame['region'] == 'Corse'].groupby('sexe')[['w', 'wx']].sum().to_numpy())
@@ -0,0 +1,57 @@
+"""Sources fichiers : cache colonnaire en types compacts, lecture sans copie, empreinte des fichiers"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from alcool.data_sources import FileSource, compact_dtypes, memory_report
+
+
+def test_cache_holds_compact_dtypes(tmp_path):
+    pd.DataFrame({
+        'region': ['Bretagne', 'Corse', 'Bretagne'],
+        'annee': [2021, 2022, 2023],
+        'consommation_alcool': [10.5, 9.75, 9.5],
+        'buveurs_quotidiens': [8.0, None, 7.0],
+        'binge_drinking': [17.0, 18.0, 19.0],
+    }).to_csv(tmp_path / 'regional_panel.csv', index=False)
+    source = FileSource(str(tmp_path))
+    source.load('regional_panel')  # écriture du cache
+
+    df = source.load('regional_panel')
+    compact = compact_dtypes(df)
+
+    assert dict(df.dtypes.astype(str)) == {'region': 'category', 'annee': 'int16', 'consommation_alcool': 'float32',
+                                           'buveurs_quotidiens': 'float32', 'binge_drinking': 'float32'}
+    for column in ('annee', 'consommation_alcool', 'buveurs_quotidiens'):
+        assert np.shares_memory(df[column].to_numpy(), compact[column].to_numpy())
+    assert np.isnan(compact['buveurs_quotidiens'].iloc[1])
+
+
+def test_compact_dtypes_converts_default_types():
+    compact = compact_dtypes(pd.DataFrame({'annee': [2022, 2023], 'pays': ['France', 'Italie'],
+                                           'population': [1.0, None]}))
+    assert dict(compact.dtypes.astype(str)) == {'annee': 'int16', 'pays': 'category', 'population': 'float32'}
+
+
+def test_hash_contents_ignores_mtime(tmp_path):
+    path = tmp_path / 'historical_data.csv'
+    path.write_text('annee\n2023\n', encoding='utf-8')
+    by_stat, by_hash = FileSource(str(tmp_path)), FileSource(str(tmp_path), hash_contents=True)
+    before = by_stat.fingerprint('historical_data'), by_hash.fingerprint('historical_data')
+
+    os.utime(path, ns=(0, 0))
+
+    assert by_stat.fingerprint('historical_data') != before[0]
+    assert by_hash.fingerprint('historical_data') == before[1]
+
+
+def test_memory_report_measures_strings_deeply():
+    table = pd.DataFrame({'date': ['2020-01-01'] * 50, 'titre': ['Loi Evin, publicité'] * 50,
+                          'type': ['Loi'] * 25 + ['Fiscalité'] * 25})
+
+    report = memory_report({'politiques': table, 'compacte': compact_dtypes(table)}).set_index('table')
+
+    strings = table.astype(object).memory_usage(deep=True, index=False).sum()
+    assert (report['octets_types_par_defaut'] == strings).all()
+    assert report.loc['compacte', 'gain'] > 0
@@ -0,0 +1,40 @@
+"""Export en arrière-plan : figures construites par le job, rétention des archives"""
+import os
+import time
+import zipfile
+
+import plotly.graph_objects as go
+
+from alcool import export
+
+
+def test_prune_exports_keeps_recent_archives(tmp_path):
+    now = time.time()
+    for index in range(5):
+        path = tmp_path / f"analyse_alcool_{index}.zip"
+        path.touch()
+        os.utime(path, (now - index, now - index))
+    expired = tmp_path / 'analyse_alcool_ancienne.zip'
+    expired.touch()
+    os.utime(expired, (now - 7200, now - 7200))
+    (tmp_path / 'autre.zip').touch()
+
+    export.prune_exports(tmp_path, keep=3, max_age=3600)
+
+    assert sorted(os.listdir(tmp_path)) == ['analyse_alcool_0.zip', 'analyse_alcool_1.zip',
+                                            'analyse_alcool_2.zip', 'autre.zip']
+
+
+def test_run_export_builds_figures_in_job(tmp_path):
+    built = []
+
+    def build():
+        built.append(None)
+        return go.Figure(go.Scatter(x=[1, 2], y=[3, 4]), layout={'title': {'text': 'Essai'}})
+
+    job = export.ExportJob(total_steps=5)
+    export.run_export(job, [("Section", 'essai', build)], lambda: {}, str(tmp_path), max_workers=1)
+
+    assert job.error is None and job.progress == 1.0 and len(built) == 1
+    with zipfile.ZipFile(job.path) as archive:
+        assert 'Essai' in archive.read('rapport.html').decode('utf-8')
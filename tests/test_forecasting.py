@@ -0,0 +1,78 @@
+"""Holt à tendance amortie : ajustement vectorisé comparé à la récurrence scalaire, prévisions et intervalles"""
+import numpy as np
+import pytest
+
+from alcool.forecasting import ScenarioGrid, fit_damped_trend, forecast_damped_trend, forecast_table
+
+SERIES = np.array([12.4, 12.1, 11.9, 11.5, 11.3, 11.0, 10.6, 10.5, 10.1, 9.9, 9.6, 9.5, 9.1, 8.9, 8.8, 8.5])
+
+
+def holt_sse(values, alpha, beta, phi):
+    """Récurrence ETS(A,Ad,N) écrite pas à pas"""
+    level, trend, sse = values[0], values[1] - values[0], 0.0
+    for value in values[1:]:
+        forecast = level + phi * trend
+        error = value - forecast
+        sse += error ** 2
+        level = forecast + alpha * error
+        trend = phi * trend + alpha * beta * error
+    return sse, level, trend
+
+
+def test_grid_search_matches_scalar_recursion():
+    alphas, betas, phis = np.array([0.2, 0.5, 0.8]), np.array([0.1, 0.4]), np.array([0.8, 0.95, 1.0])
+
+    model = fit_damped_trend(SERIES, alphas, betas, phis)
+
+    candidates = {(alpha, beta, phi): holt_sse(SERIES, alpha, beta, phi)
+                  for alpha in alphas for beta in betas for phi in phis}
+    best = min(candidates, key=lambda parameters: candidates[parameters][0])
+    sse, level, trend = candidates[best]
+    assert (model['alpha'], model['beta'], model['phi']) == pytest.approx(best)
+    assert (model['level'], model['trend']) == pytest.approx((level, trend))
+    assert model['sigma'] == pytest.approx(np.sqrt(sse / (len(SERIES) - 4)))
+
+
+def test_linear_series_is_extended_exactly():
+    model = fit_damped_trend(10 - 0.25 * np.arange(8))
+
+    mean, spread = forecast_damped_trend(model, 3)
+
+    assert model['phi'] == 1.0 and model['sigma'] == pytest.approx(0.0)
+    assert mean == pytest.approx([8.0, 7.75, 7.5])
+    assert spread == pytest.approx(0.0)
+
+
+def test_damped_forecast_and_variance():
+    model = {'alpha': 0.5, 'beta': 0.2, 'phi': 0.9, 'level': 10.0, 'trend': -0.5, 'sigma': 0.3}
+
+    mean, spread = forecast_damped_trend(model, 40)
+
+    damped = np.cumsum(0.9 ** np.arange(1, 41))
+    assert mean == pytest.approx(10.0 - 0.5 * damped)
+    # Tendance amortie : la prévision tend vers level + trend·phi/(1 - phi)
+    assert mean[-1] == pytest.approx(10.0 - 0.5 * 9, abs=0.1)
+    coefficients = 0.5 * (1 + 0.2 * damped[:2])
+    assert spread[:3] == pytest.approx(0.3 * np.sqrt([1, 1 + coefficients[0] ** 2, 1 + (coefficients ** 2).sum()]))
+    assert (np.diff(spread) > 0).all()
+
+
+def test_forecast_table_intervals():
+    table, _ = forecast_table(np.arange(2008, 2024)[::-1], SERIES[::-1], 2030)
+
+    assert table['annee'].tolist() == list(range(2024, 2031))
+    assert (table['bas_95'] <= table['bas_80']).all() and (table['bas_80'] <= table['prevision']).all()
+    assert (table['prevision'] <= table['haut_80']).all() and (table['haut_80'] <= table['haut_95']).all()
+
+
+def test_scenario_grid_baseline():
+    table, _ = forecast_table(np.arange(2008, 2024), SERIES, 2030)
+    grid = ScenarioGrid(table)
+
+    assert grid.lookup() == pytest.approx(table['prevision'].to_numpy(), rel=1e-6)
+    assert (grid.lookup(hausse_taxes=20) < grid.lookup()).all()
+
+
+def test_too_short_series():
+    with pytest.raises(ValueError):
+        fit_damped_trend([10.0, 9.5])
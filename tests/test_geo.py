@@ -0,0 +1,40 @@
+"""Contours compilés : étape de compilation et chargement sans compilation au rendu"""
+import json
+
+import numpy as np
+
+from alcool import geo
+from alcool.regional import REGION_CENTROIDS
+
+
+def write_square(path, name):
+    ring = [[2.0 + 0.1 * np.cos(angle), 47.0 + 0.1 * np.sin(angle)] for angle in np.linspace(0, 2 * np.pi, 50)]
+    feature = {'type': 'Feature', 'properties': {geo.NAME_PROPERTY: name},
+               'geometry': {'type': 'Polygon', 'coordinates': [ring]}}
+    path.write_text(json.dumps({'type': 'FeatureCollection', 'features': [feature]}), encoding='utf-8')
+
+
+def test_load_layer_does_not_compile(tmp_path):
+    write_square(tmp_path / 'regions.geojson', 'Bretagne')
+    assert geo.load_layer('region', str(tmp_path)) is None
+    assert geo.layer_mtime('region', str(tmp_path)) is None
+
+
+def test_build_layers_compiles_local_sources(tmp_path):
+    write_square(tmp_path / 'regions.geojson', 'Bretagne')
+    assert geo.build_layers(str(tmp_path), download=False) == [str(tmp_path / 'regions.geo.npz')]
+
+    layer = geo.load_layer('region', str(tmp_path))
+    assert layer.names == ['Bretagne'] and geo.layer_mtime('region', str(tmp_path)) is not None
+    features = layer.to_geojson('haute')['features']
+    assert features[0]['properties'][geo.NAME_PROPERTY] == 'Bretagne'
+
+
+def test_bundled_region_layer_loads_offline():
+    layer = geo.load_layer('region')
+
+    assert layer is not None and sorted(layer.names) == sorted(REGION_CENTROIDS)
+    assert layer.description
+    for tier in geo.TOLERANCES:
+        features = layer.to_geojson(tier)['features']
+        assert all(feature['geometry']['coordinates'] for feature in features)
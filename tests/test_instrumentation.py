@@ -0,0 +1,82 @@
+"""Instrumentation : séries agrégées et exports Prometheus (histogrammes, compteurs) et JSON"""
+import json
+
+import pytest
+
+from alcool.instrumentation import HISTOGRAM_BUCKETS, Instrumentation, format_labels
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    for seconds in (0.02, 0.3, 0.04):
+        instrumentation.observe('section_seconds', seconds, section='tendances')
+    instrumentation.observe('section_seconds', 12.0, section='carte')
+    instrumentation.observe('figure_json_bytes', 42_000, chart='evolution')
+    return instrumentation
+
+
+def prometheus_values(text):
+    """Valeurs des échantillons par nom de série (étiquettes comprises)"""
+    return {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+            for line in text.splitlines() if not line.startswith('#')}
+
+
+def test_snapshot_aggregates_series(instrumentation):
+    rows = {(row['mesure'], row['etiquettes'].get('section')): row for row in instrumentation.snapshot()}
+
+    trends = rows[('section_seconds', 'tendances')]
+    assert (trends['nombre'], trends['max'], trends['dernier']) == (3, 0.3, 0.04)
+    assert trends['total'] == pytest.approx(0.36) and trends['moyenne'] == pytest.approx(0.12)
+    # Durées d'abord, par durée cumulée décroissante
+    assert [row['mesure'] for row in instrumentation.snapshot()] == ['section_seconds'] * 2 + ['figure_json_bytes']
+
+
+def test_prometheus_export(instrumentation):
+    text = instrumentation.to_prometheus({'figure_cache_hits_total': 7, 'figure_cache_entries': 3})
+    lines = text.splitlines()
+    values = prometheus_values(text)
+
+    assert "# TYPE alcool_section_seconds histogram" in lines
+    assert "# TYPE alcool_section_seconds_max gauge" in lines
+    assert "# TYPE alcool_figure_json_bytes histogram" in lines
+    assert "# TYPE alcool_figure_cache_hits_total counter" in lines
+    assert "# TYPE alcool_figure_cache_entries gauge" in lines
+
+    # Seuils cumulés, un échantillon par seuil plus +Inf
+    buckets = [line for line in lines if line.startswith('alcool_section_seconds_bucket{section="tendances"')]
+    assert len(buckets) == len(HISTOGRAM_BUCKETS['seconds']) + 1
+    assert values['alcool_section_seconds_bucket{section="tendances",le="0.025"}'] == 1
+    assert values['alcool_section_seconds_bucket{section="tendances",le="0.05"}'] == 2
+    assert values['alcool_section_seconds_bucket{section="tendances",le="0.5"}'] == 3
+    assert values['alcool_section_seconds_bucket{section="carte",le="10"}'] == 0
+    assert values['alcool_section_seconds_bucket{section="carte",le="+Inf"}'] == 1
+    assert values['alcool_figure_json_bytes_bucket{chart="evolution",le="50000"}'] == 1
+    assert values['alcool_figure_json_bytes_bucket{chart="evolution",le="10000"}'] == 0
+
+    assert values['alcool_section_seconds_count{section="tendances"}'] == 3
+    assert values['alcool_section_seconds_sum{section="tendances"}'] == pytest.approx(0.36)
+    assert values['alcool_section_seconds_max{section="carte"}'] == 12
+    assert values['alcool_figure_cache_hits_total'] == 7 and values['alcool_figure_cache_entries'] == 3
+
+
+def test_json_export(instrumentation):
+    exported = json.loads(instrumentation.to_json({'figure_cache_hits_total': 7}))
+
+    assert exported['compteurs'] == {'figure_cache_hits_total': 7}
+    assert exported['series'] == json.loads(json.dumps(instrumentation.snapshot()))
+    card = next(row for row in exported['series'] if row['etiquettes'] == {'section': 'carte'})
+    assert card['nombre'] == 1 and card['histogramme']['10.0'] == 0
+
+
+def test_timer_reset_and_labels():
+    instrumentation = Instrumentation(prefix='test')
+    with instrumentation.timer('rerun_seconds'):
+        pass
+    instrumentation.wrap('loader_seconds', lambda: None, dataset='regional')()
+
+    assert {row['mesure'] for row in instrumentation.snapshot()} == {'rerun_seconds', 'loader_seconds'}
+    assert 'test_loader_seconds_count{dataset="regional"} 1' in instrumentation.to_prometheus()
+    instrumentation.reset()
+    assert instrumentation.snapshot() == [] and instrumentation.to_prometheus() == '\n'
+    assert format_labels({'chart': 'a "b"\n'}) == '{chart="a \\"b\\"\\n"}'
@@ -0,0 +1,52 @@
+"""Indicateurs clés : dernière année par indicateur, variations et moyennes glissantes"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.key_metrics import KeyMetrics
+
+HISTORY = pd.DataFrame({
+    'annee': [2023, 2019, 2020, 2021, 2022],
+    'consommation_alcool': [10.0, 11.5, 11.0, 10.75, 10.5],
+    'couts_sante': [np.nan, 100.0, 104.0, 110.0, 112.0],
+    'source': ['a', 'b', 'c', 'd', 'e'],
+})
+
+
+@pytest.fixture
+def metrics():
+    return KeyMetrics(HISTORY, window=3)
+
+
+def test_latest_values_and_variations(metrics):
+    consumption = metrics['consommation_alcool']
+    assert (consumption['annee'], consumption['valeur']) == (2023, 10.0)
+    assert (consumption['annee_precedente'], consumption['precedent']) == (2022, 10.5)
+    assert consumption['variation'] == pytest.approx(-0.5)
+    assert consumption['variation_pct'] == pytest.approx(-0.5 / 10.5 * 100)
+    assert (consumption['annee_debut'], consumption['evolution']) == (2019, pytest.approx(-1.5))
+
+
+def test_rolling_statistics(metrics):
+    consumption = metrics['consommation_alcool']
+    assert consumption['moyenne_mobile'] == pytest.approx(np.mean([10.75, 10.5, 10.0]))
+    assert (consumption['min_mobile'], consumption['max_mobile']) == (10.0, 10.75)
+    assert consumption['tendance'] == pytest.approx((10.0 - 10.75) / 2)
+
+
+def test_latest_year_is_per_indicator(metrics):
+    # 2023 manquant pour les coûts : leur dernière valeur est celle de 2022
+    assert metrics['couts_sante']['annee'] == 2022 and metrics['couts_sante']['valeur'] == 112.0
+    assert metrics.latest_year == 2023
+    assert 'source' not in metrics and metrics.indicators == ['consommation_alcool', 'couts_sante']
+
+
+def test_float32_columns_keep_their_decimal_values():
+    metrics = KeyMetrics(HISTORY.astype({'consommation_alcool': 'float32'}))
+    assert metrics['consommation_alcool']['valeur'] == 10.0
+    assert metrics['consommation_alcool']['variation'] == -0.5
+    assert KeyMetrics(pd.DataFrame({'annee': [2022, 2023], 'x': np.float32([8.3, 8.1])}))['x']['valeur'] == 8.1
+
+
+def test_table_lists_every_indicator(metrics):
+    assert [row['indicateur'] for row in metrics.table()] == metrics.indicators
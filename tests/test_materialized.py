@@ -0,0 +1,116 @@
+"""Vues matérialisées : une mise à jour incrémentale donne le même résultat qu'une reconstruction complète"""
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.key_metrics import KeyMetrics, RankedMetrics
+from alcool.materialized import MaterializedViews, appended_rows
+
+REGIONS = ['Bretagne', 'Corse', 'Normandie', 'Occitanie']
+
+
+def panel(years, regions=REGIONS):
+    rng = np.random.default_rng(5)
+    rows = [(region, year) for region in regions for year in years]
+    return pd.DataFrame({
+        'region': pd.Categorical([region for region, _ in rows]),
+        'annee': np.array([year for _, year in rows], dtype=np.int16),
+        'consommation_alcool': rng.uniform(8, 12, len(rows)).astype(np.float32),
+        'binge_drinking': rng.uniform(10, 25, len(rows)).astype(np.float32),
+    })
+
+
+def assert_same_metrics(incremental, rebuilt):
+    assert sorted(incremental.entities) == sorted(rebuilt.entities)
+    key = itemgetter('region', 'indicateur')
+    assert sorted(incremental.table(), key=key) == sorted(rebuilt.table(), key=key)
+    for indicator in ('consommation_alcool', 'binge_drinking'):
+        for field in ('valeur', 'evolution'):
+            assert incremental.ranking(indicator, field) == rebuilt.ranking(indicator, field)
+
+
+def test_appended_years_and_regions_equal_full_rebuild():
+    full = panel(range(2015, 2024), REGIONS + ['Grand Est'])
+    previous = full[(full['annee'] < 2021) & (full['region'] != 'Grand Est')]
+    views = MaterializedViews()
+    views.refresh('panel', previous, RankedMetrics, ['region', 'annee'])
+
+    incremental = views.refresh('panel', full, RankedMetrics, ['region', 'annee'])
+
+    assert views.history[-1]['mode'] == 'incrémental'
+    assert views.history[-1]['lignes_ajoutees'] == len(full) - len(previous)
+    assert_same_metrics(incremental, RankedMetrics(full))
+
+
+def test_key_metrics_append_equals_rebuild():
+    history = panel(range(2010, 2024), ['Bretagne']).drop(columns='region')
+    views = MaterializedViews()
+    views.refresh('historique', history.iloc[:10], KeyMetrics, ['annee'])
+
+    incremental = views.refresh('historique', history, KeyMetrics, ['annee'])
+
+    assert views.history[-1]['mode'] == 'incrémental'
+    assert incremental.table() == KeyMetrics(history).table()
+
+
+def test_unchanged_changed_and_inserted_rows():
+    data = panel(range(2015, 2024))
+    views = MaterializedViews()
+    first = views.refresh('panel', data, RankedMetrics, ['region', 'annee'])
+
+    assert views.refresh('panel', data.copy(), RankedMetrics, ['region', 'annee']) is first
+    assert views.history[-1]['mode'] == 'inchangé'
+
+    # Valeur déjà publiée corrigée : reconstruction complète
+    corrected = data.copy()
+    corrected.loc[3, 'consommation_alcool'] = 20.0
+    rebuilt = views.refresh('panel', corrected, RankedMetrics, ['region', 'annee'])
+    assert views.history[-1]['mode'] == 'complet'
+    assert_same_metrics(rebuilt, RankedMetrics(corrected))
+
+    # Année insérée avant la fin des séries : append refuse, la vue est reconstruite
+    earlier = pd.concat([panel([2014]), corrected], ignore_index=True)
+    rebuilt = views.refresh('panel', earlier, RankedMetrics, ['region', 'annee'])
+    assert views.history[-1]['mode'] == 'complet'
+    assert_same_metrics(rebuilt, RankedMetrics(earlier))
+
+
+def test_appended_rows():
+    data = panel(range(2015, 2020))
+    extended = pd.concat([data, panel([2020])], ignore_index=True).sample(frac=1, random_state=0)
+
+    added = appended_rows(data, extended, ['region', 'annee'])
+
+    assert sorted(added['annee'].unique()) == [2020] and len(added) == len(REGIONS)
+    assert appended_rows(data, extended.drop(columns='binge_drinking'), ['region', 'annee']) is None
+    assert appended_rows(data, data.iloc[1:], ['region', 'annee']) is None
+    duplicated = pd.concat([extended, extended.iloc[:1]], ignore_index=True)
+    assert appended_rows(data, duplicated, ['region', 'annee']) is None
+    assert appended_rows(duplicated, extended, ['region', 'annee']) is None
+
+
+def test_duplicated_keys_fall_back_to_full_rebuild():
+    data = panel(range(2015, 2020), ['Bretagne']).drop(columns='region')
+    views = MaterializedViews()
+    views.refresh('historique', data, KeyMetrics, ['annee'])
+
+    duplicated = pd.concat([data, data.iloc[-1:]], ignore_index=True)
+    views.refresh('historique', duplicated, KeyMetrics, ['annee'])
+
+    assert views.history[-1]['mode'] == 'complet'
+
+
+def test_previous_version_is_not_modified():
+    data = panel(range(2015, 2022))
+    views = MaterializedViews()
+    previous = views.refresh('panel', data[data['annee'] < 2020], RankedMetrics, ['region', 'annee'])
+    before = previous.table(), previous.ranking('consommation_alcool')
+
+    views.refresh('panel', data, RankedMetrics, ['region', 'annee'])
+
+    assert views.history[-1]['mode'] == 'incrémental'
+    assert (previous.table(), previous.ranking('consommation_alcool')) == before
+    with pytest.raises(ValueError):
+        previous['Corse'].append(panel([2016], ['Corse']).drop(columns='region'))
@@ -0,0 +1,75 @@
+"""Cache de figures (ordre LRU, budget en octets, compteurs) et découpage des périodes par YearIndex"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from alcool.model import FigureCache, YearIndex
+
+
+def figure(value, points=1):
+    return go.Figure(go.Bar(y=[value] * points, text=[f'{value}'] * points))
+
+
+def size(fig):
+    return len(fig.to_json().encode('utf-8'))
+
+
+def test_least_recently_used_figure_is_evicted_first():
+    cache = FigureCache(max_bytes=3 * size(figure(0)))
+    for key in range(3):
+        cache.get_or_build(key, lambda key=key: figure(key))
+
+    # 0 relu : 1 devient le plus ancien
+    cache.get_or_build(0, lambda: figure(9))
+    cache.get_or_build(3, lambda: figure(3))
+
+    built = []
+    for key in (0, 2, 3, 1):
+        cache.get_or_build(key, lambda key=key: built.append(key) or figure(key))
+    assert built == [1]
+    assert cache.stats()['evictions'] == 2
+
+
+def test_byte_budget():
+    small = size(figure(1))
+    cache = FigureCache(max_bytes=small * 2 + 10)
+    cache.get_or_build('a', lambda: figure(1))
+    cache.get_or_build('b', lambda: figure(2))
+
+    # Figure plus grande que le budget : retournée sans être conservée
+    large = cache.get_or_build('large', lambda: figure(1, points=5000))
+    assert len(large.data[0].y) == 5000
+    assert cache.stats()['entries'] == 2 and cache.stats()['evictions'] == 0
+
+    cache.get_or_build('c', lambda: figure(3))
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes'] and stats['bytes'] == 2 * small
+
+
+def test_hit_and_miss_counters():
+    cache = FigureCache()
+    first = cache.get_or_build('a', lambda: figure(1))
+
+    assert cache.get_or_build('a', lambda: figure(2)) is first
+    cache.get_or_build('b', lambda: figure(2))
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 0, 'entries': 2,
+                             'bytes': size(figure(1)) + size(figure(2)), 'max_bytes': cache.max_bytes}
+
+    cache.clear()
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['hits'], stats['misses']) == (0, 0, 1, 2)
+
+
+def test_year_index_on_unsorted_years():
+    df = pd.DataFrame({'annee': [2015, 2010, 2020, 2012, 2015, 2018], 'valeur': np.arange(6)})
+    index = YearIndex(df)
+
+    assert not index.is_sorted
+    for start, end in [(2012, 2015), (2000, 2011), (2016, 2030), (2021, 2030), (2015, 2015)]:
+        expected = df[(df['annee'] >= start) & (df['annee'] <= end)]
+        pd.testing.assert_frame_equal(index.slice(start, end), expected)
+
+    ordered = YearIndex(df.sort_values('annee', kind='stable'))
+    assert ordered.is_sorted
+    assert ordered.slice(2012, 2015)['valeur'].tolist() == [3, 0, 4]
@@ -0,0 +1,61 @@
+"""Figures compactes : arrondi, décimation conservant les extrêmes et données comparées à l'original"""
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from alcool.payload import PAYLOAD_DIGITS, compact_figure, decimation_indices, payload_bytes, round_significant
+
+# Erreur relative maximale d'un arrondi à PAYLOAD_DIGITS chiffres significatifs
+TOLERANCE = 0.5 * 10.0 ** (1 - PAYLOAD_DIGITS)
+
+
+def test_round_significant():
+    values = np.array([123456.0, 0.00123456, -9.87654, 0.0, np.nan, 1e-12])
+
+    rounded = round_significant(values)
+
+    np.testing.assert_array_equal(rounded[:4], [123500.0, 0.001235, -9.877, 0.0])
+    assert np.isnan(rounded[4]) and rounded[5] == pytest.approx(1e-12)
+    np.testing.assert_allclose(round_significant([3.14159], digits=2), [3.1])
+
+
+def test_decimation_keeps_endpoints_and_extrema():
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 1, 20000)
+    y[12345], y[777] = 50.0, -50.0
+    y[100] = np.nan
+
+    kept = decimation_indices(y, 500)
+
+    assert len(kept) <= 500 and (np.diff(kept) > 0).all()
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert {12345, 777} <= set(kept.tolist())
+
+
+def test_compact_figure_matches_the_original():
+    x = np.arange(20000)
+    y = 1000 * np.sin(x / 300) + np.random.default_rng(1).normal(0, 1, len(x))
+    fig = go.Figure([go.Scatter(x=x, y=y, mode='lines'),
+                     go.Bar(x=['a', 'b', 'c'], y=[1.23456, 22.5, 333.333]),
+                     go.Scatter(x=['a', 'b'], y=['u', 'v'], text=['p', 'q'], mode='markers')])
+
+    compact = compact_figure(fig, max_points=1000)
+
+    line, bar, labels = compact.data
+    # Courbe décimée : chaque point conservé est un point de l'original, arrondi
+    assert len(line.y) <= 1000 and line.x[0] == 0 and line.x[-1] == x[-1]
+    np.testing.assert_allclose(line.y, y[line.x], rtol=TOLERANCE, atol=1e-6)
+    assert line.y.max() == pytest.approx(y.max(), rel=TOLERANCE)
+    assert line.y.min() == pytest.approx(y.min(), rel=TOLERANCE)
+    np.testing.assert_allclose(bar.y, fig.data[1].y, rtol=TOLERANCE)
+    # Traces non numériques inchangées
+    assert bar.x == fig.data[1].x
+    assert (labels.x, labels.y, labels.text) == (fig.data[2].x, fig.data[2].y, fig.data[2].text)
+    assert payload_bytes(compact) < payload_bytes(fig)
+
+
+def test_markers_are_not_decimated():
+    x = np.arange(6000)
+    fig = go.Figure(go.Scatter(x=x, y=np.cos(x / 50), mode='markers'))
+
+    assert len(compact_figure(fig, max_points=1000).data[0].y) == len(x)
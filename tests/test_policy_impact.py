@@ -0,0 +1,61 @@
+"""Régression segmentée : effets retrouvés sur des séries construites, accord avec les moindres carrés"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.policy_impact import decimal_years, estimate_policy_effects, policy_impact_table
+
+YEARS = np.arange(2000, 2021, dtype=np.float64)
+
+
+def segmented(times, effect_time, level, slope):
+    after = times >= effect_time
+    return 12 - 0.1 * (times - 2000) + level * after + slope * (times - effect_time) * after
+
+
+def test_recovers_level_slope_and_lag():
+    values = segmented(YEARS, 2010, level=-1.5, slope=-0.2)
+
+    effects = estimate_policy_effects(YEARS, values, [2008.0])
+
+    assert effects['delai'][0] == 2
+    assert effects['effet'][0] == pytest.approx(-1.5)
+    assert effects['pente'][0] == pytest.approx(-0.2)
+    assert effects['r2'][0] == pytest.approx(1.0)
+
+
+def test_matches_least_squares_for_a_fixed_lag():
+    values = segmented(YEARS, 2012, level=-0.8, slope=0.05) + np.random.default_rng(1).normal(0, 0.1, len(YEARS))
+
+    effects = estimate_policy_effects(YEARS, values, [2011.0], lags=[1])
+
+    after = (YEARS >= 2012).astype(float)
+    design = np.column_stack([np.ones_like(YEARS), YEARS - YEARS.mean(), after, (YEARS - 2012) * after])
+    coefficients, sse, _, _ = np.linalg.lstsq(design, values, rcond=None)
+    standard_error = np.sqrt(sse[0] / (len(YEARS) - 4) * np.linalg.inv(design.T @ design)[2, 2])
+    assert effects['effet'][0] == pytest.approx(coefficients[2])
+    assert effects['pente'][0] == pytest.approx(coefficients[3])
+    assert effects['erreur_type'][0] == pytest.approx(standard_error)
+
+
+def test_policies_outside_the_series_are_nan():
+    values = segmented(YEARS, 2010, level=-1.0, slope=0.0)
+
+    effects = estimate_policy_effects(YEARS, values, [1990.0, 2019.5, 2010.0])
+
+    assert np.isnan(effects['effet'][:2]).all() and np.isnan(effects['delai'][:2]).all()
+    assert effects['effet'][2] == pytest.approx(-1.0)
+
+
+def test_policy_impact_table_sorts_series_and_labels_policies():
+    series = pd.DataFrame({'annee': YEARS[::-1], 'consommation_alcool': segmented(YEARS, 2010, -1.2, 0.0)[::-1]})
+    policies = pd.DataFrame({'date': ['2010-01-01'], 'titre': ['Loi'], 'type': ['Fiscalité']})
+
+    table = policy_impact_table(series, policies, lags=[0])
+
+    assert table['politique'].tolist() == ['Loi (2010)']
+    assert table['impact_consommation'].iloc[0] == pytest.approx(-1.2)
+
+
+def test_decimal_years():
+    assert decimal_years(['2009-01-01', '2009-07-02']).tolist() == pytest.approx([2009.0, 2009 + 182 / 365.25])
@@ -0,0 +1,65 @@
+"""Moteur régional : agrégations par bincount et points de carte comparés à une moyenne pondérée pandas"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.regional import RegionalEngine
+
+INDICATORS = ['consommation_2023', 'binge_drinking']
+
+# Quatre groupes de communes éloignés : une cellule de grille chacun lorsque max_points vaut 4
+CLUSTERS = {'nord-ouest': (50.0, -1.0), 'nord-est': (50.0, 7.0), 'sud-ouest': (43.0, -1.0), 'sud-est': (43.0, 7.0)}
+
+
+@pytest.fixture(scope='module')
+def communes():
+    rng = np.random.default_rng(11)
+    rows = []
+    for position, (cluster, (lat, lon)) in enumerate(CLUSTERS.items()):
+        for number in range(6):
+            rows.append({'commune': f'{cluster}-{number}', 'departement': f'{cluster}-{number % 2}',
+                         'region': 'Nord' if lat > 45 else 'Sud', 'groupe': cluster,
+                         'lat': lat + rng.uniform(-0.2, 0.2), 'lon': lon + rng.uniform(-0.2, 0.2)})
+    df = pd.DataFrame(rows)
+    df['population'] = rng.integers(100, 10000, len(df)).astype(float)
+    df['consommation_2023'] = rng.uniform(8, 14, len(df))
+    df['binge_drinking'] = rng.uniform(10, 25, len(df))
+    # Valeurs manquantes : exclues de la moyenne et de ses poids
+    df.loc[[0, 7, 8], 'consommation_2023'] = np.nan
+    df.loc[df['departement'] == 'sud-est-1', 'binge_drinking'] = np.nan
+    return df
+
+
+def weighted_average(group, column):
+    valid = group[column].notna()
+    if not valid.any():
+        return np.nan
+    return np.average(group.loc[valid, column], weights=group.loc[valid, 'population'])
+
+
+@pytest.mark.parametrize('level', ['departement', 'region'])
+def test_aggregates_match_pandas(communes, level):
+    table = RegionalEngine(communes, INDICATORS).tables[level].set_index(level)
+
+    for column in INDICATORS:
+        expected = communes.groupby(level).apply(weighted_average, column, include_groups=False)
+        np.testing.assert_allclose(table.loc[expected.index, column], expected, rtol=1e-6)
+    if level == 'departement':
+        assert np.isnan(table.loc['sud-est-1', 'binge_drinking'])
+
+
+def test_map_points_match_pandas(communes):
+    engine = RegionalEngine(communes, INDICATORS)
+
+    points = engine.map_points('commune', max_points=4)
+
+    assert len(points) == len(CLUSTERS)
+    points['groupe'] = points['commune'].str.split('-').str[:-1].str.join('-')
+    points = points.set_index('groupe')
+    for column in INDICATORS + ['lat', 'lon']:
+        expected = communes.groupby('groupe').apply(weighted_average, column, include_groups=False)
+        np.testing.assert_allclose(points.loc[expected.index, column], expected, rtol=1e-5)
+    population = communes.groupby('groupe')['population'].sum()
+    np.testing.assert_allclose(points.loc[population.index, 'population'], population)
+    # Sous le seuil, les territoires sont renvoyés tels quels
+    assert len(engine.map_points('commune')) == len(communes)
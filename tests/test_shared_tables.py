@@ -0,0 +1,79 @@
+"""Tables partagées : publication, attache sans copie, verrou de publication et versions conservées"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from alcool.builtin_data import BUILTIN_DATASETS
+from alcool.data_sources import BuiltinSource
+from alcool.model import attach_shared_tables, prepare_tables
+from alcool.shared_tables import MANIFEST, SharedTables
+
+TABLE = pd.DataFrame({
+    'region': pd.Categorical(['Bretagne', 'Corse', 'Normandie']),
+    'annee': np.array([2021, 2022, 2023], dtype=np.int16),
+    'consommation_alcool': np.float32([10.5, np.nan, 11.25]),
+    'source': ['a', 'b', None],
+})
+
+
+def published(version):
+    return {'regional_data': TABLE.assign(annee=TABLE['annee'] + version)}, {'version': np.int64(version)}
+
+
+def test_attached_tables_equal_published_ones(tmp_path):
+    shared = SharedTables(str(tmp_path), namespace='test')
+    tables, metadata = published(0)
+
+    shared.publish('v0', tables, metadata)
+    attached, attached_metadata = shared.attach('v0')
+
+    pd.testing.assert_frame_equal(attached['regional_data'], tables['regional_data'])
+    assert attached_metadata == {'version': 0}
+    assert shared.attach('absente') is None
+
+
+def test_load_builds_each_version_once(tmp_path):
+    shared = SharedTables(str(tmp_path))
+    calls = []
+
+    def build():
+        calls.append(1)
+        return published(1)
+
+    first, _ = shared.load('v1', build)
+    second, metadata = SharedTables(str(tmp_path)).load('v1', build)
+
+    assert len(calls) == 1 and metadata == {'version': 1}
+    pd.testing.assert_frame_equal(second['regional_data'], first['regional_data'])
+    assert os.path.exists(os.path.join(shared.path('v1'), MANIFEST))
+
+
+def test_old_versions_are_pruned(tmp_path):
+    shared = SharedTables(str(tmp_path), namespace='test', keep=2)
+    other = SharedTables(str(tmp_path), namespace='autre', keep=1)
+    other.publish('v0', *published(0))
+
+    for version in range(3):
+        shared.publish(f'v{version}', *published(version))
+        # Dates de modification distinctes même sur un système de fichiers à gros grain
+        os.utime(shared.path(f'v{version}'), ns=(version, version))
+
+    assert shared.attach('v0') is None
+    assert shared.attach('v1') is not None and shared.attach('v2') is not None
+    assert not os.path.exists(shared.path('v0') + '.lock')
+    # Versions d'un autre espace de noms conservées
+    assert other.attach('v0') is not None
+
+
+def test_survey_sums_round_trip(tmp_path):
+    sources = [BuiltinSource(BUILTIN_DATASETS)]
+    tables, survey = prepare_tables(sources)
+
+    for _ in range(2):
+        shared_tables, shared_survey = attach_shared_tables(SharedTables(str(tmp_path)), sources)
+
+        assert sorted(shared_tables) == sorted(tables)
+        pd.testing.assert_frame_equal(shared_tables['historical_data'], tables['historical_data'])
+        assert shared_survey.observed == survey.observed and shared_survey.respondents == survey.respondents
+        pd.testing.assert_frame_equal(shared_survey.estimates(['region', 'sexe']), survey.estimates(['region', 'sexe']))
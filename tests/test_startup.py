@@ -0,0 +1,38 @@
+"""Imports différés du chemin de démarrage d'une session (la durée est suivie par benchmark.py)"""
+import threading
+
+from alcool.lazy import lazy_import
+from benchmark import check_startup, measure_startup
+
+
+def test_startup_defers_heavy_modules():
+    # Durée non vérifiée ici : elle dépend de la machine (benchmark.py --check-startup)
+    _, eager_modules = measure_startup(1)
+    assert eager_modules == []
+
+
+def test_check_startup_reports_budget_and_eager_modules():
+    assert check_startup(0.5, [], 1.0) == []
+    errors = check_startup(1.5, ['plotly.express'], 1.0)
+    assert len(errors) == 2 and '1500 ms' in errors[0] and 'plotly.express' in errors[1]
+
+
+def test_lazy_import_is_thread_safe():
+    # Les sessions (un thread chacune) touchent le module différé en même temps
+    module = lazy_import('plotly.express')
+    barrier = threading.Barrier(16)
+    errors = []
+
+    def touch():
+        barrier.wait()
+        try:
+            module.line
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=touch) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,115 @@
+"""Estimations d'enquête : moyennes pondérées et erreurs types de Kish comparées à un calcul pandas direct"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from alcool.builtin_data import initialize_survey_microdata
+from alcool.data_sources import BuiltinSource
+from alcool.survey import Z_95, SurveyEstimates, load_survey, with_survey_rates
+
+
+@pytest.fixture(scope='module')
+def microdata():
+    rng = np.random.default_rng(7)
+    size = 3000
+    data = pd.DataFrame({
+        'annee': rng.choice([2021, 2023], size),
+        'region': rng.choice(['Bretagne', 'Corse', 'Normandie'], size),
+        'sexe': rng.choice(['Femme', 'Homme'], size),
+        'tranche_age': rng.choice(['18-34', '35-64', '65+'], size),
+        'csp': rng.choice(['Cadre', 'Ouvrier'], size),
+        'poids': rng.lognormal(0, 0.5, size),
+        'consommation_alcool': rng.gamma(2, 5, size),
+        'buveur_quotidien': rng.binomial(1, 0.1, size).astype(float),
+        'binge_drinking': rng.binomial(1, 0.2, size).astype(float),
+        'age_premiere_ivresse': rng.normal(17, 2, size),
+    })
+    # Réponses manquantes : exclues de la moyenne de la variable concernée seulement
+    data.loc[rng.random(size) < 0.1, 'age_premiere_ivresse'] = np.nan
+    return data
+
+
+def survey_of(data, chunksize):
+    survey = SurveyEstimates()
+    for start in range(0, len(data), chunksize):
+        survey.add(data.iloc[start:start + chunksize])
+    return survey.finish()
+
+
+def weighted(group, measure):
+    """Moyenne pondérée et erreur type avec la taille effective de Kish (Σw)² / Σw²"""
+    valid = group[measure].notna()
+    weights, values = group.loc[valid, 'poids'], group.loc[valid, measure]
+    mean = np.average(values, weights=weights)
+    variance = np.average((values - mean) ** 2, weights=weights)
+    effective_size = weights.sum() ** 2 / (weights ** 2).sum()
+    return pd.Series({'moyenne': mean, 'se': np.sqrt(variance / effective_size)})
+
+
+@pytest.mark.parametrize('by', [['sexe'], ['region', 'tranche_age']])
+@pytest.mark.parametrize('measure', ['consommation_alcool', 'binge_drinking', 'age_premiere_ivresse'])
+def test_estimates_match_pandas(microdata, by, measure):
+    estimates = survey_of(microdata, 700).estimates(by).set_index(by)
+
+    expected = microdata.groupby(by).apply(weighted, measure, include_groups=False)
+    expected.index = expected.index.set_names(by)
+    np.testing.assert_allclose(estimates.loc[expected.index, measure], expected['moyenne'])
+    np.testing.assert_allclose(estimates.loc[expected.index, f'{measure}_se'], expected['se'])
+    np.testing.assert_allclose(estimates[f'{measure}_ic_haut'] - estimates[measure],
+                               Z_95 * estimates[f'{measure}_se'])
+    assert estimates.loc[expected.index, 'repondants'].tolist() == microdata.groupby(by).size().tolist()
+
+
+def test_filters_and_overall_total(microdata):
+    survey = survey_of(microdata, 1000)
+
+    filtered = survey.estimates(['sexe'], {'annee': [2023], 'region': ['Corse']}).set_index('sexe')
+    subset = microdata[(microdata['annee'] == 2023) & (microdata['region'] == 'Corse')]
+    expected = subset.groupby('sexe').apply(weighted, 'consommation_alcool', include_groups=False)
+    np.testing.assert_allclose(filtered.loc[expected.index, 'consommation_alcool'], expected['moyenne'])
+
+    overall = survey.estimates()
+    assert overall['repondants'].iloc[0] == len(microdata)
+    assert overall['consommation_alcool'].iloc[0] == pytest.approx(weighted(microdata, 'consommation_alcool')['moyenne'])
+
+
+def test_chunking_does_not_change_the_sums(microdata):
+    by = ['annee', 'region', 'sexe', 'tranche_age', 'csp']
+    single = survey_of(microdata, len(microdata)).rollup(by)
+    chunked = survey_of(microdata, 333).rollup(by)
+    pd.testing.assert_frame_equal(single, chunked)
+
+
+def test_restore_from_shared_sums(microdata):
+    survey = survey_of(microdata, 1000)
+    restored = SurveyEstimates.restore(survey.sums, **survey.metadata())
+    pd.testing.assert_frame_equal(restored.estimates(['csp']), survey.estimates(['csp']))
+
+
+def test_survey_rates_replace_table_rates(microdata):
+    survey = survey_of(microdata, 1000)
+    survey.observed = True
+    regional = pd.DataFrame({'region': ['Bretagne', 'Corse', 'Occitanie'],
+                             'binge_drinking': np.float32([1.0, 2.0, 3.0])})
+
+    updated = with_survey_rates(regional, survey, ['region'], year=2023)
+
+    subset = microdata[microdata['annee'] == 2023]
+    expected = subset.groupby('region').apply(weighted, 'binge_drinking', include_groups=False)['moyenne'] * 100
+    np.testing.assert_allclose(updated['binge_drinking'][:2], expected[['Bretagne', 'Corse']], rtol=1e-6)
+    # Région absente de l'enquête : taux publié conservé
+    assert updated['binge_drinking'].iloc[2] == 3.0 and updated['binge_drinking'].dtype == np.float32
+
+
+def test_simulated_survey_is_built_once():
+    calls = []
+
+    def simulated():
+        calls.append(1)
+        return initialize_survey_microdata(respondents=2000, chunksize=500)
+
+    first = load_survey([BuiltinSource({'survey_microdata': simulated})])
+    second = load_survey([BuiltinSource({'survey_microdata': simulated})])
+
+    assert second is first and len(calls) == 1
+    assert not first.observed and first.respondents == 2000